@@ -4,21 +4,55 @@ import tkinter as tk
 from tkinter import messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from datetime import datetime
+from datetime import datetime, timedelta
 import threading
+from concurrent.futures import Future
+import os
+import time
 import urllib3
+from text_normalize import clean_text
+from rate_limit import TokenBucket, QuotaTracker
 
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 class ALAPIManager:
     """ALAPI服务管理器"""
+
+    # 各服务缓存有效期(秒)；"daily" 表示当天有效，到次日零点过期
+    SERVICE_TTLS = {
+        'daily_news': 'daily',
+        'daily_article': 'daily',
+        'poetry': 30 * 60,
+        'hitokoto': 5 * 60,
+        'love_words': 10 * 60,
+        'dog_diary': 10 * 60,
+    }
+    DEFAULT_TTL = 10 * 60
+    CACHE_FILE_NAME = 'alapi_cache.json'
+    USAGE_FILE_NAME = 'alapi_usage.json'
+    DEFAULT_RATE = 1.0 # 每秒允许的请求数
+    DEFAULT_BURST = 3 # 允许连续突发的请求数
+    RATE_WAIT_TIMEOUT = 8 # 令牌不足时最多等待(秒)
     
-    def __init__(self):
+    def __init__(self, cache_dir=None):
         self.token = ""  # 移除硬编码Token，强制使用配置
         self.city = "北京" # 默认城市
         self.base_url = "https://v2.alapi.cn/api"
+        # 缓存: {缓存键: {"data": ..., "fetched_at": 时间戳, "expires_at": 时间戳}}
         self.cache = {}
+        self.cache_file = os.path.join(cache_dir, self.CACHE_FILE_NAME) if cache_dir else None
+        self._cache_lock = threading.Lock()
+        self._save_lock = threading.Lock() # 串行化写盘；写盘期间不占用缓存锁
+        self._inflight = {} # 缓存键 -> 进行中请求的 Future，相同请求共用一次网络调用
+        self._load_cache()
+
+        # 客户端限流：每个Token一个令牌桶，配合服务端限流/额度响应退避
+        self.rate_per_second = self.DEFAULT_RATE
+        self.burst = self.DEFAULT_BURST
+        self._buckets = {}
+        self._bucket_lock = threading.Lock()
+        self.quota = QuotaTracker(os.path.join(cache_dir, self.USAGE_FILE_NAME) if cache_dir else None)
         
         # 服务配置
         self.services = {
@@ -53,12 +87,152 @@ class ALAPIManager:
     def get_token(self):
         """获取API Token"""
         return self.token
+
+    def set_rate_limit(self, rate_per_second, burst):
+        """设置客户端限流速率"""
+        self.rate_per_second = max(0.05, float(rate_per_second))
+        self.burst = max(1, int(burst))
+        with self._bucket_lock:
+            for bucket in self._buckets.values():
+                bucket.configure(self.rate_per_second, self.burst)
+
+    def get_usage(self):
+        """当前Token当天的用量统计"""
+        return self.quota.usage(self.token)
+
+    def _acquire_slot(self, token):
+        """请求前检查退避并取令牌；不能发出请求时返回错误信息，否则返回 None"""
+        blocked = self.quota.blocked_for(token)
+        if blocked > 0:
+            self.quota.record_throttled(token)
+            if self.quota.usage(token).get("quota_exhausted"):
+                return {'error': True, 'message': '今日接口额度已用完，明天自动恢复', 'throttled': True}
+            return {'error': True, 'message': f'请求过于频繁，{int(blocked) + 1}秒后重试', 'throttled': True}
+
+        with self._bucket_lock:
+            bucket = self._buckets.get(token)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_per_second, self.burst)
+                self._buckets[token] = bucket
+        if not bucket.acquire(timeout=self.RATE_WAIT_TIMEOUT):
+            self.quota.record_throttled(token)
+            return {'error': True, 'message': '请求排队超时，请稍后再试', 'throttled': True}
+        return None
     
+    def _cache_key(self, service_key, params):
+        if not params:
+            return service_key
+        return service_key + "?" + json.dumps(params, sort_keys=True, ensure_ascii=False)
+
+    def _expires_at(self, service_key, now):
+        ttl = self.SERVICE_TTLS.get(service_key, self.DEFAULT_TTL)
+        if ttl == 'daily':
+            tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+            return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+        return now + ttl
+
+    def _load_cache(self):
+        """从磁盘加载缓存"""
+        if not self.cache_file:
+            return
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self.cache = data
+        except Exception as e:
+            print(f"加载信息推送缓存失败: {e}")
+
+    def _save_cache(self):
+        """保存缓存到磁盘"""
+        if not self.cache_file:
+            return
+        with self._save_lock:
+            # 在写盘锁内取快照，后写入的一定是更新的快照
+            with self._cache_lock:
+                snapshot = dict(self.cache)
+            try:
+                os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+                tmp_path = self.cache_file + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_file)
+            except Exception as e:
+                print(f"保存信息推送缓存失败: {e}")
+
+    def _store(self, service_key, cache_key, data):
+        """只缓存成功的结果"""
+        if not isinstance(data, dict) or data.get('error'):
+            return
+        now = time.time()
+        with self._cache_lock:
+            self.cache[cache_key] = {
+                'data': data,
+                'fetched_at': now,
+                'expires_at': self._expires_at(service_key, now),
+            }
+        self._save_cache()
+
+    def _request_shared(self, service_key, cache_key, params):
+        """同一缓存键同时只发一次请求，其余调用等待同一个 Future。
+
+        结果（包括错误）由所有等待者共享；错误不写入缓存，下次调用会重新请求。
+        """
+        with self._cache_lock:
+            future = self._inflight.get(cache_key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[cache_key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            data = self._request_service(service_key, params)
+            self._store(service_key, cache_key, data)
+            future.set_result(data)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(cache_key, None)
+        return future.result()
+
+    def _refresh_in_background(self, service_key, cache_key, params):
+        with self._cache_lock:
+            if cache_key in self._inflight:
+                return
+
+        def worker():
+            try:
+                self._request_shared(service_key, cache_key, params)
+            except Exception as e:
+                print(f"后台刷新{service_key}失败: {e}")
+
+        threading.Thread(target=worker, daemon=True).start()
+
     def fetch_service_data(self, service_key, **params):
-        """获取服务数据"""
+        """获取服务数据
+
+        缓存未过期直接返回；已过期则先返回旧数据并在后台刷新；没有缓存才同步请求。
+        """
         if service_key not in self.services:
             return None
-        
+
+        cache_key = self._cache_key(service_key, params)
+        with self._cache_lock:
+            entry = self.cache.get(cache_key)
+        if entry:
+            if time.time() >= entry.get('expires_at', 0):
+                self._refresh_in_background(service_key, cache_key, params)
+            return entry.get('data')
+
+        return self._request_shared(service_key, cache_key, params)
+
+    def _request_service(self, service_key, params):
+        """向接口请求服务数据（不经过缓存）"""
         service = self.services[service_key]
         
         # 处理自定义服务
@@ -74,13 +248,35 @@ class ALAPIManager:
         }
         
         request_params.update(params)
+
+        token = self.token
+        rejected = self._acquire_slot(token)
+        if rejected:
+            return rejected
         
         try:
+            self.quota.record_request(token)
             response = requests.get(url, params=request_params, timeout=10, verify=False)
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+            if not isinstance(data, dict):
+                data = {}
+
+            limited = self.quota.classify(response.status_code, data.get('code'), data.get('msg', ''))
+            if limited:
+                delay = self.quota.record_limited(token, limited, response.headers.get('Retry-After'))
+                if limited == 'quota':
+                    message = data.get('msg') or '今日接口额度已用完'
+                else:
+                    message = f"请求过于频繁，{int(delay) + 1}秒后重试"
+                return {'error': True, 'message': message, 'throttled': True}
+
             response.raise_for_status()
-            data = response.json()
             
             if data.get('code') == 200:
+                self.quota.record_success(token)
                 return data.get('data', {})
             else:
                 return {
@@ -118,53 +314,17 @@ class ALAPIManager:
             return str(data)
     
     def clear_cache(self, service_key=None):
-        """清除缓存"""
-        if service_key:
-            self.cache.pop(service_key, None)
-        else:
-            self.cache.clear()
+        """清除缓存（指定服务时连同带参数的缓存一并清除）"""
+        with self._cache_lock:
+            if service_key:
+                for cache_key in [k for k in self.cache if k == service_key or k.startswith(service_key + "?")]:
+                    del self.cache[cache_key]
+            else:
+                self.cache.clear()
+        self._save_cache()
     
     def _format_daily_news(self, data):
         """格式化每日早报"""
-        import re
-        
-        def clean_text_thoroughly(text):
-            """彻底清理文本中的序号"""
-            if not text:
-                return ""
-            
-            clean_text = text.strip()
-            max_iterations = 10  # 防止无限循环
-            iteration = 0
-            
-            while iteration < max_iterations:
-                original = clean_text
-                
-                # 移除各种序号格式（更全面的正则表达式）
-                patterns = [
-                    r'^\d+[.、）)】]\s*',           # 1. 2、 3） 4) 5】
-                    r'^[\(（]\d+[\)）]\s*',         # (1) （2）
-                    r'^【\d+】\s*',                # 【1】
-                    r'^[•·▪▫◦‣⁃]\s*',             # 各种点符号
-                    r'^\d+\s*[.、）)】]\s*',       # 数字后面有空格的情况
-                    r'^\s*\d+[.、）)】]\s*',       # 前面有空格的情况
-                    r'^第\d+[条项]\s*',            # 第1条 第2项
-                    r'^\d+\s+',                   # 纯数字后面跟空格
-                ]
-                
-                for pattern in patterns:
-                    clean_text = re.sub(pattern, '', clean_text)
-                
-                clean_text = clean_text.strip()
-                
-                # 如果没有变化，说明清理完成
-                if clean_text == original:
-                    break
-                    
-                iteration += 1
-            
-            return clean_text
-        
         formatted_text = "📰 每日早报\n\n"
         
         news_list = data.get('news', [])
@@ -173,12 +333,12 @@ class ALAPIManager:
         
         for i, news_item in enumerate(news_list, 1):
             if isinstance(news_item, str):
-                clean_item = clean_text_thoroughly(news_item)
+                clean_item = clean_text(news_item)
                 if clean_item:
                     formatted_text += f"{i}. {clean_item}\n\n"
             elif isinstance(news_item, dict):
                 title = news_item.get('title', news_item.get('content', ''))
-                clean_title = clean_text_thoroughly(title)
+                clean_title = clean_text(title)
                 if clean_title:
                     formatted_text += f"{i}. {clean_title}\n\n"
         
@@ -2,12 +2,20 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox
 import re
 import sys
+import json
+import hashlib
 
 class InfoPushWidget(ttk.Frame):
     """信息推送显示组件"""
+
+    MAX_CONCURRENT_FETCHES = 4 # 同时请求的服务数上限
+    LONG_CONTENT_CHARS = 1500 # 超过该长度的内容改用 Text 分段渲染（如每日一文）
+    LONG_TEXT_LINES = 18 # 长文卡片的可视行数，首屏段落同步插入
+    PARAGRAPHS_PER_CHUNK = 6 # 其余段落每次空闲时插入的数量
     
     def __init__(self, parent, alapi_manager, on_settings_click=None, ui_after=None, **kwargs):
         super().__init__(parent, **kwargs)
@@ -15,6 +23,11 @@ class InfoPushWidget(ttk.Frame):
         self.on_settings_click = on_settings_click
         self.ui_after = ui_after
         self.selected_services = []
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_FETCHES, thread_name_prefix="info-push")
+        self._load_generation = 0 # 每次加载递增，丢弃过期加载的结果
+        self._cards = {} # service_key -> {"slot", "hash", "card", "label", "state", "fg", "kind"}
+        self._packed_order = [] # 当前显示的卡片顺序
+        self._message_frame = None
         
         self.setup_ui()
 
@@ -38,7 +51,7 @@ class InfoPushWidget(ttk.Frame):
         button_frame.pack(fill=X, pady=(0, 10))
         
         ttk.Button(button_frame, text="刷新内容", 
-                  command=self.refresh_content, 
+                  command=self.force_refresh, 
                   bootstyle=SUCCESS).pack(side=LEFT, padx=(0, 5))
         
         if self.on_settings_click:
@@ -51,29 +64,63 @@ class InfoPushWidget(ttk.Frame):
     def refresh_content(self):
         """刷新内容"""
         self.load_selected_services()
+
+    def force_refresh(self):
+        """跳过缓存重新获取选中的服务"""
+        for service_key in self.selected_services:
+            self.alapi_manager.clear_cache(service_key)
+        self.load_selected_services()
         
     def load_selected_services(self):
-        """加载选中服务的内容"""
-        # 清空现有内容
-        for widget in self.scroll_content.winfo_children():
-            widget.destroy()
-            
+        """加载选中服务的内容
+
+        卡片按服务缓存复用：已有卡片保留旧内容等待新结果，新勾选的服务先放骨架占位，
+        取消勾选的服务只隐藏不销毁；勾选顺序不变时不做任何布局操作。
+        """
+        self._load_generation += 1
+
         if not self.selected_services:
             self._show_message("请先在设置页面勾选要查看的信息推送服务")
             return
+
+        self._hide_message()
+        for service_key in self.selected_services:
+            if service_key not in self._cards:
+                slot = ttk.Frame(self.scroll_content)
+                self._create_skeleton(slot, self._service_name(service_key))
+                self._bind_mousewheel(slot)
+                self._cards[service_key] = {"slot": slot, "hash": None, "label": None, "kind": None}
+
+        if self._packed_order != self.selected_services:
+            for service_key in self._packed_order:
+                self._cards[service_key]["slot"].pack_forget()
+            for service_key in self.selected_services:
+                self._cards[service_key]["slot"].pack(fill=X, expand=True)
+            self._packed_order = list(self.selected_services)
         
-        self._show_message("正在加载数据，请稍候...", loading=True)
-        
-        # 在后台线程中加载数据
-        threading.Thread(target=self._load_services_data, daemon=True).start()
+        # 在线程池中并发加载数据
+        self._load_services_data()
+
+    def _service_name(self, service_key):
+        return self.alapi_manager.services.get(service_key, {}).get('name', service_key)
+
+    def _create_skeleton(self, parent, name):
+        """加载中的占位卡片"""
+        card = ttk.Labelframe(parent, text=f" {name} ", padding=15, bootstyle="secondary")
+        card.pack(fill=X, expand=True, padx=10, pady=10)
+        ttk.Label(card, text="⏳ 正在加载...", font=("Microsoft YaHei", 11), bootstyle=SECONDARY).pack(anchor=W)
     
     def _show_message(self, message, loading=False):
-        """显示消息"""
-        for widget in self.scroll_content.winfo_children():
-            widget.destroy()
-            
+        """显示消息（隐藏所有卡片）"""
+        for service_key in self._packed_order:
+            self._cards[service_key]["slot"].pack_forget()
+        self._packed_order = []
+
+        if self._message_frame is not None:
+            self._message_frame.destroy()
         frame = ttk.Frame(self.scroll_content, padding=20)
         frame.pack(fill=X, expand=True)
+        self._message_frame = frame
         
         if loading:
             ttk.Label(frame, text="⏳", font=("Microsoft YaHei", 24)).pack(pady=10)
@@ -81,52 +128,141 @@ class InfoPushWidget(ttk.Frame):
         ttk.Label(frame, text=message, font=("Microsoft YaHei", 12), 
                  bootstyle=SECONDARY, justify=CENTER).pack(pady=10)
 
+    def _hide_message(self):
+        if self._message_frame is not None:
+            self._message_frame.destroy()
+            self._message_frame = None
+
     def _load_services_data(self):
-        """在后台线程中加载服务数据"""
-        results = []
-        
+        """把每个服务提交到线程池，互不等待；结果逐个回到主线程渲染"""
+        generation = self._load_generation
         for service_key in self.selected_services:
-            service_name = self.alapi_manager.services.get(service_key, {}).get('name', service_key)
-            
-            try:
-                # 获取数据
-                data = self.alapi_manager.fetch_service_data(service_key)
-                # 格式化数据
-                formatted_data = self.alapi_manager.format_service_data(service_key, data)
-                results.append({
-                    'name': service_name,
-                    'content': formatted_data,
-                    'error': False
-                })
-            except Exception as e:
-                results.append({
-                    'name': service_name,
-                    'content': f"获取失败: {str(e)}",
-                    'error': True
-                })
+            self._executor.submit(self._fetch_one, generation, service_key)
+
+    def _fetch_one(self, generation, service_key):
+        """在线程池中获取并格式化单个服务"""
+        service_name = self._service_name(service_key)
+        try:
+            # 获取数据
+            data = self.alapi_manager.fetch_service_data(service_key)
+            # 格式化数据
+            formatted_data = self.alapi_manager.format_service_data(service_key, data)
+            item = {
+                'name': service_name,
+                'content': formatted_data,
+                'error': False
+            }
+        except Exception as e:
+            item = {
+                'name': service_name,
+                'content': f"获取失败: {str(e)}",
+                'error': True
+            }
         
         # 在主线程中更新UI
-        self._ui(0, lambda: self._update_content(results))
+        self._ui(0, lambda: self._update_card(generation, service_key, item))
+
+    def _content_hash(self, item):
+        raw = json.dumps([item.get('name'), item.get('content'), bool(item.get('error'))], ensure_ascii=False)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
     
-    def _update_content(self, data):
-        """更新内容显示"""
-        # 清空现有内容
-        for widget in self.scroll_content.winfo_children():
-            widget.destroy()
-            
-        if not data:
-             self._show_message("暂无数据")
-             return
+    def _update_card(self, generation, service_key, item):
+        """内容有变化才更新对应卡片：已有卡片就地修改，骨架占位则换成卡片"""
+        if generation != self._load_generation:
+            return
+        entry = self._cards.get(service_key)
+        if entry is None:
+            return
+        digest = self._content_hash(item)
+        if entry["hash"] == digest:
+            return
+        try:
+            if entry["label"] is not None and entry["kind"] == self._content_kind(item):
+                self._fill_card(entry, item)
+            else:
+                for widget in entry["slot"].winfo_children():
+                    widget.destroy()
+                entry.update(self._create_card(item, parent=entry["slot"]))
+                # Re-bind mousewheel for new widgets
+                self._bind_mousewheel(entry["slot"])
+            entry["hash"] = digest
+        except tk.TclError:
+            pass
 
-        for item in data:
-            self._create_card(item)
-            
-        # Re-bind mousewheel for new widgets
-        self._bind_mousewheel(self.scroll_content)
+    def _fill_card(self, entry, item):
+        """用新内容更新已有卡片的标题、正文和复制内容"""
+        entry["card"].configure(text=f" {item['name']} ")
+        normalized_content = self._normalize_content(item.get("name", ""), item.get("content", ""))
+        color = "#DC3545" if item['error'] else entry["fg"]
+        if entry["kind"] == "text":
+            entry["label"].configure(fg=color)
+            self._render_paragraphs(entry["label"], entry["state"], normalized_content)
+        else:
+            entry["label"].configure(text=normalized_content, fg=color)
+        entry["state"]["content"] = item['content']
+
+    def _content_kind(self, item):
+        """短内容用 Label，长文用 Text"""
+        return "text" if len(item.get("content") or "") > self.LONG_CONTENT_CHARS else "label"
+
+    def _create_long_text(self, parent, bg, fg):
+        """长文正文：只读 Text，自带滚动条，由 Text 自己完成换行排版"""
+        frame = ttk.Frame(parent)
+        frame.pack(fill=X, expand=True)
+        text = tk.Text(
+            frame,
+            wrap="word",
+            height=self.LONG_TEXT_LINES,
+            font=("Microsoft YaHei", 11),
+            borderwidth=0,
+            highlightthickness=0,
+            relief="flat",
+            undo=False,
+            background=bg,
+            foreground=fg,
+            cursor="arrow",
+            state="disabled",
+            takefocus=0,
+        )
+        scrollbar = ttk.Scrollbar(frame, orient=VERTICAL, command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        text.pack(side=LEFT, fill=X, expand=True)
+        return text
+
+    def _render_paragraphs(self, text, state, content):
+        """先同步插入首屏段落，其余按段分块在空闲时追加；重新渲染会作废未完成的追加"""
+        state["render_id"] = state.get("render_id", 0) + 1
+        render_id = state["render_id"]
+        paragraphs = content.split("\n")
+        first, rest = paragraphs[:self.LONG_TEXT_LINES], paragraphs[self.LONG_TEXT_LINES:]
+
+        text.configure(state="normal")
+        text.delete("1.0", "end")
+        text.insert("end", "\n".join(first))
+        text.configure(state="disabled")
 
-    def _create_card(self, item):
-        """创建卡片"""
-        card = ttk.Labelframe(self.scroll_content, text=f" {item['name']} ", padding=15, bootstyle="info")
+        def insert_chunk(start):
+            if state.get("render_id") != render_id:
+                return
+            chunk = rest[start:start + self.PARAGRAPHS_PER_CHUNK]
+            if not chunk:
+                return
+            try:
+                text.configure(state="normal")
+                text.insert("end", "\n" + "\n".join(chunk))
+                text.configure(state="disabled")
+                # 空闲回调里登记的空闲回调会留到下一轮，期间事件照常处理
+                text.after_idle(lambda: insert_chunk(start + self.PARAGRAPHS_PER_CHUNK))
+            except tk.TclError:
+                pass
+
+        if rest:
+            text.after_idle(lambda: insert_chunk(0))
+
+    def _create_card(self, item, parent=None):
+        """创建卡片，返回后续就地更新所需的控件"""
+        card = ttk.Labelframe(parent or self.scroll_content, text=f" {item['name']} ", padding=15, bootstyle="info")
         card.pack(fill=X, expand=True, padx=10, pady=10)
         
         # 内容容器
@@ -142,6 +278,16 @@ class InfoPushWidget(ttk.Frame):
             fg = "#111111"
 
         normalized_content = self._normalize_content(item.get("name", ""), item.get("content", ""))
+        state = {"job": None, "last": None, "content": item['content']}
+
+        if self._content_kind(item) == "text":
+            content_text = self._create_long_text(content_frame, bg, fg)
+            if item['error']:
+                content_text.configure(fg="#DC3545")
+            self._render_paragraphs(content_text, state, normalized_content)
+            self._create_card_toolbar(card, state)
+            return {"card": card, "label": content_text, "state": state, "fg": fg, "kind": "text"}
+
         content_label = tk.Label(
             content_frame,
             text=normalized_content,
@@ -159,8 +305,6 @@ class InfoPushWidget(ttk.Frame):
                 pass
         
         content_label.pack(fill=X, expand=True)
-        
-        state = {"job": None, "last": None}
 
         def apply_wrap(w):
             if not w or w <= 0:
@@ -190,14 +334,18 @@ class InfoPushWidget(ttk.Frame):
                 apply_wrap(w)
 
         card.bind("<Configure>", on_resize, add="+")
-        
-        # 底部工具栏
+        self._create_card_toolbar(card, state)
+
+        return {"card": card, "label": content_label, "state": state, "fg": fg, "kind": "label"}
+
+    def _create_card_toolbar(self, card, state):
+        """底部工具栏"""
         tool_frame = ttk.Frame(card)
         tool_frame.pack(fill=X, pady=(10, 0))
         
-        def copy_content(text=item['content']):
+        def copy_content():
             self.clipboard_clear()
-            self.clipboard_append(text)
+            self.clipboard_append(state["content"])
             messagebox.showinfo("提示", "内容已复制到剪贴板", parent=self)
             
         ttk.Button(tool_frame, text="复制", command=copy_content, bootstyle="link-secondary", cursor="hand2").pack(side=RIGHT)
@@ -257,7 +405,9 @@ class InfoPushWidget(ttk.Frame):
             pass
         
     def _bind_mousewheel(self, widget):
-        """递归绑定滚轮事件"""
+        """递归绑定滚轮事件（长文 Text 保留自身滚动）"""
+        if isinstance(widget, tk.Text):
+            return
         if sys.platform.startswith('win'):
             widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
         else:
@@ -0,0 +1,32 @@
+"""
+悬浮球渲染辅助 - 色键透明处理等与Tk无关的图像操作
+"""
+from PIL import Image
+
+# 与悬浮球窗口 -transparentcolor 一致的色键 (#000001)
+KEY_COLOR_RGB = (0, 0, 1)
+# Alpha 高于该值的像素视为不透明，其余替换为色键
+ALPHA_THRESHOLD = 100
+
+_ALPHA_LUT = [255 if v > ALPHA_THRESHOLD else 0 for v in range(256)]
+
+
+def apply_binary_alpha(image, size):
+    """将超采样的RGBA图像缩放到 size 并二值化Alpha，透明部分填充色键。
+
+    返回可直接用于 PhotoImage 的 RGB 图像。
+    """
+    image = image.resize((size, size), Image.Resampling.LANCZOS)
+    return color_key_alpha(image)
+
+
+def color_key_alpha(image):
+    """二值化Alpha：不透明像素保留RGB，其余替换为色键。
+
+    全部使用PIL原生操作（point/composite），不逐像素遍历。
+    """
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    mask = image.getchannel("A").point(_ALPHA_LUT)
+    background = Image.new("RGB", image.size, KEY_COLOR_RGB)
+    return Image.composite(image.convert("RGB"), background, mask)
@@ -0,0 +1,346 @@
+"""
+悬浮球皮肤引擎 - 皮肤以数据描述（图层、渐变、环绕精灵、脉冲曲线），
+编译为一个动画周期的帧序列，并按定义哈希与尺寸缓存到磁盘
+"""
+import os
+import re
+import json
+import math
+import glob
+import hashlib
+from PIL import Image, ImageDraw, ImageColor
+
+from ball_render import apply_binary_alpha
+
+SUPERSAMPLE = 4 # 4x超采样保证内部细节平滑
+MARGIN_PX = 2 # 留出边缘空间，确保不被截断
+RENDERER_VERSION = 1 # 渲染逻辑变化时递增，使旧的磁盘缓存失效
+
+DEFAULT_DOCK = {"color": ["#3A7AFE", "#00D2FF"], "bg": ["#1B3A8A", "#2457D6"]}
+
+# 图层说明：
+#   shape   ellipse / arc / ray / gradient
+#   长度    以外圈半径为单位；带 _px 后缀的同名字段以输出像素为单位，两者相加
+#           圆: r, cx, cy    矩形框(左上角锚定): x, y, w, h
+#   颜色    fill / outline / color，[r, g, b, a] 或 "#RRGGBB"
+#   width   线宽（输出像素）
+#   arc     start / extent（度），spin 为随相位旋转的倍率
+#   ray     从 r0 到 r1 的径向线段，angle（弧度）+ spin
+#   orbit   {"r", "spin", "count"}：将该图层复制到环绕轨道上
+#   数值或颜色可写成 {"curve": 名称, "from": a, "to": b}，按 curves 中的
+#   脉冲曲线 (sin(phase * speed + offset) + 1) / 2 插值
+BUILTIN_SKINS = [
+    {
+        "id": "future_orb",
+        "name": "未来光球",
+        "curves": {"glow": {"speed": 1.0}},
+        "layers": [
+            # 外部底盘 (Chassis)
+            {"shape": "ellipse", "r": 1.0, "fill": [20, 25, 35, 255]},
+            # 内部流光环 (Glowing Ring)
+            {"shape": "ellipse", "r": 0.92, "width": 4,
+             "outline": {"curve": "glow", "from": [0, 150, 255, 255], "to": [0, 200, 255, 255]}},
+            # 核心能量球 (Core Energy)
+            {"shape": "ellipse", "r": 0.65, "fill": [10, 20, 50, 255]},
+            # 旋转的卫星 (Satellites)
+            {"shape": "ellipse", "r_px": 5, "fill": [255, 255, 255, 255],
+             "orbit": {"r": 0.78, "spin": 1.5, "count": 2}},
+            # 玻璃质感高光 (Glass Highlight)
+            {"shape": "ellipse", "x": -0.4, "y": -0.4, "w_px": 4, "h_px": 4, "fill": [255, 255, 255, 255]},
+        ],
+        "dock": {"color": ["#3A7AFE", "#00D2FF"], "bg": ["#1B3A8A", "#2457D6"]},
+    },
+    {
+        "id": "neon_pulse",
+        "name": "霓虹脉冲",
+        "curves": {"beat": {"speed": 3.0}},
+        "layers": [
+            {"shape": "ellipse", "r": 1.0, "fill": [20, 0, 30, 255]},
+            # 旋转的扫描弧线
+            {"shape": "arc", "r": 0.9, "start": 0, "extent": 60, "spin": 1.5, "color": [0, 255, 255, 255], "width": 3},
+            {"shape": "arc", "r": 0.9, "start": 180, "extent": 60, "spin": 1.5, "color": [255, 0, 255, 255], "width": 3},
+            # 脉冲环 - 粉色呼吸
+            {"shape": "ellipse", "r": 0.75, "width": 4,
+             "outline": {"curve": "beat", "from": [255, 0, 150, 255], "to": [255, 0, 255, 255]}},
+            # 核心 - 亮紫色 (大小呼吸)
+            {"shape": "ellipse", "r": {"curve": "beat", "from": 0.36, "to": 0.44}, "fill": [120, 0, 180, 255]},
+            # 旋转十字光标
+            {"shape": "ray", "angle": 0, "spin": 1.0, "color": [255, 255, 255, 255], "width": 2,
+             "r0": {"curve": "beat", "from": 0.11, "to": 0.19}, "r1": {"curve": "beat", "from": 0.61, "to": 0.69}},
+            {"shape": "ray", "angle": math.pi / 2, "spin": 1.0, "color": [255, 255, 255, 255], "width": 2,
+             "r0": {"curve": "beat", "from": 0.11, "to": 0.19}, "r1": {"curve": "beat", "from": 0.61, "to": 0.69}},
+        ],
+        "dock": {"color": ["#FF00FF", "#FF66FF"], "bg": ["#440044", "#660066"]},
+    },
+    {
+        "id": "classic_blue",
+        "name": "经典蓝",
+        "curves": {"shine": {"speed": 1.5}},
+        "layers": [
+            # 模拟3D球体渐变 (从左上亮到右下暗)
+            {"shape": "gradient", "r": 1.0, "steps": 40, "shift": 0.4,
+             "from": [60, 120, 255, 255], "to": [0, 30, 100, 255]},
+            # 外部轮廓
+            {"shape": "ellipse", "r": 1.0, "outline": [0, 20, 80, 255], "width": 1.5},
+            # 动态高光 (呼吸效果)
+            {"shape": "ellipse", "x": -0.4, "y": -0.4, "fill": [255, 255, 255, 200],
+             "w": {"curve": "shine", "from": 0.27, "to": 0.3},
+             "h": {"curve": "shine", "from": 0.2025, "to": 0.225}},
+            {"shape": "ellipse", "x": -0.4, "x_px": 1, "y": -0.4, "y_px": 1, "fill": [255, 255, 255, 255],
+             "w": {"curve": "shine", "from": 0.27, "to": 0.3}, "w_px": -2,
+             "h": {"curve": "shine", "from": 0.2025, "to": 0.225}, "h_px": -2},
+            # 底部反光 (Rim Light)
+            {"shape": "arc", "r": 0.9, "start": 30, "extent": 70, "color": [100, 200, 255, 255], "width": 3},
+        ],
+        "dock": {"color": ["#0066CC", "#3399FF"], "bg": ["#003366", "#004488"]},
+    },
+    {
+        "id": "minimalist_white",
+        "name": "简约白",
+        "curves": {"breath": {"speed": 2.0}},
+        "layers": [
+            # 外层光晕环 + 主体白底
+            {"shape": "ellipse", "r": 1.0, "fill": [220, 220, 220, 255]},
+            {"shape": "ellipse", "r": 0.95, "fill": [255, 255, 255, 255]},
+            # 旋转的灰色圆环段 (Loading效果)
+            {"shape": "arc", "r": 0.8075, "start": 0, "extent": 90, "spin": 2.0, "color": [180, 180, 180, 255], "width": 3},
+            {"shape": "arc", "r": 0.8075, "start": 180, "extent": 90, "spin": 2.0, "color": [220, 220, 220, 255], "width": 3},
+            # 中心装饰：阴影、实体、边框
+            {"shape": "ellipse", "r": 0.3325, "cy_px": 2, "fill": [200, 200, 200, 255]},
+            {"shape": "ellipse", "r": 0.3325, "fill": [245, 245, 245, 255]},
+            {"shape": "ellipse", "r": 0.3325, "outline": [150, 150, 150, 255], "width": 1.5},
+            # 中心呼吸点
+            {"shape": "ellipse", "r": {"curve": "breath", "from": 0.1064, "to": 0.133}, "fill": [50, 50, 50, 255]},
+        ],
+        "dock": {"color": ["#888888", "#AAAAAA"], "bg": ["#FFFFFF", "#F0F0F0"]},
+    },
+]
+
+
+def load_skins(user_dir=None):
+    """返回 {skin_id: 定义}，内置皮肤在前；user_dir 下的 *.json 可新增或覆盖皮肤"""
+    skins = {}
+    for definition in BUILTIN_SKINS:
+        skins[definition["id"]] = definition
+
+    if not user_dir or not os.path.isdir(user_dir):
+        return skins
+
+    for path in sorted(glob.glob(os.path.join(user_dir, "*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"加载皮肤失败 {path}: {e}")
+            continue
+
+        for definition in (data if isinstance(data, list) else [data]):
+            if not isinstance(definition, dict):
+                continue
+            skin_id = definition.get("id")
+            if not skin_id or not isinstance(definition.get("layers"), list):
+                print(f"忽略无效皮肤定义: {path}")
+                continue
+            definition.setdefault("name", str(skin_id))
+            skins[str(skin_id)] = definition
+
+    return skins
+
+
+def skin_hash(definition):
+    """只对影响画面的部分取哈希，名称与吸附条颜色不参与"""
+    payload = {
+        "v": RENDERER_VERSION,
+        "curves": definition.get("curves") or {},
+        "layers": definition.get("layers") or [],
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def dock_colors(definition, highlight):
+    """吸附条的 (边框色, 背景色)"""
+    dock = definition.get("dock") or DEFAULT_DOCK
+    idx = 1 if highlight else 0
+    try:
+        return dock["color"][idx], dock["bg"][idx]
+    except Exception:
+        return DEFAULT_DOCK["color"][idx], DEFAULT_DOCK["bg"][idx]
+
+
+def _curve_values(definition, phase):
+    values = {}
+    for name, curve in (definition.get("curves") or {}).items():
+        speed = float(curve.get("speed", 1.0))
+        offset = float(curve.get("offset", 0.0))
+        values[name] = (math.sin(phase * speed + offset) + 1) / 2
+    return values
+
+
+def _value(spec, pulses):
+    if isinstance(spec, dict):
+        p = pulses.get(spec.get("curve"), 0.0)
+        a = spec.get("from", 0.0)
+        b = spec.get("to", a)
+        if isinstance(a, (list, tuple)):
+            return tuple(int(x) + int((int(y) - int(x)) * p) for x, y in zip(a, b))
+        return float(a) + (float(b) - float(a)) * p
+    if isinstance(spec, (list, tuple)):
+        return tuple(int(x) for x in spec)
+    return float(spec or 0.0)
+
+
+def _color(spec, pulses):
+    if spec is None:
+        return None
+    if isinstance(spec, str):
+        return ImageColor.getcolor(spec, "RGBA")
+    return _value(spec, pulses)
+
+
+def _length(layer, key, unit, scale, pulses):
+    return _value(layer.get(key), pulses) * unit + _value(layer.get(key + "_px"), pulses) * scale
+
+
+def _draw_layer(draw, layer, cx, cy, unit, scale, phase, pulses):
+    shape = layer.get("shape", "ellipse")
+    width = int(_value(layer.get("width", 1), pulses) * scale)
+
+    cx += _length(layer, "cx", unit, scale, pulses)
+    cy += _length(layer, "cy", unit, scale, pulses)
+
+    if shape == "ellipse":
+        if "w" in layer or "w_px" in layer:
+            x0 = cx + _length(layer, "x", unit, scale, pulses)
+            y0 = cy + _length(layer, "y", unit, scale, pulses)
+            bbox = [x0, y0,
+                    x0 + _length(layer, "w", unit, scale, pulses),
+                    y0 + _length(layer, "h", unit, scale, pulses)]
+        else:
+            r = _length(layer, "r", unit, scale, pulses)
+            bbox = [cx - r, cy - r, cx + r, cy + r]
+        draw.ellipse(bbox, fill=_color(layer.get("fill"), pulses),
+                     outline=_color(layer.get("outline"), pulses), width=width)
+
+    elif shape == "arc":
+        r = _length(layer, "r", unit, scale, pulses)
+        start = _value(layer.get("start"), pulses) + math.degrees(phase * _value(layer.get("spin"), pulses))
+        end = start + _value(layer.get("extent", 360), pulses)
+        draw.arc([cx - r, cy - r, cx + r, cy + r], start=start, end=end,
+                 fill=_color(layer.get("color"), pulses), width=width)
+
+    elif shape == "ray":
+        angle = _value(layer.get("angle"), pulses) + phase * _value(layer.get("spin"), pulses)
+        r0 = _length(layer, "r0", unit, scale, pulses)
+        r1 = _length(layer, "r1", unit, scale, pulses)
+        draw.line([cx + math.cos(angle) * r0, cy + math.sin(angle) * r0,
+                   cx + math.cos(angle) * r1, cy + math.sin(angle) * r1],
+                  fill=_color(layer.get("color"), pulses), width=width)
+
+    elif shape == "gradient":
+        # 逐层缩小并向左上偏移圆心，模拟光照方向
+        outer = _length(layer, "r", unit, scale, pulses)
+        steps = max(1, int(_value(layer.get("steps", 40), pulses)))
+        shift = _value(layer.get("shift"), pulses)
+        c0 = _color(layer.get("from"), pulses)
+        c1 = _color(layer.get("to"), pulses)
+        for i in range(steps):
+            t = i / steps
+            r = outer * (1 - t)
+            offset = (outer - r) * shift
+            color = tuple(int(a * (1 - t) + b * t) for a, b in zip(c0, c1))
+            draw.ellipse([cx - offset - r, cy - offset - r, cx - offset + r, cy - offset + r], fill=color)
+
+
+def render_frame(definition, size, phase):
+    """按定义渲染单帧，返回已做色键处理的RGB图像"""
+    scale = SUPERSAMPLE
+    img_size = size * scale
+    image = Image.new("RGBA", (img_size, img_size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+
+    center = img_size / 2
+    unit = img_size / 2 - MARGIN_PX * scale
+    pulses = _curve_values(definition, phase)
+
+    for layer in definition.get("layers") or []:
+        orbit = layer.get("orbit")
+        if not orbit:
+            _draw_layer(draw, layer, center, center, unit, scale, phase, pulses)
+            continue
+        count = max(1, int(orbit.get("count", 1)))
+        orbit_r = _value(orbit.get("r"), pulses) * unit
+        for i in range(count):
+            angle = phase * _value(orbit.get("spin"), pulses) + i * 2 * math.pi / count
+            _draw_layer(draw, layer,
+                        center + math.cos(angle) * orbit_r,
+                        center + math.sin(angle) * orbit_r,
+                        unit, scale, phase, pulses)
+
+    return apply_binary_alpha(image, size)
+
+
+def compile_frames(definition, size, frames):
+    """把皮肤编译为一个相位周期 (2π) 内均匀分布的 frames 帧"""
+    step = 2 * math.pi / frames
+    return [render_frame(definition, size, i * step) for i in range(frames)]
+
+
+class SkinFrameStore:
+    """编译结果的磁盘缓存：每个 (皮肤, 定义哈希, 尺寸, 帧数) 存为一张横向拼接的PNG"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _prefix(self, skin_id):
+        return re.sub(r"[^A-Za-z0-9_]", "_", str(skin_id))
+
+    def _path(self, skin_id, digest, size, frames):
+        return os.path.join(self.cache_dir, f"{self._prefix(skin_id)}-{digest}-{size}x{frames}.png")
+
+    def load(self, skin_id, definition, size, frames):
+        path = self._path(skin_id, skin_hash(definition), size, frames)
+        if not os.path.exists(path):
+            return None
+        try:
+            with Image.open(path) as strip:
+                strip.load()
+                if strip.size != (size * frames, size):
+                    return None
+                strip = strip.convert("RGB")
+            return [strip.crop((i * size, 0, (i + 1) * size, size)) for i in range(frames)]
+        except Exception as e:
+            print(f"读取皮肤缓存失败 {path}: {e}")
+            return None
+
+    def save(self, skin_id, definition, size, frames, images):
+        digest = skin_hash(definition)
+        path = self._path(skin_id, digest, size, frames)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            strip = Image.new("RGB", (size * frames, size))
+            for i, image in enumerate(images):
+                strip.paste(image, (i * size, 0))
+            tmp_path = path + ".tmp"
+            strip.save(tmp_path, format="PNG")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"保存皮肤缓存失败 {path}: {e}")
+            return
+
+        # 清理同一皮肤旧定义留下的缓存
+        for old in glob.glob(os.path.join(self.cache_dir, f"{self._prefix(skin_id)}-*.png")):
+            if f"-{digest}-" not in os.path.basename(old):
+                try:
+                    os.remove(old)
+                except Exception:
+                    pass
+
+    def get_frames(self, skin_id, definition, size, frames):
+        """优先读取磁盘缓存，没有则编译并写回"""
+        images = self.load(skin_id, definition, size, frames)
+        if images is not None:
+            return images
+        images = compile_frames(definition, size, frames)
+        self.save(skin_id, definition, size, frames, images)
+        return images
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+悬浮球色键透明处理基准测试
+对比逐像素 getdata/putdata 的旧实现与 point/composite 的新实现
+
+用法: python benchmarks/bench_binary_alpha.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from ball_render import color_key_alpha
+
+SIZES = (70, 140, 280)
+SCALE = 4
+
+
+def legacy_color_key_alpha(image):
+    """旧实现：Python 逐像素遍历"""
+    bg_color_rgb = (0, 0, 1)
+    final_image = Image.new("RGB", image.size, bg_color_rgb)
+    new_data = []
+    for item in image.getdata():
+        if item[3] > 100:
+            new_data.append(item[:3])
+        else:
+            new_data.append(bg_color_rgb)
+    final_image.putdata(new_data)
+    return final_image
+
+
+def make_source(size):
+    """生成与悬浮球一致的输入：超采样绘制后LANCZOS缩放回 size 的RGBA图像"""
+    img_size = size * SCALE
+    image = Image.new("RGBA", (img_size, img_size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    margin = 2 * SCALE
+    draw.ellipse([margin, margin, img_size - margin, img_size - margin], fill=(20, 25, 35, 255))
+    ring = img_size * 0.1
+    draw.ellipse([ring, ring, img_size - ring, img_size - ring], outline=(0, 180, 255, 255), width=4 * SCALE)
+    return image.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def main():
+    print("色键Alpha二值化（不含LANCZOS缩放）")
+    print(f"{'size':>6} {'legacy (ms)':>12} {'native (ms)':>12} {'speedup':>8}  identical")
+    for size in SIZES:
+        source = make_source(size)
+        same = legacy_color_key_alpha(source).tobytes() == color_key_alpha(source).tobytes()
+
+        number = max(3, 2000 // size)
+        legacy = min(timeit.repeat(lambda: legacy_color_key_alpha(source), number=number, repeat=3)) / number
+        native = min(timeit.repeat(lambda: color_key_alpha(source), number=number, repeat=3)) / number
+        print(f"{size:>6} {legacy * 1000:>12.3f} {native * 1000:>12.3f} {legacy / native:>7.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
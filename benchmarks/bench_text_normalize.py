@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+早报序号清理基准测试
+对比原先逐条 re.sub + 最多10轮循环的实现与 text_normalize.clean_text
+
+用法: python benchmarks/bench_text_normalize.py
+"""
+import os
+import re
+import sys
+import json
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from text_normalize import clean_text
+
+CORPUS_PATH = os.path.join(ROOT, "benchmarks", "data", "zaobao_samples.json")
+
+
+def legacy_clean_text(text):
+    """旧实现（DailyNewsManager._clean_text 原版）"""
+    if not text:
+        return ""
+
+    clean_text = text.strip()
+    max_iterations = 10
+    iteration = 0
+
+    while iteration < max_iterations:
+        original = clean_text
+        patterns = [
+            r'^(?:\s*\d+\s*[.、）)】]\s*){1,3}',
+            r'^\d+[.、）)】]\s*',
+            r'^[\(（]\d+[\)）]\s*',
+            r'^【\d+】\s*',
+            r'^[•·▪▫◦‣⁃]\s*',
+            r'^\d+\s*[.、）)】]\s*',
+            r'^\s*\d+[.、）)】]\s*',
+            r'^第\d+[条项]\s*',
+            r'^\d+\s+',
+            r'^(?:\(\d+\)|（\d+）)\s*',
+        ]
+        for pattern in patterns:
+            clean_text = re.sub(pattern, '', clean_text)
+        clean_text = clean_text.strip()
+        if clean_text == original:
+            break
+        iteration += 1
+
+    return clean_text
+
+
+def load_items():
+    """从各早报源的原始响应中取出新闻条目"""
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        samples = json.load(f)
+
+    items = []
+    for sample in samples:
+        data = sample["payload"].get("data")
+        news = data.get("news", []) if isinstance(data, dict) else data
+        items.extend(item for item in news if isinstance(item, str))
+    return items
+
+
+def main():
+    items = load_items()
+    mismatches = [item for item in items if legacy_clean_text(item) != clean_text(item)]
+
+    number = 200
+    legacy = min(timeit.repeat(lambda: [legacy_clean_text(i) for i in items], number=number, repeat=3)) / number
+    native = min(timeit.repeat(lambda: [clean_text(i) for i in items], number=number, repeat=3)) / number
+
+    print(f"条目数: {len(items)}  输出不一致: {len(mismatches)}")
+    print(f"legacy: {legacy * 1e6 / len(items):8.2f} us/条")
+    print(f"shared: {native * 1e6 / len(items):8.2f} us/条  ({legacy / native:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
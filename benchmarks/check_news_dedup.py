@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+早报近似重复判定校准检查
+列出重复/非重复样例对的包含度、Jaccard 和最终判定，说明 MIN_CONTAINMENT 的取值
+
+用法: python benchmarks/check_news_dedup.py
+"""
+import os
+import sys
+import json
+import itertools
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from news_dedup import MIN_CONTAINMENT, HeadlineIndex, containment, features, is_near_duplicate
+from text_normalize import clean_text
+
+CORPUS_PATH = os.path.join(ROOT, "benchmarks", "data", "zaobao_samples.json")
+
+# 同一条消息的不同写法：换词序、删减、加来源、简称
+DUPLICATES = [
+    ("神舟二十号载人飞船发射成功", "神舟二十号载人飞船成功发射"),
+    ("国务院常务会议部署推进城市更新建设", "国务院常务会议部署推进城市更新工作"),
+    ("国家统计局：2月份全国居民消费价格同比下降0.7%", "国家统计局发布数据，2月全国CPI同比下降0.7%"),
+    ("国家统计局：2月份全国居民消费价格同比下降0.7%，环比下降0.2%", "统计局：2月份居民消费价格同比降0.7%，环比降0.2%"),
+    ("教育部：2025年全国硕士研究生招生考试初试成绩今日起陆续公布", "2025年考研初试成绩今日起陆续公布"),
+    ("工信部：截至2月末，我国5G基站总数达434.9万个", "工信部：截至2月底我国5G基站总数达到434.9万个"),
+    ("中国气象局：今年春播期间南方大部降水偏多，需防范渍涝灾害", "气象局提醒：春播期间南方大部降水偏多，注意防范渍涝"),
+    ("央行宣布下调存款准备金率0.5个百分点", "中国人民银行宣布下调金融机构存款准备金率0.5个百分点"),
+    ("我国成功发射卫星互联网低轨卫星", "我国成功发射卫星互联网低轨09组卫星"),
+    ("全国铁路今日起实行新运行图", "全国铁路今起实行新的列车运行图"),
+]
+
+# 措辞相近但不是同一条消息：同一套话换了数字或来源
+DISTINCT = [
+    ("国家统计局：2月份全国居民消费价格同比下降0.7%", "国家统计局：2月份全国工业生产者出厂价格同比下降2.2%"),
+    ("神舟二十号载人飞船发射成功", "神舟二十一号载人飞船发射成功"),
+    ("教育部：2025年全国硕士研究生招生考试初试成绩今日起陆续公布", "教育部：2025年全国高考报名人数达1335万"),
+    ("国务院常务会议部署推进城市更新工作", "国务院常务会议研究部署促进消费政策"),
+    ("外交部：中方坚决反对美方对华加征关税", "商务部：中方坚决反对美方对华加征关税并将采取反制措施"),
+    ("中国人民银行：2月末广义货币（M2）余额同比增长7%", "中国人民银行：2月末人民币贷款余额同比增长7.3%"),
+    ("北京：今年将完成老旧小区改造600个", "上海：今年将完成老旧小区改造600个"),
+]
+
+
+def load_items():
+    """样例早报里的全部条目（互不重复），用来检查误判"""
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        samples = json.load(f)
+
+    items = []
+    for sample in samples:
+        data = sample["payload"].get("data")
+        news = data.get("news", []) if isinstance(data, dict) else data
+        items.extend(clean_text(item) for item in news if isinstance(item, str))
+    return list(dict.fromkeys(items))
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+def report(title, pairs, expected):
+    print(f"\n{title}")
+    print(f"{'包含度':>6} {'Jaccard':>7}  判定")
+    wrong = 0
+    for a, b in pairs:
+        fa, fb = features(a), features(b)
+        verdict = is_near_duplicate(fa, fb)
+        wrong += verdict != expected
+        mark = "重复" if verdict else "不同"
+        print(f"{containment(fa.shingles, fb.shingles):6.2f} {jaccard(fa.shingles, fb.shingles):7.2f}  "
+              f"{mark}{'' if verdict == expected else ' ✗'}  {a[:18]} | {b[:18]}")
+    return wrong
+
+
+def main():
+    print(f"判定阈值: 包含度 >= {MIN_CONTAINMENT}，且数字一致、来源不冲突")
+    wrong = report("重复样例", DUPLICATES, True)
+    wrong += report("非重复样例", DISTINCT, False)
+
+    items = load_items()
+    pairs = list(itertools.combinations(items, 2))
+    false_hits = [(a, b) for a, b in pairs if is_near_duplicate(features(a), features(b))]
+    highest = max(containment(features(a).shingles, features(b).shingles) for a, b in pairs)
+    print(f"\n样例早报 {len(items)} 条两两比较 {len(pairs)} 对：最高包含度 {highest:.2f}，误判 {len(false_hits)} 对")
+    wrong += len(false_hits)
+
+    # 索引查找与逐对判定结果一致：重复样例的另一半都能通过倒排找回
+    index = HeadlineIndex(os.path.join(ROOT, "benchmarks", "data", "_unused.json"))
+    index.add_day("2025-01-01", [a for a, _ in DUPLICATES] + items)
+    missed = [b for _, b in DUPLICATES if index.find_earlier(features(b), "2025-01-02") != "2025-01-01"]
+    print(f"索引查找重复样例: 找回 {len(DUPLICATES) - len(missed)}/{len(DUPLICATES)}")
+    wrong += len(missed)
+
+    if wrong:
+        print(f"\n{wrong} 处与预期不符")
+        sys.exit(1)
+    print("\n全部符合预期")
+
+
+if __name__ == "__main__":
+    main()
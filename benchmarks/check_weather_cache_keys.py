@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+天气缓存键回归检查
+同一地点的不同写法应共用缓存；同名的区县与地级市（朝阳区/朝阳市）不能串用
+
+用法: python benchmarks/check_weather_cache_keys.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from weather_providers import WeatherProvider
+from weather_service import WeatherService
+
+SAME = [("北京", "北京市"), ("上海", "上海市")]
+DIFFERENT = [("朝阳区", "朝阳市"), ("黄山区", "黄山市"), ("海淀区", "海淀")]
+
+
+class EchoBackend:
+    """不联网：把收到的城市名原样放进结果，记录调用次数"""
+
+    name = "echo"
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, city):
+        self.calls.append(city)
+        return {"city": city, "status": "晴", "temperature": 20.0,
+                "temp_max": 25.0, "temp_min": 15.0, "code": 0}
+
+
+def main():
+    normalize_city = WeatherService()._normalize_city_name # 与 main.py 中的配置一致
+    failures = 0
+    for a, b in SAME + DIFFERENT:
+        backend = EchoBackend()
+        provider = WeatherProvider([backend], normalize_city=normalize_city)
+        first = provider.get_weather(a)
+        second = provider.get_weather(b)
+        shared = provider.location_key(a) == provider.location_key(b)
+        expect_shared = (a, b) in SAME
+        ok = shared == expect_shared and first["city"] == a
+        if not expect_shared:
+            ok = ok and second["city"] == b and len(backend.calls) == 2
+        failures += not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {a:<6} -> {provider.location_key(a):<6} "
+              f"{b:<6} -> {provider.location_key(b):<6} 共用缓存: {shared}")
+    if failures:
+        print(f"{failures} 组不符合预期")
+        sys.exit(1)
+    print("全部符合预期")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ import uuid
 import queue
 from typing import Callable, Dict, List, Optional
 import calendar as cal
+from lunar_table import LunarTable
 
 def _append_calendar_debug(app_data_dir: str, message: str):
     try:
@@ -353,6 +354,10 @@ class CalendarWidget(ttk.Frame):
         self._reminder_style_cache = {}
         self._active_reminder_dialog = None
         self._render_token = None
+        app_data_dir = getattr(self.reminder_manager, "app_data_dir", None)
+        # 农历表首次使用时在后台计算，算好之前格子里只显示公历日期
+        self.lunar_table = LunarTable(os.path.join(app_data_dir, LunarTable.FILE_NAME) if app_data_dir else None)
+        self._lunar_poll_pending = False
         self.setup_ui()
 
     def _hex_to_rgb(self, color: str):
@@ -552,6 +557,9 @@ class CalendarWidget(ttk.Frame):
         
         # 更新下拉框
         self.setup_dropdowns()
+
+        if self.lunar_table.ensure_year(self.current_date.year):
+            self._wait_for_lunar_table()
         
         # 获取月历数据
         calendar_data = cal.monthcalendar(self.current_date.year, self.current_date.month)
@@ -587,6 +595,9 @@ class CalendarWidget(ttk.Frame):
                 
                 # 样式逻辑
                 text = f"{day} ●" if has_reminders else str(day)
+                lunar = self.lunar_table.label(date_obj)
+                if lunar:
+                    text += "\n" + lunar[0]
 
                 if has_reminders:
                     bg = "#FF7F24"
@@ -600,6 +611,12 @@ class CalendarWidget(ttk.Frame):
                     active_bg = hover_bg
                     active_fg = theme_fg
                     font = ("Microsoft YaHei", 14)
+                    if lunar and lunar[1] in ("festival", "term"):
+                        fg = "#E0454B"
+                        active_fg = fg
+
+                if lunar:
+                    font = (font[0], 11) + font[2:]
 
                 btn = tk.Button(
                     self.calendar_grid,
@@ -622,6 +639,30 @@ class CalendarWidget(ttk.Frame):
                 
                 self.day_buttons[date_str] = btn
                 
+    def _wait_for_lunar_table(self):
+        """后台计算农历表期间轮询（Tk 控件只能在主线程更新），算好后重绘当前月份"""
+        if self._lunar_poll_pending:
+            return
+        self._lunar_poll_pending = True
+
+        def poll():
+            try:
+                if not self.winfo_exists():
+                    return
+            except Exception:
+                return
+            if self.lunar_table.building:
+                self.after(200, poll)
+                return
+            self._lunar_poll_pending = False
+            if self.lunar_table.covers(self.current_date.year):
+                self.update_calendar()
+            elif self.lunar_table.ensure_year(self.current_date.year):
+                # 计算期间翻到了范围外的年份，继续扩展
+                self._wait_for_lunar_table()
+
+        self.after(200, poll)
+
     def setup_dropdowns(self):
         """设置下拉框选项"""
         current_year = self.current_date.year
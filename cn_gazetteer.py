@@ -0,0 +1,550 @@
+"""
+中国城市地名表 - 地级及以上行政区（含部分常用县级市）驻地坐标，离线解析城市名与输入联想
+"""
+import bisect
+
+# 每行: 全称[/简称] 纬度 经度；"#" 开头为所属省级行政区。简称缺省时去掉行政区划后缀得到
+_RAW = """
+#北京
+北京市 39.90 116.41
+#天津
+天津市 39.08 117.20
+#上海
+上海市 31.23 121.47
+#重庆
+重庆市 29.56 106.55
+#河北
+石家庄市 38.04 114.51
+唐山市 39.63 118.18
+秦皇岛市 39.94 119.60
+邯郸市 36.63 114.54
+邢台市 37.07 114.50
+保定市 38.87 115.46
+张家口市 40.77 114.89
+承德市 40.95 117.96
+沧州市 38.30 116.84
+廊坊市 39.54 116.68
+衡水市 37.74 115.67
+#山西
+太原市 37.87 112.55
+大同市 40.08 113.30
+阳泉市 37.86 113.58
+长治市 36.20 113.12
+晋城市 35.49 112.85
+朔州市 39.33 112.43
+晋中市 37.69 112.75
+运城市 35.03 111.00
+忻州市 38.42 112.73
+临汾市 36.09 111.52
+吕梁市 37.52 111.14
+#内蒙古
+呼和浩特市 40.84 111.75
+包头市 40.66 109.84
+乌海市 39.66 106.79
+赤峰市 42.26 118.89
+通辽市 43.65 122.24
+鄂尔多斯市 39.61 109.78
+呼伦贝尔市 49.21 119.77
+巴彦淖尔市 40.74 107.39
+乌兰察布市 41.00 113.13
+兴安盟 46.08 122.04
+锡林郭勒盟 43.93 116.05
+阿拉善盟 38.85 105.73
+满洲里市 49.60 117.38
+二连浩特市 43.65 111.98
+#辽宁
+沈阳市 41.80 123.43
+大连市 38.91 121.61
+鞍山市 41.11 122.99
+抚顺市 41.88 123.96
+本溪市 41.29 123.77
+丹东市 40.12 124.35
+锦州市 41.10 121.13
+营口市 40.67 122.24
+阜新市 42.02 121.67
+辽阳市 41.27 123.24
+盘锦市 41.12 122.07
+铁岭市 42.29 123.84
+朝阳市 41.57 120.45
+葫芦岛市 40.71 120.84
+#吉林
+长春市 43.82 125.32
+吉林市 43.84 126.55
+四平市 43.17 124.35
+辽源市 42.89 125.14
+通化市 41.73 125.94
+白山市 41.94 126.42
+松原市 45.14 124.83
+白城市 45.62 122.84
+延边朝鲜族自治州/延边 42.89 129.51
+延吉市 42.89 129.51
+珲春市 42.86 130.37
+#黑龙江
+哈尔滨市 45.80 126.53
+齐齐哈尔市 47.35 123.92
+鸡西市 45.30 130.97
+鹤岗市 47.35 130.30
+双鸭山市 46.65 131.16
+大庆市 46.59 125.10
+伊春市 47.73 128.84
+佳木斯市 46.80 130.32
+七台河市 45.77 131.00
+牡丹江市 44.55 129.63
+黑河市 50.25 127.53
+绥化市 46.65 126.97
+大兴安岭地区 50.42 124.12
+绥芬河市 44.41 131.15
+漠河市 52.97 122.54
+#江苏
+南京市 32.06 118.80
+无锡市 31.49 120.31
+徐州市 34.21 117.28
+常州市 31.81 119.97
+苏州市 31.30 120.58
+南通市 31.98 120.89
+连云港市 34.60 119.22
+淮安市 33.55 119.02
+盐城市 33.35 120.16
+扬州市 32.39 119.41
+镇江市 32.19 119.42
+泰州市 32.46 119.92
+宿迁市 33.96 118.28
+昆山市 31.38 120.98
+江阴市 31.92 120.28
+张家港市 31.88 120.55
+常熟市 31.65 120.75
+宜兴市 31.36 119.82
+#浙江
+杭州市 30.27 120.16
+宁波市 29.87 121.55
+温州市 28.00 120.70
+嘉兴市 30.75 120.76
+湖州市 30.89 120.09
+绍兴市 30.00 120.58
+金华市 29.08 119.65
+衢州市 28.94 118.87
+舟山市 29.99 122.21
+台州市 28.66 121.42
+丽水市 28.47 119.92
+义乌市 29.31 120.08
+慈溪市 30.17 121.27
+余姚市 30.04 121.15
+瑞安市 27.78 120.66
+乐清市 28.11 120.98
+诸暨市 29.71 120.24
+海宁市 30.51 120.68
+#安徽
+合肥市 31.82 117.23
+芜湖市 31.35 118.43
+蚌埠市 32.92 117.39
+淮南市 32.63 117.00
+马鞍山市 31.67 118.51
+淮北市 33.96 116.80
+铜陵市 30.94 117.81
+安庆市 30.54 117.06
+黄山市 29.71 118.34
+滁州市 32.30 118.32
+阜阳市 32.89 115.81
+宿州市 33.65 116.96
+六安市 31.73 116.52
+亳州市 33.84 115.78
+池州市 30.66 117.49
+宣城市 30.94 118.76
+#福建
+福州市 26.07 119.30
+厦门市 24.48 118.09
+莆田市 25.45 119.01
+三明市 26.26 117.64
+泉州市 24.87 118.68
+漳州市 24.51 117.65
+南平市 26.64 118.18
+龙岩市 25.08 117.02
+宁德市 26.67 119.55
+晋江市 24.78 118.55
+石狮市 24.73 118.65
+武夷山市 27.76 118.04
+#江西
+南昌市 28.68 115.86
+景德镇市 29.27 117.18
+萍乡市 27.62 113.85
+九江市 29.71 116.00
+新余市 27.82 114.92
+鹰潭市 28.26 117.07
+赣州市 25.83 114.93
+吉安市 27.11 114.99
+宜春市 27.81 114.42
+抚州市 27.95 116.36
+上饶市 28.45 117.94
+井冈山市 26.75 114.29
+#山东
+济南市 36.65 117.12
+青岛市 36.07 120.38
+淄博市 36.81 118.05
+枣庄市 34.81 117.32
+东营市 37.43 118.67
+烟台市 37.46 121.45
+潍坊市 36.71 119.16
+济宁市 35.41 116.59
+泰安市 36.20 117.09
+威海市 37.51 122.12
+日照市 35.42 119.53
+临沂市 35.10 118.36
+德州市 37.43 116.36
+聊城市 36.46 115.99
+滨州市 37.38 117.97
+菏泽市 35.23 115.48
+寿光市 36.86 118.79
+曲阜市 35.58 116.99
+#河南
+郑州市 34.75 113.63
+开封市 34.80 114.31
+洛阳市 34.62 112.45
+平顶山市 33.77 113.19
+安阳市 36.10 114.39
+鹤壁市 35.75 114.30
+新乡市 35.30 113.93
+焦作市 35.22 113.24
+濮阳市 35.76 115.03
+许昌市 34.04 113.85
+漯河市 33.58 114.02
+三门峡市 34.77 111.20
+南阳市 33.00 112.53
+商丘市 34.41 115.66
+信阳市 32.15 114.09
+周口市 33.63 114.70
+驻马店市 33.01 114.02
+济源市 35.07 112.60
+#湖北
+武汉市 30.59 114.31
+黄石市 30.20 115.04
+十堰市 32.63 110.80
+宜昌市 30.69 111.29
+襄阳市 32.01 112.12
+鄂州市 30.39 114.89
+荆门市 31.04 112.20
+孝感市 30.92 113.92
+荆州市 30.33 112.24
+黄冈市 30.45 114.87
+咸宁市 29.84 114.32
+随州市 31.69 113.38
+恩施土家族苗族自治州/恩施 30.27 109.49
+仙桃市 30.36 113.45
+潜江市 30.40 112.90
+天门市 30.66 113.17
+神农架林区/神农架 31.74 110.68
+#湖南
+长沙市 28.23 112.94
+株洲市 27.83 113.13
+湘潭市 27.83 112.94
+衡阳市 26.89 112.57
+邵阳市 27.24 111.47
+岳阳市 29.36 113.13
+常德市 29.03 111.70
+张家界市 29.12 110.48
+益阳市 28.55 112.36
+郴州市 25.77 113.01
+永州市 26.42 111.61
+怀化市 27.57 110.00
+娄底市 27.70 112.00
+湘西土家族苗族自治州/湘西 28.31 109.74
+#广东
+广州市 23.13 113.26
+韶关市 24.81 113.60
+深圳市 22.54 114.06
+珠海市 22.27 113.58
+汕头市 23.35 116.68
+佛山市 23.02 113.12
+江门市 22.58 113.08
+湛江市 21.27 110.36
+茂名市 21.66 110.93
+肇庆市 23.05 112.47
+惠州市 23.11 114.42
+梅州市 24.29 116.12
+汕尾市 22.79 115.38
+河源市 23.74 114.70
+阳江市 21.86 111.98
+清远市 23.68 113.06
+东莞市 23.02 113.75
+中山市 22.52 113.39
+潮州市 23.66 116.62
+揭阳市 23.55 116.37
+云浮市 22.92 112.04
+#广西
+南宁市 22.82 108.37
+柳州市 24.33 109.42
+桂林市 25.27 110.29
+梧州市 23.48 111.28
+北海市 21.48 109.12
+防城港市 21.69 108.35
+钦州市 21.98 108.65
+贵港市 23.11 109.60
+玉林市 22.63 110.18
+百色市 23.90 106.62
+贺州市 24.40 111.57
+河池市 24.69 108.09
+来宾市 23.75 109.22
+崇左市 22.38 107.36
+阳朔县 24.78 110.49
+#海南
+海口市 20.04 110.32
+三亚市 18.25 109.51
+三沙市 16.83 112.34
+儋州市 19.52 109.58
+五指山市 18.78 109.52
+琼海市 19.26 110.47
+文昌市 19.54 110.80
+万宁市 18.80 110.39
+东方市 19.10 108.65
+#四川
+成都市 30.57 104.07
+自贡市 29.34 104.78
+攀枝花市 26.58 101.72
+泸州市 28.87 105.44
+德阳市 31.13 104.40
+绵阳市 31.47 104.68
+广元市 32.44 105.84
+遂宁市 30.53 105.59
+内江市 29.58 105.06
+乐山市 29.55 103.77
+南充市 30.84 106.11
+眉山市 30.08 103.85
+宜宾市 28.77 104.64
+广安市 30.46 106.63
+达州市 31.21 107.47
+雅安市 29.98 103.01
+巴中市 31.87 106.75
+资阳市 30.13 104.63
+阿坝藏族羌族自治州/阿坝 31.90 102.22
+甘孜藏族自治州/甘孜 30.05 101.96
+凉山彝族自治州/凉山 27.88 102.27
+西昌市 27.88 102.27
+都江堰市 31.00 103.62
+#贵州
+贵阳市 26.65 106.63
+六盘水市 26.59 104.83
+遵义市 27.73 106.93
+安顺市 26.25 105.95
+毕节市 27.30 105.29
+铜仁市 27.72 109.19
+黔西南布依族苗族自治州/黔西南 25.09 104.90
+黔东南苗族侗族自治州/黔东南 26.58 107.98
+黔南布依族苗族自治州/黔南 26.26 107.52
+凯里市 26.57 107.98
+都匀市 26.26 107.52
+#云南
+昆明市 25.04 102.71
+曲靖市 25.49 103.80
+玉溪市 24.35 102.55
+保山市 25.11 99.16
+昭通市 27.34 103.72
+丽江市 26.86 100.23
+普洱市 22.79 100.97
+临沧市 23.88 100.09
+楚雄彝族自治州/楚雄 25.05 101.53
+红河哈尼族彝族自治州/红河 23.36 103.38
+文山壮族苗族自治州/文山 23.40 104.22
+西双版纳傣族自治州/西双版纳 22.01 100.80
+大理白族自治州/大理 25.61 100.27
+德宏傣族景颇族自治州/德宏 24.43 98.58
+怒江傈僳族自治州/怒江 25.82 98.86
+迪庆藏族自治州/迪庆 27.82 99.71
+景洪市 22.01 100.80
+香格里拉市 27.83 99.71
+瑞丽市 24.01 97.85
+#西藏
+拉萨市 29.65 91.17
+日喀则市 29.27 88.88
+昌都市 31.14 97.17
+林芝市 29.65 94.36
+山南市 29.24 91.77
+那曲市 31.48 92.05
+阿里地区 32.50 80.11
+#陕西
+西安市 34.34 108.94
+铜川市 34.90 108.95
+宝鸡市 34.36 107.24
+咸阳市 34.33 108.71
+渭南市 34.50 109.51
+延安市 36.59 109.49
+汉中市 33.07 107.02
+榆林市 38.29 109.73
+安康市 32.68 109.03
+商洛市 33.87 109.94
+#甘肃
+兰州市 36.06 103.83
+嘉峪关市 39.77 98.29
+金昌市 38.52 102.19
+白银市 36.54 104.14
+天水市 34.58 105.72
+武威市 37.93 102.64
+张掖市 38.93 100.45
+平凉市 35.54 106.67
+酒泉市 39.73 98.49
+庆阳市 35.71 107.64
+定西市 35.58 104.63
+陇南市 33.40 104.92
+临夏回族自治州/临夏 35.60 103.21
+甘南藏族自治州/甘南 34.98 102.91
+敦煌市 40.14 94.66
+#青海
+西宁市 36.62 101.78
+海东市 36.50 102.10
+海北藏族自治州/海北 36.95 100.90
+黄南藏族自治州/黄南 35.52 102.02
+海南藏族自治州/海南州 36.29 100.62
+果洛藏族自治州/果洛 34.47 100.24
+玉树藏族自治州/玉树 33.00 97.01
+海西蒙古族藏族自治州/海西 37.37 97.37
+格尔木市 36.40 94.90
+德令哈市 37.37 97.36
+#宁夏
+银川市 38.49 106.23
+石嘴山市 38.98 106.38
+吴忠市 37.99 106.20
+固原市 36.01 106.24
+中卫市 37.50 105.19
+#新疆
+乌鲁木齐市 43.83 87.62
+克拉玛依市 45.58 84.89
+吐鲁番市 42.95 89.19
+哈密市 42.82 93.51
+昌吉回族自治州/昌吉 44.01 87.31
+博尔塔拉蒙古自治州/博尔塔拉 44.91 82.07
+巴音郭楞蒙古自治州/巴音郭楞 41.76 86.15
+阿克苏地区 41.17 80.26
+克孜勒苏柯尔克孜自治州/克孜勒苏 39.71 76.17
+喀什地区 39.47 75.99
+和田地区 37.11 79.92
+伊犁哈萨克自治州/伊犁 43.92 81.32
+塔城地区 46.75 82.98
+阿勒泰地区 47.84 88.14
+石河子市 44.31 86.08
+库尔勒市 41.73 86.17
+伊宁市 43.91 81.28
+#香港
+香港特别行政区/香港 22.32 114.17
+#澳门
+澳门特别行政区/澳门 22.20 113.54
+#台湾
+台北市 25.03 121.57
+新北市 25.01 121.47
+桃园市 24.99 121.30
+台中市 24.15 120.67
+台南市 22.99 120.21
+高雄市 22.63 120.30
+"""
+
+# 省级行政区全称 -> 省会（IP定位有时只给出省份）
+_PROVINCES = """
+河北省 石家庄市
+山西省 太原市
+内蒙古自治区 呼和浩特市
+辽宁省 沈阳市
+吉林省 长春市
+黑龙江省 哈尔滨市
+江苏省 南京市
+浙江省 杭州市
+安徽省 合肥市
+福建省 福州市
+江西省 南昌市
+山东省 济南市
+河南省 郑州市
+湖北省 武汉市
+湖南省 长沙市
+广东省 广州市
+广西壮族自治区/广西 南宁市
+海南省 海口市
+四川省 成都市
+贵州省 贵阳市
+云南省 昆明市
+西藏自治区 拉萨市
+陕西省 西安市
+甘肃省 兰州市
+青海省 西宁市
+宁夏回族自治区/宁夏 银川市
+新疆维吾尔自治区/新疆 乌鲁木齐市
+台湾省 台北市
+"""
+
+_SUFFIXES = ["特别行政区", "自治区", "自治州", "地区", "林区", "盟", "省", "市", "区", "县"]
+
+
+def strip_admin_suffix(name):
+    """去掉行政区划后缀：广州市 -> 广州，兴安盟 -> 兴安"""
+    s = str(name or "").strip()
+    for suffix in _SUFFIXES:
+        if s.endswith(suffix) and len(s) > len(suffix):
+            return s[: -len(suffix)]
+    return s
+
+
+def _split_name(token):
+    full, _, short = token.partition("/")
+    return full, short or strip_admin_suffix(full)
+
+
+def _build():
+    entries = {} # 全称 -> 条目
+    province = ""
+    for line in _RAW.strip().splitlines():
+        if line.startswith("#"):
+            province = line[1:]
+            continue
+        token, lat, lon = line.split()
+        full, short = _split_name(token)
+        entries[full] = {"name": full, "short": short, "province": province, "lat": float(lat), "lon": float(lon)}
+
+    for line in _PROVINCES.strip().splitlines():
+        token, capital = line.split()
+        full, short = _split_name(token)
+        seat = entries[capital]
+        entries[full] = {"name": full, "short": short, "province": short, "lat": seat["lat"], "lon": seat["lon"]}
+
+    # 全称和简称都作为键；简称重名时（如"吉林"）先登记的地级市优先于省份
+    keyed = {}
+    for entry in entries.values():
+        keyed.setdefault(entry["name"], entry)
+        keyed.setdefault(entry["short"], entry)
+    keys = sorted(keyed)
+    return keys, [keyed[k] for k in keys]
+
+
+# 按名称排序的平行数组，查找与前缀联想都用二分
+_KEYS, _ENTRIES = _build()
+
+
+def is_district_like(name):
+    """"区"/"县"结尾的多是区县，去后缀容易撞上同名地级市（北京朝阳区 ≠ 朝阳市）"""
+    name = str(name or "").strip()
+    return name.endswith(("区", "县")) and not name.endswith(("自治区", "特别行政区", "林区"))
+
+
+def lookup(name):
+    """按全称或简称精确查找，返回 {"name","short","province","lat","lon"} 或 None"""
+    name = str(name or "").strip()
+    if not name:
+        return None
+    i = bisect.bisect_left(_KEYS, name)
+    if i < len(_KEYS) and _KEYS[i] == name:
+        return _ENTRIES[i]
+    stripped = strip_admin_suffix(name)
+    if stripped != name and not is_district_like(name):
+        i = bisect.bisect_left(_KEYS, stripped)
+        if i < len(_KEYS) and _KEYS[i] == stripped:
+            return _ENTRIES[i]
+    return None
+
+
+def complete(prefix, limit=10):
+    """前缀联想，返回去重后的地名全称列表"""
+    prefix = str(prefix or "").strip()
+    if not prefix:
+        return []
+    results = []
+    i = bisect.bisect_left(_KEYS, prefix)
+    while i < len(_KEYS) and _KEYS[i].startswith(prefix) and len(results) < limit:
+        name = _ENTRIES[i]["name"]
+        if name not in results:
+            results.append(name)
+        i += 1
+    return results
@@ -8,15 +8,32 @@ from tkinter import messagebox, scrolledtext
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import threading
+import queue
 import os
 import urllib3
 import random
 import re
+from text_normalize import clean_text
+from news_archive import NewsArchive
+from news_dedup import HeadlineIndex
 
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+def _repeat_marker(seen_on):
+    return f"  〔{seen_on[5:]} 已报道〕" if seen_on else ""
+
+
 class DailyNewsManager:
+    REQUEST_TIMEOUT = 10 # 单个源的请求超时(秒)
+    HEDGE_DELAY = 1.5 # 首选源在该时间(秒)内未返回，就并行启动下一个源
+    STATS_WINDOW = 20 # 每个源保留最近多少次请求的结果
+    CIRCUIT_FAILURES = 3 # 连续失败多少次后熔断
+    CIRCUIT_COOLDOWN = 600 # 熔断后跳过该源的时长(秒)
+    PREFETCH_LEAD_MINUTES = 15 # 推送时间前多少分钟开始后台预取
+    PREFETCH_RETRY_MIN = 5 * 60 # 预取失败后首次重试的间隔(秒)，之后逐次翻倍
+    PREFETCH_RETRY_MAX = 30 * 60 # 预取重试间隔上限(秒)
+
     def __init__(self):
         # 多个API源配置
         self.api_sources = {
@@ -43,12 +60,35 @@ class DailyNewsManager:
         self.news_data = None
         self.notification_enabled = True
         self.notification_time = "08:00"  # 默认早上8点推送
+        # 各源健康统计: {name: {"history": [[ok, 耗时ms], ...], "consecutive_failures": n, "open_until": 时间戳}}
+        self.source_stats = {}
+        self._stats_lock = threading.Lock()
+        self.archive_retention_days = 90 # 历史早报保留天数
+        self.mark_repeats = True # 标出往日已出现过的相似新闻
+        self._prefetch_lock = threading.Lock()
+        self._prefetching = False
+        self._prefetch_callbacks = []
+        self._prefetch_backoff = 0 # 当前重试间隔(秒)，成功后清零
+        self._prefetch_retry_at = 0 # 上次预取失败后，该时间戳之前不再自动预取
         
         # 确保缓存目录存在
         os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
         
         # 加载缓存数据
         self.load_cache()
+
+        # 多日归档：按月分段追加，缓存文件只保留最新一天
+        self.archive = NewsArchive(
+            os.path.join(os.path.dirname(self.cache_file), 'news_archive'),
+            self.archive_retention_days
+        )
+        # 标题索引：同日近似重复折叠、跨日重复标记
+        self.headline_index = HeadlineIndex(
+            os.path.join(os.path.dirname(self.cache_file), 'news_archive', 'headlines.json')
+        )
+        if self.news_data:
+            self.archive.append(self.news_data)
+        threading.Thread(target=self._sync_headline_index, daemon=True).start()
         
     def get_token(self):
         """获取当前源的Token"""
@@ -79,6 +119,9 @@ class DailyNewsManager:
                     self.notification_enabled = cache_data.get('notification_enabled', True)
                     self.notification_time = cache_data.get('notification_time', "08:00")
                     self.current_source = cache_data.get('current_source', "alapi")
+                    self.source_stats = cache_data.get('source_stats', {}) or {}
+                    self.archive_retention_days = cache_data.get('archive_retention_days', 90)
+                    self.mark_repeats = cache_data.get('mark_repeats', True)
         except Exception as e:
             print(f"加载缓存失败: {e}")
             
@@ -90,34 +133,150 @@ class DailyNewsManager:
                 'last_update': self.last_update,
                 'notification_enabled': self.notification_enabled,
                 'notification_time': self.notification_time,
-                'current_source': self.current_source
+                'current_source': self.current_source,
+                'source_stats': self._snapshot_stats(),
+                'archive_retention_days': self.archive_retention_days,
+                'mark_repeats': self.mark_repeats
             }
             with open(self.cache_file, 'w', encoding='utf-8') as f:
                 json.dump(cache_data, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"保存缓存失败: {e}")
             
+    def _snapshot_stats(self):
+        with self._stats_lock:
+            return json.loads(json.dumps(self.source_stats))
+
+    def _record_source_result(self, name, ok, latency_ms):
+        """记录一次请求结果，并维护熔断状态"""
+        with self._stats_lock:
+            stats = self.source_stats.setdefault(name, {"history": [], "consecutive_failures": 0, "open_until": 0})
+            history = stats.setdefault("history", [])
+            history.append([1 if ok else 0, int(latency_ms)])
+            del history[:-self.STATS_WINDOW]
+            if ok:
+                stats["consecutive_failures"] = 0
+                stats["open_until"] = 0
+            else:
+                stats["consecutive_failures"] = stats.get("consecutive_failures", 0) + 1
+                if stats["consecutive_failures"] >= self.CIRCUIT_FAILURES:
+                    stats["open_until"] = time.time() + self.CIRCUIT_COOLDOWN
+
+    def get_source_health(self, name):
+        """返回源的健康概况: p50 耗时(ms)、成功率、样本数、熔断截止时间"""
+        with self._stats_lock:
+            stats = self.source_stats.get(name) or {}
+            history = list(stats.get("history", []))
+            open_until = stats.get("open_until", 0) or 0
+        latencies = sorted(latency for ok, latency in history if ok)
+        p50 = latencies[(len(latencies) - 1) // 2] if latencies else None
+        success_rate = (sum(ok for ok, _ in history) / len(history)) if history else None
+        return {
+            "p50_ms": p50,
+            "success_rate": success_rate,
+            "samples": len(history),
+            "open_until": open_until if open_until > time.time() else 0,
+        }
+
+    def _ordered_sources(self):
+        """按健康度排序：熔断中的源跳过，其余按成功率（保留一位小数）降序、p50 耗时升序，
+        无数据的排在后面（当前源优先）；全部熔断时按最早恢复的顺序尝试"""
+        names = [self.current_source] + [name for name in self.api_sources if name != self.current_source]
+        names = [name for name in names if name in self.api_sources]
+        health = {name: self.get_source_health(name) for name in names}
+
+        def sort_key(name):
+            entry = health[name]
+            rate, p50 = entry["success_rate"], entry["p50_ms"]
+            return (
+                bool(entry["open_until"]),
+                entry["open_until"],
+                rate is None,
+                -round(rate, 1) if rate is not None else 0,
+                p50 is None,
+                p50 if p50 is not None else 0,
+                names.index(name),
+            )
+
+        # 有未熔断的源时跳过熔断中的源
+        available = [name for name in names if not health[name]["open_until"]]
+        return sorted(available or names, key=sort_key)
+
     def fetch_daily_news(self):
-        """获取每日新闻，支持多个API源"""
-        # 尝试当前源
-        result = self._try_fetch_from_source(self.current_source)
-        if result and result.get("success"):
-            return result
-            
-        # 如果当前源失败，尝试其他源
-        for source_name in self.api_sources:
-            if source_name != self.current_source:
-                print(f"尝试备用API源: {source_name}")
-                result = self._try_fetch_from_source(source_name)
+        """获取每日新闻，支持多个API源
+
+        先请求首选源；若 HEDGE_DELAY 秒内没有结果或该源失败，再依次并行启动其余源，
+        取第一个有效响应，其余请求随即取消。
+        """
+        order = self._ordered_sources()
+        if not order:
+            return {"success": False, "message": "没有可用的API源"}
+        results = queue.Queue()
+        cancel_event = threading.Event()
+        pending = list(order)
+        running = 0
+
+        def worker(name):
+            start = time.time()
+            result = self._try_fetch_from_source(name, cancel_event)
+            # 被取消的请求不计入统计
+            if not result.get("cancelled"):
+                self._record_source_result(name, result.get("success"), (time.time() - start) * 1000)
+            results.put((name, result))
+
+        def launch_next():
+            name = pending.pop(0)
+            if name != self.current_source:
+                print(f"尝试备用API源: {name}")
+            threading.Thread(target=worker, args=(name,), daemon=True).start()
+
+        try:
+            launch_next()
+            running += 1
+            while running:
+                try:
+                    # 还有未启动的源时只等待对冲延迟，否则等待剩余请求结束
+                    timeout = self.HEDGE_DELAY if pending else self.REQUEST_TIMEOUT + 5
+                    name, result = results.get(timeout=timeout)
+                except queue.Empty:
+                    if not pending:
+                        break
+                    launch_next()
+                    running += 1
+                    continue
+
+                running -= 1
                 if result and result.get("success"):
-                    # 切换到成功的源
-                    self.current_source = source_name
-                    return result
+                    self.news_data = result["data"]
+                    self.last_update = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    self.current_source = name
+                    self.save_cache()
+                    if self.archive.append(self.news_data):
+                        self._index_headlines(self.news_data)
+                    return {"success": True, "data": self.news_data}
+
+                # 该源失败，不必等对冲延迟，立即启动下一个
+                if pending:
+                    launch_next()
+                    running += 1
+        finally:
+            cancel_event.set()
         
+        self.save_cache()
         return {"success": False, "message": "所有API源都无法访问"}
     
-    def _try_fetch_from_source(self, source_name):
-        """尝试从指定源获取新闻"""
+    def _read_json(self, response, cancel_event):
+        """分块读取响应体，期间若已被取消则放弃"""
+        chunks = []
+        for chunk in response.iter_content(chunk_size=8192):
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            chunks.append(chunk)
+        return json.loads(b"".join(chunks))
+
+    def _try_fetch_from_source(self, source_name, cancel_event=None):
+        """尝试从指定源获取新闻，只解析不落地，成功时返回新闻数据"""
+        response = None
         try:
             source_config = self.api_sources[source_name]
             
@@ -134,48 +293,36 @@ class DailyNewsManager:
                 source_config["url"], 
                 params=params,
                 headers=headers,
-                timeout=10,
-                verify=False
+                timeout=self.REQUEST_TIMEOUT,
+                verify=False,
+                stream=True
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._read_json(response, cancel_event)
+                if data is None:
+                    return {"success": False, "cancelled": True, "message": f"{source_name} 请求已取消"}
                 
                 # 根据不同API源处理响应格式
+                news_list = None
                 if source_name == "alapi":
                     if data.get('code') == 200:
                         # 根据ALAPI文档，数据在data字段中
-                        news_content = data.get('data', {}).get('news', [])
-                        self.news_data = {
-                            "news": news_content,
-                            "date": datetime.now().strftime("%Y-%m-%d"),
-                            "source": source_name
-                        }
-                        self.last_update = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        self.save_cache()
-                        return {"success": True, "data": self.news_data}
+                        news_list = data.get('data', {}).get('news', [])
                 elif source_name == "60s":
                     if data.get('code') == 200:
                         news_list = data.get('data', [])
-                        self.news_data = {
-                            "news": news_list,
-                            "date": datetime.now().strftime("%Y-%m-%d"),
-                            "source": source_name
-                        }
-                        self.last_update = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        self.save_cache()
-                        return {"success": True, "data": self.news_data}
                 elif source_name == "backup":
                     if 'data' in data:
                         news_list = data.get('data', [])
-                        self.news_data = {
-                            "news": news_list,
-                            "date": datetime.now().strftime("%Y-%m-%d"),
-                            "source": source_name
-                        }
-                        self.last_update = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        self.save_cache()
-                        return {"success": True, "data": self.news_data}
+
+                if news_list is not None:
+                    news_data = {
+                        "news": news_list,
+                        "date": datetime.now().strftime("%Y-%m-%d"),
+                        "source": source_name
+                    }
+                    return {"success": True, "data": news_data}
                         
             return {"success": False, "message": f"API响应错误: {response.status_code}"}
             
@@ -185,6 +332,9 @@ class DailyNewsManager:
             return {"success": False, "message": f"{source_name} 网络连接错误"}
         except Exception as e:
             return {"success": False, "message": f"{source_name} 请求失败: {str(e)}"}
+        finally:
+            if response is not None:
+                response.close()
             
     def get_cached_news(self):
         """获取缓存的新闻数据"""
@@ -197,6 +347,124 @@ class DailyNewsManager:
                 return self.news_data
             return None
             
+    def get_news_nowait(self):
+        """只读内存：已有今天获取的早报则返回，否则返回 None，不发起网络请求"""
+        if self.news_data and self.is_today_updated():
+            return self.news_data
+        return None
+
+    def prefetch_async(self, callback=None):
+        """在后台线程获取早报；已有进行中的获取时只登记回调，不重复请求。
+
+        callback(result) 在后台线程中调用，需要操作界面时由调用方切回Tk线程。
+        """
+        with self._prefetch_lock:
+            if callback:
+                self._prefetch_callbacks.append(callback)
+            if self._prefetching:
+                return False
+            self._prefetching = True
+
+        def worker():
+            try:
+                result = self.fetch_daily_news()
+            except Exception as e:
+                result = {"success": False, "message": str(e)}
+            with self._prefetch_lock:
+                self._prefetching = False
+                if result.get("success"):
+                    self._prefetch_backoff = 0
+                    self._prefetch_retry_at = 0
+                else:
+                    # 全部源都失败时不能每分钟重来一遍，按 5 分钟起翻倍退避，最长 30 分钟
+                    self._prefetch_backoff = min(self.PREFETCH_RETRY_MAX,
+                                                 max(self.PREFETCH_RETRY_MIN, self._prefetch_backoff * 2))
+                    self._prefetch_retry_at = time.time() + self._prefetch_backoff
+                callbacks, self._prefetch_callbacks = self._prefetch_callbacks, []
+            for cb in callbacks:
+                try:
+                    cb(result)
+                except Exception as e:
+                    print(f"早报预取回调失败: {e}")
+
+        threading.Thread(target=worker, daemon=True).start()
+        return True
+
+    def needs_prefetch(self, push_time=None, now=None):
+        """推送时间前 PREFETCH_LEAD_MINUTES 分钟起（直到当天结束），今日早报尚未就绪则需要预取；
+        上次预取失败后的退避期内返回 False"""
+        if self.get_news_nowait():
+            return False
+        with self._prefetch_lock:
+            if time.time() < self._prefetch_retry_at:
+                return False
+        try:
+            hour, minute = map(int, (push_time or self.notification_time).split(':'))
+        except Exception:
+            return False
+        now = now or datetime.now()
+        push_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return now >= push_at - timedelta(minutes=self.PREFETCH_LEAD_MINUTES)
+
+    def get_archived_dates(self):
+        """已归档的早报日期（新的在前）"""
+        return self.archive.dates()
+
+    def get_news_for_date(self, date_str):
+        """读取指定日期的早报，只从归档中定位读取这一天"""
+        if self.news_data and self.news_data.get("date") == date_str:
+            return self.news_data
+        return self.archive.load(date_str)
+
+    def set_archive_retention(self, days):
+        """设置历史早报保留天数"""
+        self.archive_retention_days = max(1, int(days))
+        self.archive.set_retention(self.archive_retention_days)
+        self.headline_index.prune(self.archive.dates())
+        self.headline_index.save()
+        self.save_cache()
+
+    def _index_headlines(self, news_data):
+        """把一天的早报标题登记到标题索引，并与归档保留期同步"""
+        date_str = (news_data or {}).get("date")
+        if not date_str:
+            return
+        self.headline_index.add_day(date_str, self.get_cleaned_news(news_data))
+        self.headline_index.prune(self.archive.dates())
+        self.headline_index.save()
+
+    def _sync_headline_index(self):
+        """后台补齐归档中尚未建立索引的日期（首次启用、索引文件丢失或格式升级时）"""
+        try:
+            dates = self.archive.dates()
+            indexed = self.headline_index.indexed_dates()
+            changed = bool(indexed - set(dates))
+            for date_str in dates:
+                if date_str in indexed:
+                    continue
+                news_data = self.archive.load(date_str)
+                if news_data:
+                    self.headline_index.add_day(date_str, self.get_cleaned_news(news_data))
+                    changed = True
+            if changed:
+                self.headline_index.prune(dates)
+                self.headline_index.save()
+        except Exception as e:
+            print(f"同步标题索引失败: {e}")
+
+    def get_display_news(self, news_data):
+        """用于展示的新闻列表：同日近似重复只保留一条，按设置标出往日出现过的条目。
+
+        返回 [(标题, 首次出现日期或None), ...]
+        """
+        cleaned_list = self.get_cleaned_news(news_data)
+        date_str = (news_data or {}).get("date") or datetime.now().strftime('%Y-%m-%d')
+        return self.headline_index.annotate(date_str, cleaned_list, self.mark_repeats)
+
+    def set_mark_repeats(self, enabled):
+        self.mark_repeats = bool(enabled)
+        self.save_cache()
+
     def is_today_updated(self):
         """检查今天是否已更新"""
         if not self.last_update:
@@ -211,42 +479,7 @@ class DailyNewsManager:
             
     def _clean_text(self, text):
         """彻底清理文本中的序号"""
-        if not text:
-            return ""
-        
-        clean_text = text.strip()
-        max_iterations = 10  # 防止无限循环
-        iteration = 0
-        
-        while iteration < max_iterations:
-            original = clean_text
-            
-            # 移除各种序号格式（更全面的正则表达式）
-            patterns = [
-                r'^(?:\s*\d+\s*[.、）)】]\s*){1,3}',
-                r'^\d+[.、）)】]\s*',           # 1. 2、 3） 4) 5】
-                r'^[\(（]\d+[\)）]\s*',         # (1) （2）
-                r'^【\d+】\s*',                # 【1】
-                r'^[•·▪▫◦‣⁃]\s*',             # 各种点符号
-                r'^\d+\s*[.、）)】]\s*',       # 数字后面有空格的情况
-                r'^\s*\d+[.、）)】]\s*',       # 前面有空格的情况
-                r'^第\d+[条项]\s*',            # 第1条 第2项
-                r'^\d+\s+',                   # 纯数字后面跟空格
-                r'^(?:\(\d+\)|（\d+）)\s*',
-            ]
-            
-            for pattern in patterns:
-                clean_text = re.sub(pattern, '', clean_text)
-            
-            clean_text = clean_text.strip()
-            
-            # 如果没有变化，说明清理完成
-            if clean_text == original:
-                break
-                
-            iteration += 1
-        
-        return clean_text
+        return clean_text(text)
 
     def get_cleaned_news(self, news_data):
         """获取清理后的新闻列表"""
@@ -279,9 +512,8 @@ class DailyNewsManager:
         formatted_text += f"📡 数据源: {news_data.get('source', '未知')}\n"
         formatted_text += "─" * 50 + "\n\n"
         
-        cleaned_list = self.get_cleaned_news(news_data)
-        for i, item in enumerate(cleaned_list, 1):
-            formatted_text += f"{i}. {item}\n\n"
+        for i, (item, seen_on) in enumerate(self.get_display_news(news_data), 1):
+            formatted_text += f"{i}. {item}{_repeat_marker(seen_on)}\n\n"
             
         return formatted_text
         
@@ -334,6 +566,12 @@ class NewsWidget(ttk.Frame):
         # 按钮区域
         btn_frame = ttk.Frame(title_frame)
         btn_frame.pack(side=RIGHT)
+
+        # 历史日期选择
+        self.date_var = tk.StringVar()
+        self.date_combo = ttk.Combobox(btn_frame, textvariable=self.date_var, state="readonly", width=12)
+        self.date_combo.pack(side=LEFT, padx=(0, 10))
+        self.date_combo.bind("<<ComboboxSelected>>", self._on_date_selected)
         
         ttk.Button(btn_frame, text="刷新", command=self.refresh_news, bootstyle=PRIMARY).pack(side=LEFT, padx=(0, 10))
         ttk.Button(btn_frame, text="设置", command=self.show_settings, bootstyle=SECONDARY).pack(side=LEFT)
@@ -345,6 +583,11 @@ class NewsWidget(ttk.Frame):
         self.header_date_label.pack(side=LEFT, padx=(0, 20))
         self.header_source_label = ttk.Label(self.header_frame, text="", bootstyle="secondary")
         self.header_source_label.pack(side=LEFT)
+
+        self.mark_repeats_var = tk.BooleanVar(value=self.news_manager.mark_repeats)
+        ttk.Checkbutton(self.header_frame, text="标记往日重复", variable=self.mark_repeats_var,
+                        command=self._on_mark_repeats_toggled, bootstyle="round-toggle").pack(side=RIGHT)
+        self._shown_news = None
         
         self._create_scroll_area()
         
@@ -461,6 +704,7 @@ class NewsWidget(ttk.Frame):
             return
 
         news_data = result["data"]
+        self._refresh_date_choices(news_data.get('date'))
 
         try:
             self.header_date_label.config(text=f"📅 {news_data.get('date', '未知日期')}")
@@ -468,19 +712,45 @@ class NewsWidget(ttk.Frame):
         except Exception:
             pass
         
-        # 新闻列表
-        cleaned_list = self.news_manager.get_cleaned_news(news_data)
-        
-        if not cleaned_list:
+        # 新闻列表（同日近似重复已折叠）
+        self._shown_news = news_data
+        if not self._render_news_list(news_data):
             self._show_message("暂无新闻内容")
             return
-
-        content = "\n\n".join([f"{i}. {item}" for i, item in enumerate(cleaned_list, 1)])
-        self._set_news_text(content)
             
         msg = f"最后更新: {self.news_manager.last_update}" if from_cache else f"更新成功 - {self.news_manager.last_update}"
         self.status_label.config(text=msg)
 
+    def _render_news_list(self, news_data):
+        display_list = self.news_manager.get_display_news(news_data)
+        if not display_list:
+            return False
+        content = "\n\n".join([f"{i}. {item}{_repeat_marker(seen_on)}" for i, (item, seen_on) in enumerate(display_list, 1)])
+        self._set_news_text(content)
+        return True
+
+    def _on_mark_repeats_toggled(self):
+        self.news_manager.set_mark_repeats(self.mark_repeats_var.get())
+        if self._shown_news:
+            self._render_news_list(self._shown_news)
+
+    def _refresh_date_choices(self, current=None):
+        try:
+            self.date_combo.configure(values=self.news_manager.get_archived_dates())
+            if current:
+                self.date_var.set(current)
+        except Exception:
+            pass
+
+    def _on_date_selected(self, _event=None):
+        date_str = self.date_var.get()
+        news_data = self.news_manager.get_news_for_date(date_str)
+        if not news_data:
+            self.status_label.config(text=f"没有 {date_str} 的归档")
+            return
+        self.update_news_display({"success": True, "data": news_data}, from_cache=True)
+        self.status_label.config(text=f"历史早报: {date_str}")
+
     def _show_message(self, message):
         try:
             self.header_date_label.config(text="")
@@ -493,7 +763,7 @@ class NewsWidget(ttk.Frame):
         """显示设置窗口"""
         settings_window = ttk.Toplevel(self)
         settings_window.title("早报设置")
-        settings_window.geometry("400x300")
+        settings_window.geometry("420x530")
         settings_window.resizable(False, False)
         settings_window.transient(self)
         settings_window.grab_set()
@@ -526,6 +796,35 @@ class NewsWidget(ttk.Frame):
         time_entry = ttk.Entry(time_frame, textvariable=time_var, width=10)
         time_entry.pack(side=LEFT, padx=(10, 0))
         ttk.Label(time_frame, text="(格式: HH:MM)").pack(side=LEFT, padx=(5, 0))
+
+        retention_frame = ttk.Frame(notify_frame)
+        retention_frame.pack(fill=X, pady=(10, 0))
+        ttk.Label(retention_frame, text="历史保留:").pack(side=LEFT)
+        retention_var = tk.IntVar(value=self.news_manager.archive_retention_days)
+        ttk.Spinbox(retention_frame, from_=7, to=3650, increment=1, textvariable=retention_var, width=8).pack(side=LEFT, padx=(10, 0))
+        ttk.Label(retention_frame, text="天").pack(side=LEFT, padx=(5, 0))
+
+        # 数据源健康状态
+        health_frame = ttk.LabelFrame(settings_window, text="数据源状态", padding=10)
+        health_frame.pack(fill=X, padx=10, pady=(0, 10))
+
+        for name in self.news_manager.api_sources:
+            health = self.news_manager.get_source_health(name)
+            p50 = f"{health['p50_ms']} ms" if health["p50_ms"] is not None else "--"
+            rate = f"{health['success_rate']:.0%}" if health["success_rate"] is not None else "--"
+            if health["open_until"]:
+                state = "熔断至 " + datetime.fromtimestamp(health["open_until"]).strftime("%H:%M")
+                style = "danger"
+            else:
+                state = "当前" if name == self.news_manager.current_source else "正常"
+                style = "success" if name == self.news_manager.current_source else "secondary"
+
+            row = ttk.Frame(health_frame)
+            row.pack(fill=X, pady=1)
+            ttk.Label(row, text=name, width=8).pack(side=LEFT)
+            ttk.Label(row, text=f"中位耗时 {p50}", width=16).pack(side=LEFT)
+            ttk.Label(row, text=f"成功率 {rate} ({health['samples']}次)", width=18).pack(side=LEFT)
+            ttk.Label(row, text=state, bootstyle=style).pack(side=LEFT)
         
         # 按钮框架
         btn_frame = ttk.Frame(settings_window)
@@ -534,6 +833,10 @@ class NewsWidget(ttk.Frame):
         def save_settings():
             self.news_manager.set_token(token_var.get().strip())
             self.news_manager.set_notification_settings(notify_var.get(), time_var.get())
+            try:
+                self.news_manager.set_archive_retention(retention_var.get())
+            except Exception:
+                pass
             messagebox.showinfo("提示", "设置已保存")
             settings_window.destroy()
             
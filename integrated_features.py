@@ -14,11 +14,27 @@ from ttkbootstrap.constants import *
 from ttkbootstrap.scrolled import ScrolledFrame
 import threading
 import urllib3
+from text_normalize import clean_text
+from weather_service import WeatherService
+from weather_providers import WeatherProvider, OpenMeteoBackend, XxapiBackend
 
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 class IntegratedFeaturesManager:
+    CACHE_FILE_NAME = "integrated_cache.json"
+    # 功能 -> 保存数据的属性名
+    CACHE_ATTRS = {
+        'weather': 'weather_cache',
+        'calendar': 'calendar_cache',
+        'poetry': 'poetry_cache',
+        'news': 'news_cache',
+        'quote': 'quote_cache',
+    }
+    # 各功能缓存有效期(小时)；DAILY_FEATURES 还要求是今天获取的
+    CACHE_HOURS = {'calendar': 24, 'weather': 1, 'poetry': 6, 'news': 2, 'quote': 24}
+    DAILY_FEATURES = ('calendar', 'news', 'quote')
+
     def __init__(self):
         # API配置
         self.alapi_token = ""  # ALAPI Token
@@ -32,10 +48,60 @@ class IntegratedFeaturesManager:
         os.makedirs(self.cache_dir, exist_ok=True)
         
         # 数据缓存
+        self.weather_provider = None # 未注入时首次查询天气再创建
         self.weather_cache = None
         self.calendar_cache = None
         self.poetry_cache = None
+        self.news_cache = None
+        self.quote_cache = None
+        self.weather_cache_city = None # 天气缓存对应的城市，城市变了缓存即失效
         self.last_update = {}
+        self._cache_lock = threading.Lock()
+        self.cache_file = os.path.join(self.cache_dir, self.CACHE_FILE_NAME)
+        self._load_cache()
+
+    def _load_cache(self):
+        """读取上次保存的缓存，连同获取时间一起恢复，有效期判断与运行期间一致"""
+        try:
+            if not os.path.exists(self.cache_file):
+                return
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('entries') or {}
+            for feature, entry in entries.items():
+                attr = self.CACHE_ATTRS.get(feature)
+                if not attr or entry.get('data') is None:
+                    continue
+                setattr(self, attr, entry['data'])
+                self.last_update[feature] = datetime.datetime.fromisoformat(entry['updated'])
+                if feature == 'weather':
+                    self.weather_cache_city = entry.get('city')
+        except Exception as e:
+            print(f"读取集成功能缓存失败: {e}")
+
+    def _save_cache(self):
+        with self._cache_lock:
+            entries = {}
+            for feature, attr in self.CACHE_ATTRS.items():
+                data = getattr(self, attr)
+                if data is None or feature not in self.last_update:
+                    continue
+                entries[feature] = {'data': data, 'updated': self.last_update[feature].isoformat()}
+                if feature == 'weather':
+                    entries[feature]['city'] = self.weather_cache_city
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = self.cache_file + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': 1, 'entries': entries}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_file)
+            except Exception as e:
+                print(f"保存集成功能缓存失败: {e}")
+
+    def _remember(self, feature, data):
+        """记录一次成功获取的数据并写盘；失败的结果不缓存"""
+        setattr(self, self.CACHE_ATTRS[feature], data)
+        self.last_update[feature] = datetime.datetime.now()
+        self._save_cache()
         
     def set_token(self, token):
         """设置ALAPI Token"""
@@ -51,7 +117,11 @@ class IntegratedFeaturesManager:
                 data = response.json()
                 content = data.get("content", "")
                 note = data.get("note", "")
-                return f"{content}\n{note}" if content and note else "今天也要加油哦！"
+                if content and note:
+                    quote = f"{content}\n{note}"
+                    self._remember('quote', quote)
+                    return quote
+                return "今天也要加油哦！"
             else:
                 return "今天也要加油哦！"
         except Exception as e:
@@ -59,45 +129,6 @@ class IntegratedFeaturesManager:
     
     def get_60s_news(self):
         """获取60秒读懂世界新闻"""
-        import re
-        
-        def clean_text_thoroughly(text):
-            """彻底清理文本中的序号"""
-            if not text:
-                return ""
-            
-            clean_text = text.strip()
-            max_iterations = 10  # 防止无限循环
-            iteration = 0
-            
-            while iteration < max_iterations:
-                original = clean_text
-                
-                # 移除各种序号格式（更全面的正则表达式）
-                patterns = [
-                    r'^\d+[.、）)】]\s*',           # 1. 2、 3） 4) 5】
-                    r'^[\(（]\d+[\)）]\s*',         # (1) （2）
-                    r'^【\d+】\s*',                # 【1】
-                    r'^[•·▪▫◦‣⁃]\s*',             # 各种点符号
-                    r'^\d+\s*[.、）)】]\s*',       # 数字后面有空格的情况
-                    r'^\s*\d+[.、）)】]\s*',       # 前面有空格的情况
-                    r'^第\d+[条项]\s*',            # 第1条 第2项
-                    r'^\d+\s+',                   # 纯数字后面跟空格
-                ]
-                
-                for pattern in patterns:
-                    clean_text = re.sub(pattern, '', clean_text)
-                
-                clean_text = clean_text.strip()
-                
-                # 如果没有变化，说明清理完成
-                if clean_text == original:
-                    break
-                    
-                iteration += 1
-            
-            return clean_text
-        
         try:
             url = 'https://60s-api.viki.moe/v2/60s'
             response = requests.get(url, timeout=10, verify=False)
@@ -108,10 +139,12 @@ class IntegratedFeaturesManager:
                 if news_list:
                     cleaned_news = []
                     for i, news in enumerate(news_list[:10], 1):  # 限制显示前10条，从1开始编号
-                        clean_item = clean_text_thoroughly(news)
+                        clean_item = clean_text(news)
                         if clean_item:
                             cleaned_news.append(f"{i}. {clean_item}")
-                    return "\n".join(cleaned_news)
+                    news_text = "\n".join(cleaned_news)
+                    self._remember('news', news_text)
+                    return news_text
                 else:
                     return "暂无新闻数据"
             else:
@@ -137,8 +170,7 @@ class IntegratedFeaturesManager:
                 'next_solar_term_date': f'{cntoday.nextSolarTermYear}{cntoday.nextSolarTermDate}'
             }
             
-            self.calendar_cache = calendar_info
-            self.last_update['calendar'] = datetime.datetime.now()
+            self._remember('calendar', calendar_info)
             return calendar_info
             
         except Exception as e:
@@ -148,53 +180,27 @@ class IntegratedFeaturesManager:
                 'error': str(e)
             }
     
+    def set_weather_provider(self, provider):
+        """与侧边栏共用同一个天气数据源（含缓存与后端切换）"""
+        self.weather_provider = provider
+
     def get_weather_info(self):
-        """获取天气信息 - 使用免费天气API"""
+        """获取天气信息 - 经统一天气数据源查询，格式见 WeatherProvider"""
         try:
-            # 使用免费天气API接口
-            url = "https://v2.xxapi.cn/api/weather"
-            params = {
-                'city': self.city
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
-            
-            if data.get('code') == 200 and data.get('data'):
-                weather_data = data['data']
-                today_data = weather_data['data'][0] if weather_data.get('data') else {}
-                
-                # 解析温度范围
-                temp_range = today_data.get('temperature', '0-0℃')
-                temp_parts = temp_range.replace('℃', '').split('-')
-                min_temp = float(temp_parts[0]) if len(temp_parts) > 0 else 0
-                max_temp = float(temp_parts[1]) if len(temp_parts) > 1 else min_temp
-                current_temp = (min_temp + max_temp) / 2  # 估算当前温度
-                
-                weather_info = {
-                    'status': today_data.get('weather', '未知'),
-                    'temperature': current_temp,
-                    'max_temp': max_temp,
-                    'min_temp': min_temp,
-                    'humidity': 0,  # 该API不提供湿度数据
-                    'visibility': 0,  # 该API不提供能见度数据
-                    'forecast': f"今日{today_data.get('weather', '')}，{today_data.get('wind', '')}",
-                    'aqi': 0,  # 该API不提供AQI数据
-                    'pm25': 0,  # 该API不提供PM2.5数据
-                    'wind_dir': today_data.get('wind', '').split('风')[0] + '风' if '风' in today_data.get('wind', '') else '',
-                    'wind_scale': today_data.get('wind', '').split('风')[1] if '风' in today_data.get('wind', '') else '',
-                    'pressure': '',  # 该API不提供气压数据
-                    'city': weather_data.get('city', self.city),
-                    'air_quality': today_data.get('air_quality', '未知')
-                }
-                
-                self.weather_cache = weather_info
-                self.last_update['weather'] = datetime.datetime.now()
+            if self.weather_provider is None:
+                self.weather_provider = WeatherProvider([OpenMeteoBackend(WeatherService()), XxapiBackend()])
+            weather_info = self.weather_provider.get_weather(self.city)
+            if 'error' in weather_info:
+                return {"error": f"获取天气数据失败: {weather_info['error']}"}
+
+            if weather_info.get('stale'):
+                # 所有数据源都失败时的旧结果：照常显示，但不按当前时间写入缓存
                 return weather_info
-            else:
-                error_msg = data.get('msg', '获取天气数据失败')
-                return {"error": f"获取天气数据失败: {error_msg}"}
-                
+
+            self.weather_cache_city = self.city
+            self._remember('weather', weather_info)
+            return weather_info
+
         except Exception as e:
             return {"error": f"获取天气信息失败: {str(e)}"}
     
@@ -222,8 +228,7 @@ class IntegratedFeaturesManager:
                     'full_text': f"{content}\n—— {author}《{origin}》" if author and origin else content
                 }
                 
-                self.poetry_cache = poetry_info
-                self.last_update['poetry'] = datetime.datetime.now()
+                self._remember('poetry', poetry_info)
                 return poetry_info
             else:
                 return {'content': default_sentence, 'full_text': default_sentence}
@@ -243,32 +248,57 @@ class IntegratedFeaturesManager:
         if city:
             self.city = city
     
-    def is_cache_valid(self, feature, hours=1):
-        """检查缓存是否有效"""
+    def is_cache_valid(self, feature, hours=None):
+        """检查缓存是否有效（hours 缺省取 CACHE_HOURS）"""
         if feature not in self.last_update:
             return False
+        if hours is None:
+            hours = self.CACHE_HOURS.get(feature, 1)
         
         last_time = self.last_update[feature]
         now = datetime.datetime.now()
+        if feature in self.DAILY_FEATURES and last_time.date() != now.date():
+            return False
         return (now - last_time).total_seconds() < hours * 3600
     
     def get_cached_or_fetch(self, feature):
         """获取缓存数据或重新获取"""
         if feature == 'calendar':
-            if self.is_cache_valid('calendar', 24):  # 日历缓存24小时
+            if self.is_cache_valid('calendar'):  # 日历当天有效
                 return self.calendar_cache
             return self.get_calendar_info()
         elif feature == 'weather':
-            if self.is_cache_valid('weather', 1):  # 天气缓存1小时
+            if self.is_cache_valid('weather') and self.weather_cache_city == self.city:  # 天气缓存1小时
                 return self.weather_cache
             return self.get_weather_info()
         elif feature == 'poetry':
-            if self.is_cache_valid('poetry', 6):  # 诗词缓存6小时
+            if self.is_cache_valid('poetry'):  # 诗词缓存6小时
                 return self.poetry_cache
             return self.get_poetry_sentence()
+        elif feature == 'news':
+            if self.is_cache_valid('news'):  # 新闻当天内缓存2小时
+                return self.news_cache
+            return self.get_60s_news()
+        elif feature == 'quote':
+            if self.is_cache_valid('quote'):  # 励志语当天有效
+                return self.quote_cache
+            return self.get_inspirational_quote()
         else:
             return None
 
+    def clear_cache(self):
+        """清空缓存，下次获取时重新请求（天气数据源的缓存与侧边栏共用，一并清空）"""
+        self.weather_cache = None
+        self.calendar_cache = None
+        self.poetry_cache = None
+        self.news_cache = None
+        self.quote_cache = None
+        self.weather_cache_city = None
+        self.last_update = {}
+        self._save_cache()
+        if self.weather_provider is not None:
+            self.weather_provider.clear_cache()
+
 
 class IntegratedFeaturesWindow:
     def __init__(self, parent, features_manager, ui_after=None):
@@ -416,16 +446,16 @@ class IntegratedFeaturesWindow:
                   command=self.refresh_news_data,
                   bootstyle=INFO).pack(side=RIGHT)
         
-    def load_all_data(self):
-        """加载所有数据"""
-        threading.Thread(target=self._load_all_data_thread, daemon=True).start()
+    def load_all_data(self, force=False):
+        """加载所有数据；force 为 False 时优先使用（含上次运行保存的）缓存"""
+        threading.Thread(target=self._load_all_data_thread, args=(force,), daemon=True).start()
         
-    def _load_all_data_thread(self):
+    def _load_all_data_thread(self, force=False):
         """在后台线程中加载所有数据"""
-        self.refresh_calendar_data()
-        self.refresh_weather_data()
-        self.refresh_poetry_data()
-        self.refresh_news_data()
+        self.refresh_calendar_data(force)
+        self.refresh_weather_data(force)
+        self.refresh_poetry_data(force)
+        self.refresh_news_data(force)
         
     def _clear_frame(self, frame):
         """清空Frame内容"""
@@ -468,10 +498,12 @@ class IntegratedFeaturesWindow:
         except Exception:
             pass
 
-    def refresh_calendar_data(self):
+    def refresh_calendar_data(self, force=True):
         """刷新日历数据"""
         def update_calendar():
-            calendar_info = self.features_manager.get_calendar_info()
+            manager = self.features_manager
+            calendar_info = manager.get_calendar_info() if force else manager.get_cached_or_fetch('calendar')
+            quote_text = manager.get_inspirational_quote() if force else manager.get_cached_or_fetch('quote')
             
             # 在主线程更新UI
             def _update_ui():
@@ -510,7 +542,6 @@ class IntegratedFeaturesWindow:
                 quote_card = ttk.Labelframe(container, text="💡 励志语", padding=15, bootstyle="warning")
                 quote_card.pack(fill=X, pady=(0, 10))
                 
-                quote_text = self.features_manager.get_inspirational_quote()
                 ttk.Label(quote_card, text=quote_text, font=("Microsoft YaHei", 12, "italic"), 
                          wraplength=700, justify=CENTER).pack(fill=X)
 
@@ -521,10 +552,11 @@ class IntegratedFeaturesWindow:
         else:
             update_calendar()
         
-    def refresh_weather_data(self):
+    def refresh_weather_data(self, force=True):
         """刷新天气数据"""
         def update_weather():
-            weather_info = self.features_manager.get_weather_info()
+            manager = self.features_manager
+            weather_info = manager.get_weather_info() if force else manager.get_cached_or_fetch('weather')
             
             def _update_ui():
                 self._clear_frame(self.weather_scrolled.container)
@@ -535,6 +567,10 @@ class IntegratedFeaturesWindow:
                              bootstyle=DANGER).pack(pady=20)
                     return
 
+                def fmt(value, unit=""):
+                    # 不同后端提供的字段不同，缺失的显示为 --
+                    return "--" if value is None or value == "" else f"{value}{unit}"
+
                 # 当前天气大卡片
                 main_card = ttk.Frame(container, padding=20, bootstyle="info")
                 main_card.pack(fill=X, pady=(0, 15))
@@ -542,7 +578,7 @@ class IntegratedFeaturesWindow:
                 # 城市和状态
                 top_frame = ttk.Frame(main_card)
                 top_frame.pack(fill=X)
-                ttk.Label(top_frame, text=f"{self.features_manager.city} | {weather_info['status']}", 
+                ttk.Label(top_frame, text=f"{weather_info.get('city') or self.features_manager.city} | {weather_info['status']}", 
                          font=("Microsoft YaHei", 14), bootstyle="inverse-info").pack(side=LEFT)
                 
                 # 温度
@@ -554,7 +590,7 @@ class IntegratedFeaturesWindow:
                 # 高低温
                 range_frame = ttk.Frame(main_card)
                 range_frame.pack(fill=X)
-                ttk.Label(range_frame, text=f"H: {weather_info['max_temp']}°  L: {weather_info['min_temp']}°", 
+                ttk.Label(range_frame, text=f"H: {weather_info['temp_max']}°  L: {weather_info['temp_min']}°", 
                          font=("Microsoft YaHei", 12), bootstyle="inverse-info").pack(side=LEFT)
 
                 # 环境信息卡片 (网格布局)
@@ -563,24 +599,33 @@ class IntegratedFeaturesWindow:
                 
                 # 湿度
                 ttk.Label(env_card, text="湿度", font=("Microsoft YaHei", 10, "bold"), foreground="gray").grid(row=0, column=0, sticky=W, padx=20)
-                ttk.Label(env_card, text=f"{weather_info['humidity']:.1f}%", font=("Microsoft YaHei", 14)).grid(row=1, column=0, sticky=W, padx=20, pady=(0, 10))
+                ttk.Label(env_card, text=fmt(weather_info.get('humidity'), "%"), font=("Microsoft YaHei", 14)).grid(row=1, column=0, sticky=W, padx=20, pady=(0, 10))
                 
                 # 能见度
                 ttk.Label(env_card, text="能见度", font=("Microsoft YaHei", 10, "bold"), foreground="gray").grid(row=0, column=1, sticky=W, padx=20)
-                ttk.Label(env_card, text=f"{weather_info['visibility']}km", font=("Microsoft YaHei", 14)).grid(row=1, column=1, sticky=W, padx=20, pady=(0, 10))
+                ttk.Label(env_card, text=fmt(weather_info.get('visibility'), "km"), font=("Microsoft YaHei", 14)).grid(row=1, column=1, sticky=W, padx=20, pady=(0, 10))
                 
                 # 空气质量
                 ttk.Label(env_card, text="空气质量", font=("Microsoft YaHei", 10, "bold"), foreground="gray").grid(row=2, column=0, sticky=W, padx=20)
-                ttk.Label(env_card, text=f"{weather_info['air_quality']} (AQI: {weather_info['aqi']})", font=("Microsoft YaHei", 14)).grid(row=3, column=0, sticky=W, padx=20)
+                ttk.Label(env_card, text=f"{fmt(weather_info.get('air_quality'))} (AQI: {fmt(weather_info.get('aqi'))})", font=("Microsoft YaHei", 14)).grid(row=3, column=0, sticky=W, padx=20)
                 
                 # PM2.5
                 ttk.Label(env_card, text="PM2.5", font=("Microsoft YaHei", 10, "bold"), foreground="gray").grid(row=2, column=1, sticky=W, padx=20)
-                ttk.Label(env_card, text=f"{weather_info['pm25']}", font=("Microsoft YaHei", 14)).grid(row=3, column=1, sticky=W, padx=20)
+                ttk.Label(env_card, text=fmt(weather_info.get('pm25')), font=("Microsoft YaHei", 14)).grid(row=3, column=1, sticky=W, padx=20)
 
                 # 预报卡片
                 forecast_card = ttk.Labelframe(container, text="今日预报", padding=15)
                 forecast_card.pack(fill=X, pady=(0, 10))
-                ttk.Label(forecast_card, text=weather_info['forecast'], font=("Microsoft YaHei", 11), wraplength=700).pack(fill=X)
+                forecast = f"今日{weather_info['status']}，{weather_info['temp_min']}~{weather_info['temp_max']}°C"
+                if weather_info.get('wind'):
+                    forecast += f"，{weather_info['wind']}"
+                ttk.Label(forecast_card, text=forecast, font=("Microsoft YaHei", 11), wraplength=700).pack(fill=X)
+                source_text = f"数据来源: {weather_info.get('source', '--')}"
+                if weather_info.get('stale'):
+                    fetched = datetime.datetime.fromtimestamp(weather_info['fetched_at'])
+                    source_text += f"（数据源暂不可用，显示 {fetched.strftime('%H:%M')} 的数据）"
+                ttk.Label(forecast_card, text=source_text,
+                         font=("Microsoft YaHei", 9), foreground="gray").pack(anchor=W, pady=(5, 0))
             
             self._ui(0, _update_ui)
             
@@ -589,10 +634,11 @@ class IntegratedFeaturesWindow:
         else:
             update_weather()
         
-    def refresh_poetry_data(self):
+    def refresh_poetry_data(self, force=True):
         """刷新诗词数据"""
         def update_poetry():
-            poetry_info = self.features_manager.get_poetry_sentence()
+            manager = self.features_manager
+            poetry_info = manager.get_poetry_sentence() if force else manager.get_cached_or_fetch('poetry')
             
             def _update_ui():
                 self._clear_frame(self.poetry_scrolled.container)
@@ -630,10 +676,11 @@ class IntegratedFeaturesWindow:
         else:
             update_poetry()
         
-    def refresh_news_data(self):
+    def refresh_news_data(self, force=True):
         """刷新新闻数据"""
         def update_news():
-            news_text = self.features_manager.get_60s_news()
+            manager = self.features_manager
+            news_text = manager.get_60s_news() if force else manager.get_cached_or_fetch('news')
             
             def _update_ui():
                 self._clear_frame(self.news_scrolled.container)
@@ -677,7 +724,7 @@ class IntegratedFeaturesWindow:
         
     def refresh_all_data(self):
         """刷新所有数据"""
-        self.load_all_data()
+        self.load_all_data(force=True)
         
     def show_settings(self):
         """显示设置窗口"""
@@ -0,0 +1,239 @@
+"""
+农历表 - 后台预计算若干年的逐日农历、节气、节日，压缩为定长整数数组存盘，按日期下标查询
+"""
+import os
+import sys
+import struct
+import threading
+from array import array
+from datetime import date, datetime, timedelta
+
+import cnlunar
+
+SOLAR_TERMS = [
+    "小寒", "大寒", "立春", "雨水", "惊蛰", "春分", "清明", "谷雨",
+    "立夏", "小满", "芒种", "夏至", "小暑", "大暑", "立秋", "处暑",
+    "白露", "秋分", "寒露", "霜降", "立冬", "小雪", "大雪", "冬至",
+]
+
+# 节日编号即在表中的下标（从 1 开始），只能在末尾追加；改动已有顺序需提升 LunarTable.VERSION
+FESTIVALS = [
+    "元旦", "春节", "清明", "劳动节", "端午", "中秋", "国庆",
+    "元宵", "七夕", "中元", "重阳", "腊八", "小年", "除夕",
+    "情人节", "妇女节", "植树节", "青年节", "儿童节", "建军节", "教师节",
+    "母亲节", "父亲节", "平安夜", "圣诞节",
+]
+
+# cnlunar 节日全称 -> 日历格子里显示的简称；不在表中的纪念日不显示
+_FESTIVAL_ALIASES = {
+    "元旦节": "元旦", "春节": "春节", "清明节": "清明", "国际劳动节": "劳动节",
+    "端午节": "端午", "中秋节": "中秋", "国庆节": "国庆",
+    "情人节": "情人节", "国际劳动妇女节": "妇女节", "中国植树节": "植树节",
+    "中国青年节": "青年节", "国际儿童节": "儿童节", "中国人民解放军建军节": "建军节",
+    "中国教师节": "教师节", "母亲节": "母亲节", "父亲节": "父亲节",
+    "平安夜": "平安夜", "圣诞节": "圣诞节",
+}
+
+# 按农历(月, 日)确定的传统节日（不含闰月）
+_LUNAR_FESTIVALS = {
+    (1, 15): "元宵", (7, 7): "七夕", (7, 15): "中元",
+    (9, 9): "重阳", (12, 8): "腊八", (12, 23): "小年",
+}
+
+_MONTH_NAMES = ["正", "二", "三", "四", "五", "六", "七", "八", "九", "十", "冬", "腊"]
+_DAY_TENS = ["初", "十", "廿", "三"]
+_DAY_UNITS = ["一", "二", "三", "四", "五", "六", "七", "八", "九", "十"]
+
+
+def lunar_month_name(month, leap=False):
+    return ("闰" if leap else "") + _MONTH_NAMES[month - 1] + "月"
+
+
+def lunar_day_name(day):
+    if day == 10:
+        return "初十"
+    if day == 20:
+        return "二十"
+    if day == 30:
+        return "三十"
+    return _DAY_TENS[day // 10] + _DAY_UNITS[day % 10 - 1]
+
+
+# 每天一个 32 位整数：
+#   bit 0-4 农历日 | bit 5-8 农历月 | bit 9 闰月 | bit 10-14 节气(0=无) | bit 15-20 节日(0=无)
+def _pack(month, day, leap, term, festival):
+    return day | (month << 5) | (int(bool(leap)) << 9) | (term << 10) | (festival << 15)
+
+
+def _unpack(value):
+    return {
+        "day": value & 0x1F,
+        "month": (value >> 5) & 0x0F,
+        "leap": bool((value >> 9) & 1),
+        "term": SOLAR_TERMS[((value >> 10) & 0x1F) - 1] if (value >> 10) & 0x1F else None,
+        "festival": FESTIVALS[((value >> 15) & 0x3F) - 1] if (value >> 15) & 0x3F else None,
+    }
+
+
+class LunarTable:
+    """[start, start+len) 范围内每天的农历信息，按日期序号下标 O(1) 查询。
+
+    构造 cnlunar.Lunar 较慢（每天约 0.3ms），因此只在后台线程里批量计算一次并存盘，
+    之后启动直接读取；翻到范围以外的年份时在后台向两端扩展，已算过的天不再重复计算。
+    """
+
+    FILE_NAME = "lunar_table.bin"
+    MAGIC = b"LUNR"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHII") # 魔数, 版本, 起始日期序号, 天数
+    YEARS_BEFORE = 2 # 默认覆盖今年之前的年数
+    YEARS_AFTER = 3 # 默认覆盖今年之后的年数
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._start = 0 # 第一天的 date.toordinal()
+        self._days = array("I")
+        self._building = False
+        self._failed_range = None # 计算失败过的范围，本次运行不再重试
+        self._load()
+
+    @property
+    def building(self):
+        return self._building
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            magic, version, start, count = self.HEADER.unpack_from(raw)
+            if magic != self.MAGIC or version != self.VERSION:
+                return
+            days = array("I")
+            days.frombytes(raw[self.HEADER.size:self.HEADER.size + count * days.itemsize])
+            if sys.byteorder == "big":
+                days.byteswap()
+            if len(days) != count:
+                return
+            self._start, self._days = start, days
+        except Exception as e:
+            print(f"读取农历表失败: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        with self._lock:
+            start, days = self._start, array("I", self._days)
+        if sys.byteorder == "big":
+            days.byteswap()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, start, len(days)))
+                f.write(days.tobytes())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"保存农历表失败: {e}")
+
+    def covers(self, year):
+        start = date(year, 1, 1).toordinal()
+        end = date(year + 1, 1, 1).toordinal()
+        with self._lock:
+            return self._start <= start and end <= self._start + len(self._days)
+
+    def _compute(self, start, end):
+        """计算 [start, end) 每天的压缩值；多算一天用来判断除夕"""
+        values = array("I")
+        previous = None
+        for ordinal in range(start, end + 1):
+            lunar = cnlunar.Lunar(datetime.fromordinal(ordinal), godType="8char")
+            month, day, leap = lunar.lunarMonth, lunar.lunarDay, bool(lunar.isLunarLeapMonth)
+            if month == 1 and day == 1 and previous is not None:
+                # 正月初一的前一天是除夕（腊月可能只有29天）
+                values[-1] = (values[-1] & ~(0x3F << 15)) | ((FESTIVALS.index("除夕") + 1) << 15)
+            if ordinal == end:
+                break
+
+            term = lunar.todaySolarTerms
+            term = SOLAR_TERMS.index(term) + 1 if term in SOLAR_TERMS else 0
+
+            festival = None
+            for name in (lunar.get_legalHolidays() or "").split(",") + (lunar.get_otherHolidays() or "").split(","):
+                festival = _FESTIVAL_ALIASES.get(name.strip())
+                if festival:
+                    break
+            if not festival and not leap:
+                festival = _LUNAR_FESTIVALS.get((month, day))
+            festival = FESTIVALS.index(festival) + 1 if festival else 0
+
+            values.append(_pack(month, day, leap, term, festival))
+            previous = ordinal
+        return values
+
+    def ensure_year(self, year):
+        """确保表覆盖 year（及默认范围）；需要计算时在后台进行，返回是否正在计算"""
+        this_year = date.today().year
+        first = min(year, this_year - self.YEARS_BEFORE)
+        last = max(year, this_year + self.YEARS_AFTER)
+        if self.covers(first) and self.covers(last):
+            return self._building
+        if self._building:
+            return True
+        if self._failed_range == (first, last):
+            return False
+
+        self._building = True
+
+        def worker():
+            try:
+                self._extend(date(first, 1, 1).toordinal(), date(last + 1, 1, 1).toordinal())
+                self._save()
+            except Exception as e:
+                self._failed_range = (first, last)
+                print(f"计算农历表失败: {e}")
+            finally:
+                self._building = False
+
+        threading.Thread(target=worker, daemon=True).start()
+        return True
+
+    def _extend(self, start, end):
+        """把表扩展到至少覆盖 [start, end)，只计算新增的两端"""
+        with self._lock:
+            old_start, old_days = self._start, array("I", self._days)
+        if not old_days:
+            days = self._compute(start, end)
+        else:
+            old_end = old_start + len(old_days)
+            start, end = min(start, old_start), max(end, old_end)
+            days = self._compute(start, old_start) if start < old_start else array("I")
+            days.extend(old_days)
+            if end > old_end:
+                days.extend(self._compute(old_end, end))
+        with self._lock:
+            self._start, self._days = start, days
+
+    def lookup(self, day):
+        """某天的农历信息 {"month", "day", "leap", "term", "festival"}；不在表内返回 None"""
+        with self._lock:
+            index = day.toordinal() - self._start
+            if not self._days or index < 0 or index >= len(self._days):
+                return None
+            value = self._days[index]
+        return _unpack(value)
+
+    def label(self, day):
+        """日历格子里的小字：节日 > 节气 > 农历初一显示月份 > 农历日；返回 (文字, 类型) 或 None"""
+        info = self.lookup(day)
+        if not info:
+            return None
+        if info["festival"]:
+            return info["festival"], "festival"
+        if info["term"]:
+            return info["term"], "term"
+        if info["day"] == 1:
+            return lunar_month_name(info["month"], info["leap"]), "month"
+        return lunar_day_name(info["day"]), "day"
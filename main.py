@@ -33,6 +33,9 @@ from screensaver_manager import ScreensaverManager
 from screensaver_widget import ScreensaverWidget
 from alapi_widgets import InfoPushWidget
 from weather_service import WeatherService
+from weather_providers import WeatherProvider, OpenMeteoBackend, XxapiBackend
+from weather_panel import MultiCityWeatherWindow
+from ball_skins import SkinFrameStore, load_skins, skin_hash, dock_colors, render_frame
 
 def apply_theme_to_titlebar(root):
     """强制应用暗色/亮色标题栏 (Windows 10/11)"""
@@ -877,7 +880,11 @@ APP_DATA_DIR = os.path.join(_appdata_base, "WallpaperApp")
 CONFIG_PATH = os.path.join(APP_DATA_DIR, 'config.json')
 ICON_PATH = os.path.join(APP_DATA_DIR, 'icon.ico')
 PICTURES_DIR = os.path.join(os.path.expanduser('~'), 'Pictures')
+SKINS_DIR = os.path.join(APP_DATA_DIR, 'skins')
+SKIN_CACHE_DIR = os.path.join(APP_DATA_DIR, 'skin_cache')
 MAX_CACHE_SIZE = 50
+NEWS_NOTIFY_FALLBACK_SECONDS = 60 # 推送时早报未就绪，后台获取在该时间内完成才补发通知
+SIDEBAR_WEATHER_REFRESH_MINUTES = 30 # 侧边栏天气的刷新间隔；逐时预报过期前都在本地查表，不发请求
 
 _FATAL_LOG_PATH = None
 _FATAL_FH = None
@@ -1055,7 +1062,138 @@ class ModernMenu(tk.Toplevel):
             except Exception as e:
                 print(f"Menu action error: {e}")
 
+class FrameScheduler:
+    """自适应帧时钟：按状态选择帧间隔，暂停(0fps)时只做低频轮询，并根据实测帧耗时降帧。
+
+    拖拽、吸附动画等位移通过 start_motion 挂到同一个时钟上，每个显示帧最多执行一次，
+    与动画帧共用一条 after 链，互不抢占。
+    """
+    POLL_INTERVAL_MS = 500 # 暂停期间检查是否需要恢复的间隔
+    MOTION_INTERVAL_MS = 16 # 有位移任务时的时钟间隔（约一个显示帧）
+
+    def __init__(self, widget, on_frame, get_interval, budget_ratio=0.5, max_slowdown=8.0):
+        self.widget = widget
+        self.on_frame = on_frame
+        self.get_interval = get_interval # 返回目标帧间隔(ms)，None 表示暂停
+        self.budget_ratio = budget_ratio # 单帧耗时超过 间隔*该比例 视为超预算
+        self.max_slowdown = max_slowdown
+        self.slowdown = 1.0
+        self.last_frame_ms = 0.0
+        self.paused = False
+        self._job = None
+        self._running = False
+        self._in_tick = False
+        self._next_frame_at = 0.0
+        self._motion = None # 位移任务：每帧调用一次，返回 False 表示结束
+
+    def start(self):
+        self._running = True
+        self._schedule(0)
+
+    def stop(self):
+        self._running = False
+        self._motion = None
+        self._cancel()
+
+    def wake(self):
+        """状态变化时立即重新评估，不必等待暂停期的轮询"""
+        if self._running and not self._in_tick:
+            self._schedule(0)
+
+    def start_motion(self, step):
+        """挂上位移任务（替换已有任务）；同一任务重复挂载不会打断当前时钟"""
+        if self._motion == step:
+            return
+        was_idle = self._motion is None
+        self._motion = step
+        if was_idle:
+            self.wake()
+
+    def stop_motion(self, step=None):
+        if step is None or self._motion == step:
+            self._motion = None
+
+    def _cancel(self):
+        try:
+            if self._job is not None:
+                self.widget.after_cancel(self._job)
+        except Exception:
+            pass
+        self._job = None
+
+    def _schedule(self, delay_ms):
+        self._cancel()
+        try:
+            self._job = self.widget.after(int(delay_ms), self._tick)
+        except Exception:
+            self._job = None
+
+    def _run_motion(self):
+        step = self._motion
+        if step is None:
+            return
+        try:
+            active = step()
+        except Exception as e:
+            print(f"Motion error: {e}")
+            active = False
+        # 任务可能在执行中挂上了新的任务，只清除自己
+        if not active and self._motion is step:
+            self._motion = None
+
+    def _tick(self):
+        self._job = None
+        if not self._running:
+            return
+
+        self._in_tick = True
+        try:
+            self._run_motion()
+
+            try:
+                interval = self.get_interval()
+            except Exception:
+                interval = None
+
+            if interval is None:
+                self.paused = True
+                delay = self.POLL_INTERVAL_MS
+            else:
+                self.paused = False
+                now = time.perf_counter()
+                if now >= self._next_frame_at:
+                    try:
+                        self.on_frame()
+                    except Exception as e:
+                        print(f"Frame error: {e}")
+                    cost_ms = (time.perf_counter() - now) * 1000.0
+                    self.last_frame_ms = cost_ms
+
+                    # 超预算则拉长间隔，恢复后逐步回到目标帧率
+                    if cost_ms > interval * self.budget_ratio:
+                        self.slowdown = min(self.max_slowdown, self.slowdown * 1.5)
+                    elif self.slowdown > 1.0:
+                        self.slowdown = max(1.0, self.slowdown * 0.9)
+                    self._next_frame_at = now + max(interval * self.slowdown, cost_ms) / 1000.0
+                delay = max(0.0, (self._next_frame_at - time.perf_counter()) * 1000.0)
+
+            if self._motion is not None:
+                delay = min(delay, self.MOTION_INTERVAL_MS)
+        finally:
+            self._in_tick = False
+
+        if self._running:
+            self._schedule(delay)
+
+
 class FloatingBall:
+    # 动画相位每帧前进0.1弧度，一个周期(2π)约63帧，帧环按此预渲染
+    PULSE_INTERVAL_MS = 30
+    PULSE_FRAMES = 63
+    AMBIENT_INTERVAL_MS = 120 # 指针不在附近时的低帧率
+    NEAR_DISTANCE = 160 # 指针距球心多少像素内视为靠近，跑满帧率
+    IDLE_PAUSE_SECONDS = 60 # 用户空闲超过该时长后暂停动画
+
     def __init__(self, app, size=70, snap_threshold=40): # 稍微加大默认尺寸
         self.app = app
         self.root = getattr(app, "root", None)
@@ -1066,14 +1204,26 @@ class FloatingBall:
         self._drag_dx = 0
         self._drag_dy = 0
         self._phase = 0.0
-        self._anim_job = None
-        self._pulse_job = None
+        self._scheduler = None
+        self._drag_target = None # 拖拽中最新的目标位置，每帧最多应用一次
+        self._last_pointer = None
+        self._last_pointer_time = time.time()
         self._docked = False # 是否已吸附
         self._dock_side = None # 'left' or 'right'
         
         self.skin = "future_orb" # 默认皮肤
+        self._skins = load_skins(SKINS_DIR) # 内置皮肤 + 用户皮肤目录中的 *.json
+        self._frame_store = SkinFrameStore(SKIN_CACHE_DIR)
         
         self._photo_image = None # 缓存当前的PhotoImage
+        self._frame_index = 0
+        self._highlight = False
+        # (skin, size, highlight) -> 一个周期的PhotoImage帧环，首次播放时逐帧填充
+        self._frame_cache = {}
+        self._ball_item = None # 球体模式下复用的canvas图像项
+        self._shown_key = None # 当前canvas上显示的帧所属的帧环
+        self._dock_key = None # 条状模式下已绘制的静态图元对应的状态
+        self._dock_line = None
 
         self.window = tk.Toplevel(self.root)
         self.window.withdraw()
@@ -1123,18 +1273,9 @@ class FloatingBall:
         self._start_pulse()
 
     def destroy(self):
-        try:
-            if self._pulse_job is not None:
-                self.window.after_cancel(self._pulse_job)
-        except Exception:
-            pass
-        self._pulse_job = None
-        try:
-            if self._anim_job is not None:
-                self.window.after_cancel(self._anim_job)
-        except Exception:
-            pass
-        self._anim_job = None
+        if self._scheduler is not None:
+            self._scheduler.stop()
+        self._scheduler = None
         try:
             if self.window and self.window.winfo_exists():
                 self.window.destroy()
@@ -1191,16 +1332,29 @@ class FloatingBall:
         self.skin = skin_id
         self._redraw()
         
+    def _reload_skins(self):
+        """重新扫描用户皮肤目录，定义有变化的皮肤丢弃内存中的帧环"""
+        old = self._skins
+        self._skins = load_skins(SKINS_DIR)
+        changed = set()
+        for skin_id, definition in old.items():
+            new = self._skins.get(skin_id)
+            if new is None or (new is not definition and skin_hash(new) != skin_hash(definition)):
+                changed.add(skin_id)
+        for key in list(self._frame_cache):
+            if key[0] in changed:
+                del self._frame_cache[key]
+
+    def _current_skin_id(self):
+        skin = getattr(self, 'skin', 'future_orb')
+        return skin if skin in self._skins else 'future_orb'
+
     def _show_skin_menu(self, x, y):
-        skins = [
-            ("未来光球", "future_orb"),
-            ("霓虹脉冲", "neon_pulse"),
-            ("经典蓝", "classic_blue"),
-            ("简约白", "minimalist_white")
-        ]
+        self._reload_skins()
         commands = []
-        current_skin = getattr(self, 'skin', 'future_orb')
-        for label, skin_id in skins:
+        current_skin = self._current_skin_id()
+        for skin_id, definition in self._skins.items():
+            label = definition.get("name", skin_id)
             prefix = "√ " if current_skin == skin_id else "  "
             commands.append({
                 "label": f"{prefix}{label}",
@@ -1268,26 +1422,48 @@ class FloatingBall:
             y = int(event.y_root) - self._drag_dy
         except Exception:
             return
-        x, y = self._clamp_to_screen(x, y)
+        # 只记录最新位置，由帧时钟合并后统一移动窗口
+        self._drag_target = self._clamp_to_screen(x, y)
+        if self._scheduler is not None:
+            self._scheduler.start_motion(self._drag_step)
+        else:
+            self._apply_drag_target()
+        return "break"
+
+    def _drag_step(self):
+        self._apply_drag_target()
+        return self._dragging
+
+    def _apply_drag_target(self):
+        target = self._drag_target
+        self._drag_target = None
+        if target is None:
+            return
+        x, y = target
         try:
             self.window.geometry(f"{self.size}x{self.size}+{x}+{y}")
         except Exception:
             pass
-        return "break"
 
     def _on_left_up(self, event):
         self._dragging = False
+        # 先落下最后一次拖拽位置，再计算吸附
+        self._apply_drag_target()
+        if self._scheduler is not None:
+            self._scheduler.stop_motion(self._drag_step)
         self._snap_to_edges(animated=True)
         return "break"
         
     def _on_mouse_enter(self, event):
         if self._docked:
             # Dock状态下鼠标悬停，可以高亮或者轻微弹出（暂不改变位置，只改变颜色）
-            self._redraw(highlight=True)
+            self._highlight = True
+            self._redraw()
 
     def _on_mouse_leave(self, event):
+        self._highlight = False
         if self._docked:
-            self._redraw(highlight=False)
+            self._redraw()
 
     def _clamp_to_screen(self, x, y):
         try:
@@ -1379,20 +1555,15 @@ class FloatingBall:
         """恢复球状"""
         self._docked = False
         self._dock_side = None
+        self._highlight = False
         
         # 恢复尺寸
         self.window.geometry(f"{self.size}x{self.size}") # 位置会在drag中更新，这里只重置大小
         self.canvas.configure(width=self.size, height=self.size)
         self._redraw()
+        self._wake_pulse()
 
     def _animate_move(self, tx, ty, on_complete=None):
-        try:
-            if self._anim_job is not None:
-                self.window.after_cancel(self._anim_job)
-        except Exception:
-            pass
-        self._anim_job = None
-
         sx, sy = self._get_xy()
         steps = 8 # 减少步数加快响应
         dx = (tx - sx) / float(steps)
@@ -1400,17 +1571,16 @@ class FloatingBall:
 
         state = {"i": 0}
 
-        def tick():
+        def step():
             i = state["i"]
             if i >= steps:
                 try:
                     self.window.geometry(f"+{tx}+{ty}")
                 except Exception:
                     pass
-                self._anim_job = None
                 if on_complete:
                     on_complete()
-                return
+                return False
             
             nx = int(round(sx + dx * (i + 1)))
             ny = int(round(sy + dy * (i + 1)))
@@ -1419,307 +1589,191 @@ class FloatingBall:
             except Exception:
                 pass
             state["i"] = i + 1
-            try:
-                self._anim_job = self.window.after(16, tick)
-            except Exception:
-                self._anim_job = None
+            return True
 
-        tick()
+        if self._scheduler is not None:
+            # 与动画共用帧时钟，每个显示帧推进一步
+            self._scheduler.start_motion(step)
+        else:
+            while step():
+                pass
 
     def _start_pulse(self):
-        def loop():
-            # 旋转/呼吸相位更新
-            self._phase = (self._phase + 0.1) % 6.283
-            self._redraw()
+        self._scheduler = FrameScheduler(self.window, self._pulse_frame, self._pulse_interval)
+        self._scheduler.start()
+
+    def _wake_pulse(self):
+        if self._scheduler is not None:
+            self._scheduler.wake()
+
+    def _pulse_frame(self):
+        # 旋转/呼吸相位更新：在帧环上前进一格
+        self._frame_index = (self._frame_index + 1) % self.PULSE_FRAMES
+        self._phase = self._frame_index * (2 * math.pi / self.PULSE_FRAMES)
+        self._redraw()
+
+    def _pulse_interval(self):
+        """当前应使用的帧间隔(ms)；返回 None 表示暂停动画(0fps)"""
+        if self._docked:
+            return None
+        try:
+            if not self.window.winfo_viewable():
+                return None
+        except Exception:
+            return None
+
+        manager = getattr(self.app, "screensaver_manager", None)
+        if manager is not None and getattr(manager, "screensaver_active", False):
+            return None
+
+        try:
+            px, py = self.window.winfo_pointerxy()
+        except Exception:
+            return self.AMBIENT_INTERVAL_MS
+
+        now = time.time()
+        if (px, py) != self._last_pointer:
+            self._last_pointer = (px, py)
+            self._last_pointer_time = now
+        idle_seconds = now - self._last_pointer_time
+        if manager is not None:
             try:
-                self._pulse_job = self.window.after(30, loop)
+                idle_seconds = manager.get_idle_seconds()
             except Exception:
-                self._pulse_job = None
-
-        loop()
+                pass
+        if idle_seconds >= self.IDLE_PAUSE_SECONDS:
+            return None
 
-    def _redraw(self, highlight=False):
+        try:
+            cx = self.window.winfo_x() + self.size / 2.0
+            cy = self.window.winfo_y() + self.size / 2.0
+        except Exception:
+            return self.AMBIENT_INTERVAL_MS
+        if math.hypot(px - cx, py - cy) <= self.NEAR_DISTANCE:
+            return self.PULSE_INTERVAL_MS
+        return self.AMBIENT_INTERVAL_MS
+
+    def _redraw(self, highlight=None):
+        if highlight is None:
+            highlight = self._highlight
         if self._docked:
             self._draw_docked(highlight)
         else:
-            self._draw_ball_image()
-
-    def _draw_ball_image(self):
-        """根据皮肤设置绘制悬浮球"""
-        if getattr(self, 'skin', 'future_orb') == 'neon_pulse':
-            self._draw_neon_pulse()
-        elif getattr(self, 'skin', 'future_orb') == 'classic_blue':
-            self._draw_classic_blue()
-        elif getattr(self, 'skin', 'future_orb') == 'minimalist_white':
-            self._draw_minimalist_white()
-        else:
-            self._draw_future_orb()
+            self._draw_ball_image(highlight)
+
+    def _draw_ball_image(self, highlight=False):
+        """根据皮肤设置绘制悬浮球，帧从编译好的帧环中取"""
+        skin = self._current_skin_id()
+        key = (skin, self.size, bool(highlight))
+        ring = self._frame_cache.get(key)
+        if ring is None:
+            ring = [None] * self.PULSE_FRAMES
+            self._frame_cache[key] = ring
+            self._compile_skin_async(key)
+
+        index = self._frame_index % self.PULSE_FRAMES
+        photo = ring[index]
+        if photo is None:
+            if self._shown_key == key:
+                # 后台编译尚未完成，先保持当前帧
+                return
+            # 刚切换皮肤：同步渲染一帧，避免显示旧皮肤
+            try:
+                image = render_frame(self._skins[skin], self.size, self._phase)
+            except Exception as e:
+                print(f"Drawing error: {e}")
+                self._draw_fallback()
+                return
+            photo = ImageTk.PhotoImage(image)
+            ring[index] = photo
+        self._show_frame(photo, key)
 
-    def _apply_binary_alpha(self, image, size):
-        """应用二值化Alpha通道以消除边缘杂色"""
-        # 缩放回原尺寸
-        image = image.resize((size, size), Image.Resampling.LANCZOS)
-        
-        bg_color_rgb = (0, 0, 1) # #000001 Key Color
-        final_image = Image.new("RGB", (size, size), bg_color_rgb)
-        
-        datas = image.getdata()
-        new_data = []
-        
-        for item in datas:
-            # item is (r, g, b, a)
-            if item[3] > 100: # 稍微放宽阈值，保留更多边缘细节
-                # 强制不透明，直接使用RGB
-                new_data.append(item[:3])
-            else:
-                # 背景
-                new_data.append(bg_color_rgb)
-        
-        final_image.putdata(new_data)
-        
-        # Convert to ImageTk
-        self._photo_image = ImageTk.PhotoImage(final_image)
-        
-        self.canvas.delete("all")
-        self.canvas.create_image(0, 0, image=self._photo_image, anchor="nw")
+    def _compile_skin_async(self, key):
+        """后台读取磁盘帧缓存或编译皮肤，完成后回到Tk线程生成PhotoImage"""
+        skin, size, _ = key
+        definition = self._skins.get(skin)
+        ring = self._frame_cache.get(key)
 
-    def _draw_future_orb(self):
-        """使用PIL绘制细腻的未来光球 (Future Orb)"""
-        try:
-            # 基础配置
-            size = self.size
-            scale = 4  # 4x超采样保证内部细节平滑
-            img_size = size * scale
-            
-            # 创建画布
-            image = Image.new("RGBA", (img_size, img_size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(image)
-            
-            cx, cy = img_size / 2, img_size / 2
-            
-            # 留出边缘空间，确保不被截断
-            margin = 2 * scale
-            max_r = img_size / 2 - margin
-            
-            # --- 设计层 ---
-            
-            # 1. 外部底盘 (Chassis) - 实心深色圆，作为抗锯齿的基底
-            chassis_color = (20, 25, 35, 255) # 深灰蓝
-            bbox_main = [cx - max_r, cy - max_r, cx + max_r, cy + max_r]
-            draw.ellipse(bbox_main, fill=chassis_color)
-            
-            # 2. 内部流光环 (Glowing Ring)
-            ring_r = max_r * 0.92
-            ring_bbox = [cx - ring_r, cy - ring_r, cx + ring_r, cy + ring_r]
-            
-            pulse = (math.sin(self._phase) + 1) / 2 # 0~1
-            ring_color = (0, 150 + int(50*pulse), 255, 255) # 动态青蓝
-            draw.ellipse(ring_bbox, outline=ring_color, width=int(4*scale))
-            
-            # 3. 核心能量球 (Core Energy)
-            core_r = max_r * 0.65
-            core_bbox = [cx - core_r, cy - core_r, cx + core_r, cy + core_r]
-            draw.ellipse(core_bbox, fill=(10, 20, 50, 255))
-            
-            # 4. 动态旋转的“电子”或“卫星” (Satellites)
-            orbit_r = max_r * 0.78
-            sat_count = 2
-            for i in range(sat_count):
-                angle = self._phase * 1.5 + (i * 3.14159) # 对称分布
-                sat_x = cx + math.cos(angle) * orbit_r
-                sat_y = cy + math.sin(angle) * orbit_r
-                sat_size = 5 * scale
-                sat_bbox = [sat_x - sat_size, sat_y - sat_size, sat_x + sat_size, sat_y + sat_size]
-                draw.ellipse(sat_bbox, fill=(255, 255, 255, 255))
-                
-            # 5. 玻璃质感高光 (Glass Highlight)
-            ref_size = 4 * scale
-            ref_x = cx - max_r * 0.4
-            ref_y = cy - max_r * 0.4
-            draw.ellipse([ref_x, ref_y, ref_x + ref_size, ref_y + ref_size], fill=(255, 255, 255, 255))
+        def worker():
+            try:
+                images = self._frame_store.get_frames(skin, definition, size, self.PULSE_FRAMES)
+            except Exception as e:
+                print(f"皮肤编译失败 {skin}: {e}")
+                return
+            try:
+                self.app.safe_after(0, lambda: self._install_frames(key, ring, images))
+            except Exception:
+                pass
 
-            self._apply_binary_alpha(image, size)
-            
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _install_frames(self, key, ring, images):
+        # 皮肤定义在编译期间被重新加载过，则丢弃这批结果
+        if ring is None or self._frame_cache.get(key) is not ring:
+            return
+        try:
+            if not self.window.winfo_exists():
+                return
+            for i, image in enumerate(images[:len(ring)]):
+                if ring[i] is None:
+                    ring[i] = ImageTk.PhotoImage(image)
         except Exception as e:
-            print(f"Drawing error: {e}")
-            self.canvas.delete("all")
-            self.canvas.create_oval(5, 5, self.size-5, self.size-5, fill="blue")
+            print(f"加载皮肤帧失败: {e}")
 
-    def _draw_neon_pulse(self):
-        """霓虹脉冲 (Neon Pulse) - 赛博朋克粉紫风格"""
+    def _show_frame(self, photo, key=None):
+        """切换到已缓存的帧：只更新canvas图像项，不再重建"""
+        self._photo_image = photo
+        self._shown_key = key
         try:
-            size = self.size
-            scale = 4
-            img_size = size * scale
-            image = Image.new("RGBA", (img_size, img_size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(image)
-            cx, cy = img_size / 2, img_size / 2
-            margin = 2 * scale
-            max_r = img_size / 2 - margin
-
-            # 底盘 - 深紫色 (带一点渐变感)
-            chassis_color = (20, 0, 30, 255)
-            draw.ellipse([cx - max_r, cy - max_r, cx + max_r, cy + max_r], fill=chassis_color)
-
-            # 旋转的扫描弧线
-            scan_angle = math.degrees(self._phase * 1.5)
-            scan_r = max_r * 0.9
-            draw.arc([cx - scan_r, cy - scan_r, cx + scan_r, cy + scan_r], 
-                    start=scan_angle, end=scan_angle + 60, fill=(0, 255, 255, 255), width=int(3*scale))
-            
-            draw.arc([cx - scan_r, cy - scan_r, cx + scan_r, cy + scan_r], 
-                    start=scan_angle + 180, end=scan_angle + 240, fill=(255, 0, 255, 255), width=int(3*scale))
-
-            # 脉冲环 - 粉色呼吸
-            pulse = (math.sin(self._phase * 3) + 1) / 2
-            ring_color = (255, 0, 150 + int(105*pulse), 255)
-            ring_r = max_r * 0.75
-            draw.ellipse([cx - ring_r, cy - ring_r, cx + ring_r, cy + ring_r], outline=ring_color, width=int(4*scale))
-            
-            # 核心 - 亮紫色 (大小呼吸)
-            core_base_r = max_r * 0.4
-            core_r = core_base_r * (0.9 + 0.2 * pulse)
-            draw.ellipse([cx - core_r, cy - core_r, cx + core_r, cy + core_r], fill=(120, 0, 180, 255))
-            
-            # 旋转十字光标
-            cursor_len = max_r * 0.25
-            cursor_angle = self._phase
-            
-            # 绘制十字 (通过计算旋转后的坐标)
-            for angle_offset in [0, math.pi/2]:
-                angle = cursor_angle + angle_offset
-                x1 = cx + math.cos(angle) * (core_r - cursor_len)
-                y1 = cy + math.sin(angle) * (core_r - cursor_len)
-                x2 = cx + math.cos(angle) * (core_r + cursor_len)
-                y2 = cy + math.sin(angle) * (core_r + cursor_len)
-                draw.line([x1, y1, x2, y2], fill=(255, 255, 255, 255), width=int(2*scale))
-
-            self._apply_binary_alpha(image, size)
+            if self._ball_item is None:
+                self.canvas.delete("all")
+                self._dock_key = None
+                self._dock_line = None
+                self._ball_item = self.canvas.create_image(0, 0, image=photo, anchor="nw")
+            else:
+                self.canvas.itemconfigure(self._ball_item, image=photo)
         except Exception:
-            pass
+            self._ball_item = None
 
-    def _draw_classic_blue(self):
-        """经典蓝 (Classic Blue) - 3D质感增强"""
+    def _draw_fallback(self):
         try:
-            size = self.size
-            scale = 4
-            img_size = size * scale
-            image = Image.new("RGBA", (img_size, img_size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(image)
-            cx, cy = img_size / 2, img_size / 2
-            margin = 2 * scale
-            max_r = img_size / 2 - margin
-
-            # 模拟3D球体渐变 (从左上亮到右下暗)
-            # 使用更多层级模拟平滑渐变
-            steps = 40
-            for i in range(steps):
-                r = max_r * (1 - i/steps)
-                # 偏移圆心以模拟光照方向 (左上)
-                offset = (max_r - r) * 0.4
-                cur_cx = cx - offset
-                cur_cy = cy - offset
-                
-                # 颜色插值: 亮蓝 -> 深蓝
-                ratio = i / steps
-                # 亮部: (60, 120, 255) -> 暗部: (0, 30, 100)
-                red = int(60 * (1-ratio))
-                green = int(120 * (1-ratio) + 30 * ratio)
-                blue = int(255 * (1-ratio) + 100 * ratio)
-                
-                draw.ellipse([cur_cx - r, cur_cy - r, cur_cx + r, cur_cy + r], fill=(red, green, blue, 255))
-            
-            # 外部轮廓 (深色边框)
-            draw.ellipse([cx - max_r, cy - max_r, cx + max_r, cy + max_r], outline=(0, 20, 80, 255), width=int(1.5*scale))
-
-            # 动态高光 (呼吸效果)
-            pulse = (math.sin(self._phase * 1.5) + 1) / 2
-            hl_r = max_r * 0.25 * (0.9 + 0.1 * pulse)
-            hl_x = cx - max_r * 0.4
-            hl_y = cy - max_r * 0.4
-            
-            # 柔和高光 (通过画几个不同透明度的圆模拟)
-            draw.ellipse([hl_x, hl_y, hl_x + hl_r*1.2, hl_y + hl_r*0.9], fill=(255, 255, 255, 200))
-            draw.ellipse([hl_x + scale, hl_y + scale, hl_x + hl_r*1.2 - scale, hl_y + hl_r*0.9 - scale], fill=(255, 255, 255, 255))
-
-            # 底部反光 (Rim Light)
-            rim_start = math.radians(45)
-            rim_end = math.radians(135)
-            rim_rect = [cx - max_r*0.9, cy - max_r*0.9, cx + max_r*0.9, cy + max_r*0.9]
-            draw.arc(rim_rect, start=30, end=100, fill=(100, 200, 255, 255), width=int(3*scale))
-
-            self._apply_binary_alpha(image, size)
+            self.canvas.delete("all")
+            self.canvas.create_oval(5, 5, self.size-5, self.size-5, fill="blue")
         except Exception:
             pass
+        self._ball_item = None
+        self._shown_key = None
+        self._dock_key = None
+        self._dock_line = None
 
-    def _draw_minimalist_white(self):
-        """简约白 (Minimalist White) - 增加层次感与动态"""
+    def _draw_docked(self, highlight):
         try:
-            size = self.size
-            scale = 4
-            img_size = size * scale
-            image = Image.new("RGBA", (img_size, img_size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(image)
-            cx, cy = img_size / 2, img_size / 2
-            margin = 2 * scale
-            max_r = img_size / 2 - margin
-
-            # 1. 外层光晕环 (浅灰)
-            draw.ellipse([cx - max_r, cy - max_r, cx + max_r, cy + max_r], fill=(220, 220, 220, 255))
-            
-            # 2. 主体白底 (稍微缩小一点)
-            main_r = max_r * 0.95
-            draw.ellipse([cx - main_r, cy - main_r, cx + main_r, cy + main_r], fill=(255, 255, 255, 255))
-            
-            # 3. 动态旋转的灰色圆环段 (Loading效果)
-            ring_r = main_r * 0.85
-            start_angle = math.degrees(self._phase * 2)
-            draw.arc([cx - ring_r, cy - ring_r, cx + ring_r, cy + ring_r], 
-                    start=start_angle, end=start_angle + 90, fill=(180, 180, 180, 255), width=int(3*scale))
-            
-            draw.arc([cx - ring_r, cy - ring_r, cx + ring_r, cy + ring_r], 
-                    start=start_angle + 180, end=start_angle + 270, fill=(220, 220, 220, 255), width=int(3*scale))
-
-            # 4. 中心装饰
-            center_r = main_r * 0.35
-            # 阴影层
-            draw.ellipse([cx - center_r, cy - center_r + 2*scale, cx + center_r, cy + center_r + 2*scale], fill=(200, 200, 200, 255))
-            # 实体层
-            draw.ellipse([cx - center_r, cy - center_r, cx + center_r, cy + center_r], fill=(245, 245, 245, 255))
-            # 边框
-            draw.ellipse([cx - center_r, cy - center_r, cx + center_r, cy + center_r], outline=(150, 150, 150, 255), width=int(1.5*scale))
-            
-            # 5. 中心呼吸点
-            pulse = (math.sin(self._phase * 2) + 1) / 2
-            dot_r = center_r * 0.4 * (0.8 + 0.2*pulse)
-            draw.ellipse([cx - dot_r, cy - dot_r, cx + dot_r, cy + dot_r], fill=(50, 50, 50, 255))
-
-            self._apply_binary_alpha(image, size)
+            w = int(self.canvas.cget("width"))
+            h = int(self.canvas.cget("height"))
         except Exception:
-            pass
+            return
+
+        skin = self._current_skin_id()
+        center_y = h / 2.0
+        offset = 3 * math.sin(self._phase)
+
+        # 胶囊条静态部分只在状态变化时重建，动画帧只移动装饰线条
+        dock_key = (skin, w, h, bool(highlight))
+        if self._dock_key == dock_key and self._dock_line is not None:
+            try:
+                self.canvas.coords(self._dock_line, w/2, center_y - 10 + offset, w/2, center_y + 10 - offset)
+                return
+            except Exception:
+                pass
 
-    def _draw_docked(self, highlight):
         try:
             self.canvas.delete("all")
         except Exception:
             return
+        self._ball_item = None
+        self._shown_key = None
 
-        w = int(self.canvas.cget("width"))
-        h = int(self.canvas.cget("height"))
-        
-        skin = getattr(self, 'skin', 'future_orb')
-        if skin == 'neon_pulse':
-            color = "#FF00FF" if not highlight else "#FF66FF"
-            bg_color = "#440044" if not highlight else "#660066"
-        elif skin == 'classic_blue':
-            color = "#0066CC" if not highlight else "#3399FF"
-            bg_color = "#003366" if not highlight else "#004488"
-        elif skin == 'minimalist_white':
-            color = "#888888" if not highlight else "#AAAAAA"
-            bg_color = "#FFFFFF" if not highlight else "#F0F0F0"
-        else:
-            color = "#3A7AFE" if not highlight else "#00D2FF"
-            bg_color = "#1B3A8A" if not highlight else "#2457D6"
+        color, bg_color = dock_colors(self._skins.get(skin, {}), highlight)
         
         # 绘制胶囊条
         r = w / 2.0
@@ -1735,9 +1789,8 @@ class FloatingBall:
         self.canvas.create_line(w, r, w, h-r, fill=color, width=2)
         
         # 装饰线条 (呼吸效果)
-        center_y = h / 2.0
-        offset = 3 * math.sin(self._phase)
-        self.canvas.create_line(w/2, center_y - 10 + offset, w/2, center_y + 10 - offset, fill="#FFFFFF", width=2, capstyle="round")
+        self._dock_line = self.canvas.create_line(w/2, center_y - 10 + offset, w/2, center_y + 10 - offset, fill="#FFFFFF", width=2, capstyle="round")
+        self._dock_key = dock_key
 
     def _oval(self, cx, cy, r, outline, width, fill):
         # Unused in new PIL implementation but kept for compatibility if needed
@@ -1812,8 +1865,9 @@ class WallpaperApp:
         self.integrated_features_window = None
         
         # 初始化ALAPI服务
-        self.alapi_manager = ALAPIManager()
+        self.alapi_manager = ALAPIManager(cache_dir=APP_DATA_DIR)
         self.alapi_manager.set_city(service_city)
+        self.alapi_manager.set_rate_limit(self.alapi_rate_per_second, self.alapi_burst)
         if self.api_token:
             self.alapi_manager.set_token(self.api_token)
             self.daily_news_manager.set_token(self.api_token)
@@ -1821,6 +1875,15 @@ class WallpaperApp:
             
         self.alapi_window = None
         self.selected_services = []
+
+        # 天气服务（城市坐标缓存与地名表在各处共用）
+        self.weather_service = WeatherService(cache_dir=APP_DATA_DIR)
+        # 统一天气数据源：open-meteo 优先，失败时切换到 xxapi；侧边栏与集成功能共用缓存
+        self.weather_provider = WeatherProvider(
+            [OpenMeteoBackend(self.weather_service), XxapiBackend()],
+            normalize_city=self.weather_service._normalize_city_name,
+        )
+        self.integrated_features_manager.set_weather_provider(self.weather_provider)
         
         # 初始化日历提醒功能
         self.calendar_reminder_manager = CalendarReminderManager(self.app_data_dir, tk_root=self.root)
@@ -2320,11 +2383,11 @@ class WallpaperApp:
         """显示API Token设置窗口"""
         token_window = ttk.Toplevel(self.root)
         token_window.title("API Token设置")
-        token_window.geometry("550x360")
+        token_window.geometry("550x480")
         token_window.resizable(False, False)
         
         # 窗口居中
-        self.center_window(token_window, 550, 360)
+        self.center_window(token_window, 550, 480)
         
         # 设置窗口图标
         try:
@@ -2359,6 +2422,27 @@ class WallpaperApp:
                 
         show_btn = ttk.Button(token_frame, text="显示", command=toggle_show, bootstyle="link-secondary")
         show_btn.pack(side=RIGHT, padx=(5, 0))
+
+        # 限流与今日用量
+        quota_frame = ttk.Labelframe(main_frame, text="请求限流", padding=15)
+        quota_frame.pack(fill=X, pady=10)
+
+        rate_row = ttk.Frame(quota_frame)
+        rate_row.pack(fill=X)
+        ttk.Label(rate_row, text="每秒请求数:").pack(side=LEFT)
+        rate_var = tk.DoubleVar(value=getattr(self, "alapi_rate_per_second", ALAPIManager.DEFAULT_RATE))
+        ttk.Spinbox(rate_row, from_=0.1, to=20, increment=0.5, textvariable=rate_var, width=6).pack(side=LEFT, padx=(5, 20))
+        ttk.Label(rate_row, text="突发上限:").pack(side=LEFT)
+        burst_var = tk.IntVar(value=getattr(self, "alapi_burst", ALAPIManager.DEFAULT_BURST))
+        ttk.Spinbox(rate_row, from_=1, to=50, increment=1, textvariable=burst_var, width=6).pack(side=LEFT, padx=(5, 0))
+
+        usage_text = "今日用量: --"
+        if hasattr(self, 'alapi_manager'):
+            usage = self.alapi_manager.get_usage()
+            usage_text = f"今日用量: 已请求 {usage['requests']} 次，限流拦截 {usage['throttled']} 次"
+            if usage.get("quota_exhausted"):
+                usage_text += "（今日额度已用完）"
+        ttk.Label(quota_frame, text=usage_text, font=("Microsoft YaHei", 9), bootstyle=SECONDARY).pack(anchor=W, pady=(8, 0))
         
         # 说明文字
         info_frame = ttk.Frame(main_frame)
@@ -2373,10 +2457,16 @@ class WallpaperApp:
         def save_and_close():
             token = token_entry.get().strip()
             self.api_token = token
+            try:
+                self.alapi_rate_per_second = max(0.1, float(rate_var.get()))
+                self.alapi_burst = max(1, int(burst_var.get()))
+            except (tk.TclError, ValueError):
+                pass
             
             # 更新所有管理器的Token
             if hasattr(self, 'alapi_manager'):
                 self.alapi_manager.set_token(token)
+                self.alapi_manager.set_rate_limit(self.alapi_rate_per_second, self.alapi_burst)
             if hasattr(self, 'daily_news_manager'):
                 self.daily_news_manager.set_token(token)
             if hasattr(self, 'integrated_features_manager'):
@@ -2766,21 +2856,44 @@ class WallpaperApp:
         self.sidebar_weather_temp.bind("<Button-1>", on_weather_click)
         self.sidebar_weather_city.bind("<Button-1>", on_weather_click)
         
-        # 初始加载天气
+        # 初始加载天气，之后定时刷新
         self.root.after(1000, self.refresh_sidebar_weather)
+        self.root.after(SIDEBAR_WEATHER_REFRESH_MINUTES * 60 * 1000, self._sidebar_weather_tick)
+
+    def show_multi_city_weather(self):
+        """显示多城市天气面板"""
+        def on_cities_changed(cities):
+            self.weather_watch_cities = cities
+            self.save_config()
+
+        if not getattr(self, "multi_city_weather_window", None):
+            self.multi_city_weather_window = MultiCityWeatherWindow(
+                self.root, self.weather_service, getattr(self, "weather_watch_cities", []),
+                on_cities_changed=on_cities_changed, ui_after=self.safe_after)
+        self.multi_city_weather_window.show()
+
+    def _sidebar_weather_tick(self):
+        """定时刷新侧边栏天气，让当前温度随整点更新"""
+        try:
+            self.refresh_sidebar_weather()
+        finally:
+            self.root.after(SIDEBAR_WEATHER_REFRESH_MINUTES * 60 * 1000, self._sidebar_weather_tick)
 
     def refresh_sidebar_weather(self, force_locate=False):
         """刷新侧边栏天气"""
         def _load():
             try:
-                service = WeatherService()
+                service = self.weather_service
                 city = getattr(self, "weather_city", "北京")
                 is_auto = (not city) or (city == "自动")
                 
                 # 如果是"自动"或者强制定位，则获取IP位置
                 if is_auto or force_locate:
-                    self.safe_after(0, lambda: self.sidebar_weather_city.config(text="定位中..."))
-                    loc_city = service.get_location_by_ip()
+                    # 网络环境没变时直接用缓存的定位结果；点击天气强制重新定位
+                    loc_city = None if force_locate else service.get_cached_location()
+                    if not loc_city:
+                        self.safe_after(0, lambda: self.sidebar_weather_city.config(text="定位中..."))
+                        loc_city = service.locate(force=True)
                     if loc_city:
                         city = loc_city
                         if is_auto:
@@ -2799,7 +2912,7 @@ class WallpaperApp:
                             setattr(self, "_last_auto_city", None)
                         city = "北京"
                 
-                result = service.get_weather(city)
+                result = self.weather_provider.get_weather(city)
 
                 def _update():
                     if "error" in result:
@@ -2966,8 +3079,9 @@ class WallpaperApp:
         
         # 初始化管理器
         if not hasattr(self, 'alapi_manager'):
-             self.alapi_manager = ALAPIManager()
+             self.alapi_manager = ALAPIManager(cache_dir=APP_DATA_DIR)
              self.alapi_manager.set_token(self.api_token)
+             self.alapi_manager.set_rate_limit(self.alapi_rate_per_second, self.alapi_burst)
              
         # 使用 InfoPushWidget
         self.info_push_widget = InfoPushWidget(page, self.alapi_manager, on_settings_click=None, ui_after=self.safe_after)
@@ -3090,9 +3204,16 @@ class WallpaperApp:
         
         # 城市设置
         ttk.Label(push_frame, text="天气城市:").pack(side=LEFT, padx=(20, 5))
-        self.city_entry = ttk.Entry(push_frame, width=10)
+        self.city_entry = ttk.Combobox(push_frame, width=10, values=["自动"])
         self.city_entry.insert(0, getattr(self, 'weather_city', '自动'))
         self.city_entry.pack(side=LEFT, padx=5)
+
+        def update_city_suggestions(event=None):
+            # 输入时按内置地名表和已解析城市联想
+            if event is not None and event.keysym in ("Return", "Up", "Down", "Escape", "Tab"):
+                return
+            text = self.city_entry.get().strip()
+            self.city_entry.configure(values=["自动"] + self.weather_service.complete_city(text))
         
         def save_city_setting(event=None):
             new_city = self.city_entry.get().strip()
@@ -3110,6 +3231,11 @@ class WallpaperApp:
         
         self.city_entry.bind("<FocusOut>", save_city_setting)
         self.city_entry.bind("<Return>", save_city_setting)
+        self.city_entry.bind("<<ComboboxSelected>>", save_city_setting)
+        self.city_entry.bind("<KeyRelease>", update_city_suggestions)
+
+        ttk.Button(push_frame, text="多城市天气", command=self.show_multi_city_weather,
+                  bootstyle="info-outline").pack(side=LEFT, padx=5)
         
         # Compatibility aliases
         self.auto_news_var = self.auto_info_push_var
@@ -3663,10 +3789,13 @@ class WallpaperApp:
             self.auto_screensaver_enabled = config.get("auto_screensaver_enabled", False)
             self.idle_time_minutes = config.get("idle_time_minutes", 5)
             self.api_token = config.get("api_token", "")  # 添加API Token配置
+            self.alapi_rate_per_second = config.get("alapi_rate_per_second", ALAPIManager.DEFAULT_RATE)
+            self.alapi_burst = config.get("alapi_burst", ALAPIManager.DEFAULT_BURST)
             self.current_theme = config.get("current_theme", "litera")  # 读取主题配置
             self.auto_wallpaper_change = config.get("auto_wallpaper_change", False)
             self.wallpaper_interval_minutes = config.get("wallpaper_interval_minutes", 30)
             self.weather_city = config.get("weather_city", "自动")
+            self.weather_watch_cities = config.get("weather_watch_cities", [])
             self.ai_base_url = config.get("ai_base_url", getattr(self, "ai_base_url", "https://api.openai.com/v1"))
             self.ai_api_key = config.get("ai_api_key", "")
             self.ai_model = config.get("ai_model", getattr(self, "ai_model", "gpt-4o-mini"))
@@ -3679,10 +3808,13 @@ class WallpaperApp:
             self.auto_screensaver_enabled = False
             self.idle_time_minutes = 5
             self.api_token = ""  # 默认为空
+            self.alapi_rate_per_second = ALAPIManager.DEFAULT_RATE
+            self.alapi_burst = ALAPIManager.DEFAULT_BURST
             self.auto_wallpaper_change = False
             self.wallpaper_interval_minutes = 30
             self.current_theme = "litera"
             self.weather_city = "自动"
+            self.weather_watch_cities = []
             self.ai_base_url = getattr(self, "ai_base_url", "https://api.openai.com/v1")
             self.ai_api_key = ""
             self.ai_model = getattr(self, "ai_model", "gpt-4o-mini")
@@ -3703,10 +3835,13 @@ class WallpaperApp:
                 "auto_screensaver_enabled": self.auto_screensaver_enabled,
                 "idle_time_minutes": self.idle_time_minutes,
                 "api_token": self.api_token,  # 添加API Token保存
+                "alapi_rate_per_second": getattr(self, "alapi_rate_per_second", ALAPIManager.DEFAULT_RATE),
+                "alapi_burst": getattr(self, "alapi_burst", ALAPIManager.DEFAULT_BURST),
                 "auto_wallpaper_change": getattr(self, "auto_wallpaper_change", False),
                 "wallpaper_interval_minutes": getattr(self, "wallpaper_interval_minutes", 30),
                 "current_theme": getattr(self, "current_theme", "litera"),
                 "weather_city": getattr(self, 'weather_city', '自动'),
+                "weather_watch_cities": getattr(self, 'weather_watch_cities', []),
                 "ai_base_url": getattr(self, "ai_base_url", "https://api.openai.com/v1"),
                 "ai_api_key": getattr(self, "ai_api_key", ""),
                 "ai_model": getattr(self, "ai_model", "gpt-4o-mini"),
@@ -4137,6 +4272,11 @@ class WallpaperApp:
                 
                 # 解析时间格式 HH:MM
                 hour, minute = map(int, push_time.split(':'))
+
+                # 推送前提前在后台准备好今天的早报
+                if self.daily_news_manager.needs_prefetch(push_time):
+                    self.daily_news_manager.prefetch_async()
+
                 current_time = time.localtime()
                 current_hour = current_time.tm_hour
                 current_minute = current_time.tm_min
@@ -4161,29 +4301,38 @@ class WallpaperApp:
             self.news_timer = None
 
     def show_daily_news_notification(self):
-        """显示早报推送通知"""
+        """显示早报推送通知（只读内存，不在Tk线程上联网）"""
         try:
-            news_data = self.daily_news_manager.get_cached_news()
+            news_data = self.daily_news_manager.get_news_nowait()
             if news_data and news_data.get('news'):
-                # 显示早报窗口
-                self.show_daily_news()
-                
-                # 显示系统通知
-                if hasattr(self, 'tray_icon') and self.tray_icon:
-                    self.tray_icon.notify("每日早报", "今日早报已更新，点击查看详情")
-                else:
-                    self.show_center_messagebox_dialog("每日早报", "今日早报已更新！", "info")
+                self._notify_daily_news()
+                return
+
+            # 预取尚未就绪：交给后台获取，限定时间内完成才补发通知
+            deadline = time.time() + NEWS_NOTIFY_FALLBACK_SECONDS
+
+            def on_fetched(result):
+                if result.get("success") and time.time() <= deadline:
+                    self.safe_after(0, self._notify_daily_news)
+
+            self.daily_news_manager.prefetch_async(on_fetched)
+        except Exception as e:
+            print(f"显示早报通知失败: {e}")
+
+    def _notify_daily_news(self):
+        try:
+            news_data = self.daily_news_manager.get_news_nowait()
+            if not news_data or not news_data.get('news'):
+                return
+
+            # 显示早报窗口
+            self.show_daily_news()
+            
+            # 显示系统通知
+            if hasattr(self, 'tray_icon') and self.tray_icon:
+                self.tray_icon.notify("每日早报", "今日早报已更新，点击查看详情")
             else:
-                # 如果没有缓存数据，尝试获取
-                self.refresh_daily_news()
-                # 获取后再次尝试显示
-                news_data = self.daily_news_manager.get_cached_news()
-                if news_data and news_data.get('news'):
-                    self.show_daily_news()
-                    if hasattr(self, 'tray_icon') and self.tray_icon:
-                        self.tray_icon.notify("每日早报", "今日早报已更新，点击查看详情")
-                    else:
-                        self.show_center_messagebox_dialog("每日早报", "今日早报已更新！", "info")
+                self.show_center_messagebox_dialog("每日早报", "今日早报已更新！", "info")
         except Exception as e:
             print(f"显示早报通知失败: {e}")
 
@@ -4412,8 +4561,11 @@ class WallpaperApp:
                     "auto_screensaver_enabled": self.auto_screensaver_enabled,
                     "idle_time_minutes": self.idle_time_minutes,
                     "api_token": self.api_token,
+                    "alapi_rate_per_second": getattr(self, "alapi_rate_per_second", ALAPIManager.DEFAULT_RATE),
+                    "alapi_burst": getattr(self, "alapi_burst", ALAPIManager.DEFAULT_BURST),
                     "current_theme": getattr(self, "current_theme", "litera"),
                     "weather_city": getattr(self, "weather_city", "自动"),
+                    "weather_watch_cities": getattr(self, "weather_watch_cities", []),
                     "ai_base_url": getattr(self, "ai_base_url", "https://api.openai.com/v1"),
                     "ai_api_key": getattr(self, "ai_api_key", ""),
                     "ai_model": getattr(self, "ai_model", "gpt-4o-mini"),
@@ -4540,7 +4692,10 @@ class WallpaperApp:
                 self.auto_screensaver_enabled = main_config.get("auto_screensaver_enabled", self.auto_screensaver_enabled)
                 self.idle_time_minutes = main_config.get("idle_time_minutes", self.idle_time_minutes)
                 self.api_token = main_config.get("api_token", self.api_token)
+                self.alapi_rate_per_second = main_config.get("alapi_rate_per_second", getattr(self, "alapi_rate_per_second", ALAPIManager.DEFAULT_RATE))
+                self.alapi_burst = main_config.get("alapi_burst", getattr(self, "alapi_burst", ALAPIManager.DEFAULT_BURST))
                 self.weather_city = main_config.get("weather_city", getattr(self, "weather_city", "自动"))
+                self.weather_watch_cities = main_config.get("weather_watch_cities", getattr(self, "weather_watch_cities", []))
                 self.ai_base_url = main_config.get("ai_base_url", getattr(self, "ai_base_url", "https://api.openai.com/v1"))
                 self.ai_api_key = main_config.get("ai_api_key", getattr(self, "ai_api_key", ""))
                 self.ai_model = main_config.get("ai_model", getattr(self, "ai_model", "gpt-4o-mini"))
@@ -4574,6 +4729,9 @@ class WallpaperApp:
                 token = alapi_config.get("token", "")
                 if token:
                     self.alapi_manager.set_token(token)
+            if hasattr(self, 'alapi_manager'):
+                self.alapi_manager.set_rate_limit(getattr(self, "alapi_rate_per_second", ALAPIManager.DEFAULT_RATE),
+                                                  getattr(self, "alapi_burst", ALAPIManager.DEFAULT_BURST))
             
             # 恢复集成功能配置
             if "integrated_features_config" in config_data and hasattr(self, 'integrated_features_manager'):
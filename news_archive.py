@@ -0,0 +1,175 @@
+"""
+早报归档 - 按月分段的追加式压缩 NDJSON，配合 日期→偏移 索引按天随机读取
+"""
+import os
+import json
+import gzip
+import zlib
+import glob
+import hashlib
+import threading
+from datetime import datetime, timedelta
+
+
+class NewsArchive:
+    """每天的早报作为一条 NDJSON 记录，单独压缩成一个 gzip 成员追加到当月分段文件末尾。
+
+    多个 gzip 成员首尾相接仍是合法的 gzip 文件；索引记录每天所在分段、偏移和长度，
+    读取某一天只需 seek 到偏移处解压这一段，不必解析整个归档。
+    """
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, archive_dir, retention_days=90):
+        self.archive_dir = archive_dir
+        self.retention_days = int(retention_days)
+        self.index_path = os.path.join(archive_dir, self.INDEX_NAME)
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _segment_name(self, date_str):
+        return f"news-{date_str[:7]}.ndjson.gz"
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        index = None
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f).get("dates")
+        except Exception as e:
+            print(f"读取早报归档索引失败: {e}")
+        if isinstance(index, dict):
+            self._index = index
+        else:
+            self._index = self._rebuild_index()
+            self._apply_retention()
+        return self._index
+
+    def _save_index(self):
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "dates": self._index}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"保存早报归档索引失败: {e}")
+
+    def _rebuild_index(self):
+        """索引丢失或损坏时，逐个扫描分段中的 gzip 成员重建"""
+        index = {}
+        for path in sorted(glob.glob(os.path.join(self.archive_dir, "news-*.ndjson.gz"))):
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except Exception:
+                continue
+            offset = 0
+            while offset < len(data):
+                decoder = zlib.decompressobj(wbits=31)
+                try:
+                    raw = decoder.decompress(data[offset:])
+                except zlib.error:
+                    break
+                if not decoder.eof:
+                    break
+                length = len(data) - offset - len(decoder.unused_data)
+                try:
+                    record = json.loads(raw.decode("utf-8"))
+                    index[record["date"]] = {
+                        "segment": os.path.basename(path),
+                        "offset": offset,
+                        "length": length,
+                        "content": self._content_digest(record.get("source"), record.get("news", [])),
+                    }
+                except Exception:
+                    pass
+                offset += length
+        return index
+
+    def _content_digest(self, source, news):
+        # 摘要不含保存时间，避免同样的内容重复追加
+        raw = json.dumps({"source": source, "news": news}, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def append(self, news_data):
+        """追加一天的早报；同一天内容未变化则跳过，变化则追加新记录并指向它"""
+        date_str = (news_data or {}).get("date")
+        if not date_str:
+            return False
+
+        record = {
+            "date": date_str,
+            "source": news_data.get("source"),
+            "news": news_data.get("news", []),
+            "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        digest = self._content_digest(record["source"], record["news"])
+        payload = gzip.compress((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(date_str)
+            if entry and entry.get("content") == digest:
+                return False
+
+            segment = self._segment_name(date_str)
+            path = os.path.join(self.archive_dir, segment)
+            try:
+                os.makedirs(self.archive_dir, exist_ok=True)
+                with open(path, "ab") as f:
+                    offset = f.tell()
+                    f.write(payload)
+            except Exception as e:
+                print(f"写入早报归档失败: {e}")
+                return False
+
+            index[date_str] = {"segment": segment, "offset": offset, "length": len(payload), "content": digest}
+            self._apply_retention()
+            self._save_index()
+            return True
+
+    def load(self, date_str):
+        """按日期读取一天的早报（只解压该天对应的一段）"""
+        with self._lock:
+            entry = self._load_index().get(date_str)
+        if not entry:
+            return None
+        try:
+            with open(os.path.join(self.archive_dir, entry["segment"]), "rb") as f:
+                f.seek(entry["offset"])
+                raw = gzip.decompress(f.read(entry["length"]))
+            record = json.loads(raw.decode("utf-8"))
+            return {"news": record.get("news", []), "date": record.get("date"), "source": record.get("source")}
+        except Exception as e:
+            print(f"读取早报归档失败 {date_str}: {e}")
+            return None
+
+    def dates(self):
+        """已归档的日期，新的在前"""
+        with self._lock:
+            return sorted(self._load_index().keys(), reverse=True)
+
+    def set_retention(self, days):
+        with self._lock:
+            self.retention_days = max(1, int(days))
+            self._load_index()
+            self._apply_retention()
+            self._save_index()
+
+    def _apply_retention(self):
+        """丢弃超出保留期的日期；整月都已过期的分段直接删除"""
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        for date_str in [d for d in self._index if d < cutoff]:
+            del self._index[date_str]
+
+        live_segments = {entry["segment"] for entry in self._index.values()}
+        for path in glob.glob(os.path.join(self.archive_dir, "news-*.ndjson.gz")):
+            name = os.path.basename(path)
+            if name not in live_segments and name[5:12] < cutoff[:7]:
+                try:
+                    os.remove(path)
+                except Exception:
+                    pass
@@ -0,0 +1,180 @@
+"""
+早报去重 - 字符双字组(bigram)倒排索引取候选，按包含度、数字和消息来源确认近似重复
+"""
+import os
+import re
+import json
+import threading
+from collections import Counter, namedtuple
+
+SHINGLE_SIZE = 2 # 标题很短，用双字 shingle 才有足够的特征
+MIN_CONTAINMENT = 0.5 # 共同 shingle 占较短标题的比例，校准数据见 benchmarks/check_news_dedup.py
+_NOISE_RE = re.compile(r'[\W_]+')
+# 阿拉伯数字，以及"二十一号""第十四届"这类带量词的中文序数
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?|[零一二三四五六七八九十百千]+(?=[号次届期批组])')
+# 句首"外交部：""北京："这类消息来源
+_SOURCE_RE = re.compile(r'^([^：:，,。\s]{2,10})[：:]')
+
+Headline = namedtuple("Headline", "shingles numbers source")
+
+
+def shingles(text):
+    """去掉标点空白后的字符 shingle 集合"""
+    normalized = _NOISE_RE.sub('', (text or '').lower())
+    if len(normalized) <= SHINGLE_SIZE:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1))
+
+
+def features(text):
+    text = str(text or '').strip()
+    match = _SOURCE_RE.match(text)
+    return Headline(
+        shingles(text),
+        frozenset(_NUMBER_RE.findall(text)),
+        shingles(match.group(1)) if match else None,
+    )
+
+
+def containment(a, b):
+    """共同 shingle 数 / 较短一方的 shingle 数；改写、删减措辞时比 Jaccard 稳定"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def is_near_duplicate(a, b, min_containment=MIN_CONTAINMENT):
+    """a、b 为 features() 的结果。
+
+    除了包含度达标，还要求一方的数字是另一方的子集（CPI 0.7% 与 PPI 2.2% 措辞几乎相同），
+    且两边都写明来源时来源要有共同字组（"外交部：…"与"商务部：…"套话相同但不是同一条）。
+    """
+    if containment(a.shingles, b.shingles) < min_containment:
+        return False
+    if not (a.numbers <= b.numbers or b.numbers <= a.numbers):
+        return False
+    if a.source and b.source and not (a.source & b.source):
+        return False
+    return True
+
+
+class HeadlineIndex:
+    """按日期保存标题，shingle -> 标题编号 建立倒排。
+
+    包含度达标的两条标题必然有共同 shingle，所以从倒排里取到的候选不会漏掉真正的重复，
+    再按共同 shingle 计数筛掉包含度不够的，只对剩下的少数候选做完整判定。
+    """
+
+    VERSION = 2
+
+    def __init__(self, path, min_containment=MIN_CONTAINMENT):
+        self.path = path
+        self.min_containment = float(min_containment)
+        self._lock = threading.Lock()
+        self._by_date = {} # date -> [标题编号, ...]
+        self._entries = {} # 标题编号 -> (文本, Headline, date)
+        self._postings = {} # shingle -> {标题编号, ...}
+        self._next_id = 0
+        self._load()
+
+    def _insert(self, text, date_str):
+        entry_id = self._next_id
+        self._next_id += 1
+        headline = features(text)
+        self._entries[entry_id] = (text, headline, date_str)
+        for shingle in headline.shingles:
+            self._postings.setdefault(shingle, set()).add(entry_id)
+        return entry_id
+
+    def _remove_date(self, date_str):
+        for entry_id in self._by_date.pop(date_str, []):
+            _, headline, _ = self._entries.pop(entry_id)
+            for shingle in headline.shingles:
+                posting = self._postings.get(shingle)
+                if posting is not None:
+                    posting.discard(entry_id)
+                    if not posting:
+                        del self._postings[shingle]
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # 旧版本存的是 SimHash 指纹，无法换算，丢弃后由调用方从归档重建
+                if data.get("version") != self.VERSION:
+                    return
+                for date_str, texts in (data.get("dates") or {}).items():
+                    self._by_date[date_str] = [self._insert(text, date_str) for text in texts if text]
+        except Exception as e:
+            print(f"读取标题索引失败: {e}")
+
+    def save(self):
+        with self._lock:
+            data = {date_str: [self._entries[entry_id][0] for entry_id in ids]
+                    for date_str, ids in self._by_date.items()}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "dates": data}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"保存标题索引失败: {e}")
+
+    def has_date(self, date_str):
+        with self._lock:
+            return date_str in self._by_date
+
+    def indexed_dates(self):
+        with self._lock:
+            return set(self._by_date)
+
+    def add_day(self, date_str, items):
+        """登记一天的（已清理的）标题，重复登记同一天会替换旧数据"""
+        with self._lock:
+            self._remove_date(date_str)
+            self._by_date[date_str] = [self._insert(item, date_str) for item in items if item]
+
+    def prune(self, keep_dates):
+        """移除不在 keep_dates 中的日期（与归档保留期同步）"""
+        keep_dates = set(keep_dates)
+        with self._lock:
+            for date_str in [d for d in self._by_date if d not in keep_dates]:
+                self._remove_date(date_str)
+
+    def find_earlier(self, headline, before_date):
+        """查找 before_date 之前最早出现过的相似标题，返回其日期或 None"""
+        if not headline.shingles:
+            return None
+        found = None
+        with self._lock:
+            shared = Counter()
+            for shingle in headline.shingles:
+                shared.update(self._postings.get(shingle, ()))
+            for entry_id, count in shared.items():
+                _, candidate, date_str = self._entries[entry_id]
+                if date_str >= before_date or (found and date_str >= found):
+                    continue
+                # 共同 shingle 数已知，包含度不够的不必再做集合运算
+                if count < self.min_containment * min(len(candidate.shingles), len(headline.shingles)):
+                    continue
+                if is_near_duplicate(headline, candidate, self.min_containment):
+                    found = date_str
+        return found
+
+    def annotate(self, date_str, items, mark_repeats=True):
+        """同一天内近似重复的条目只保留第一条；可选标出往日已出现过的条目。
+
+        返回 [(标题, 首次出现日期或None), ...]
+        """
+        kept = []
+        seen = []
+        for item in items:
+            headline = features(item)
+            if any(is_near_duplicate(headline, other, self.min_containment) for other in seen):
+                continue
+            seen.append(headline)
+            earlier = self.find_earlier(headline, date_str) if mark_repeats else None
+            kept.append((item, earlier))
+        return kept
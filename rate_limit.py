@@ -0,0 +1,181 @@
+"""
+接口限流 - 客户端令牌桶、限流/额度响应后的自适应退避，以及按天持久化的用量统计
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime, timedelta
+
+
+class TokenBucket:
+    """令牌桶：每秒补充 rate 个令牌，最多积攒 capacity 个"""
+
+    def __init__(self, rate, capacity):
+        self.rate = max(0.01, float(rate))
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def configure(self, rate, capacity):
+        with self._lock:
+            self._refill()
+            self.rate = max(0.01, float(rate))
+            self.capacity = max(1, int(capacity))
+            self._tokens = min(self._tokens, self.capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """取一个令牌；令牌不足时等待，超过 timeout 秒仍取不到返回 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class QuotaTracker:
+    """按 Token 记录当天请求次数，并在遇到限流/额度不足时退避。
+
+    限流（HTTP 429、"请求频繁"类消息）按指数退避，优先采用 Retry-After；
+    额度用尽则暂停到次日零点。统计保存在 usage_file，跨天自动清零。
+    """
+
+    MIN_BACKOFF = 5 # 首次退避(秒)
+    MAX_BACKOFF = 300 # 退避上限(秒)
+
+    RATE_LIMIT_HINTS = ("频繁", "太快", "限流", "qps", "rate limit", "too many")
+    QUOTA_HINTS = ("次数", "额度", "余额", "用完", "用尽", "上限", "quota")
+
+    def __init__(self, usage_file=None):
+        self.usage_file = usage_file
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock() # 串行化写盘，先拿到锁的先取快照，文件不会被旧快照覆盖
+        self._usage = {} # token摘要 -> {"date", "requests", "throttled", "quota_exhausted"}
+        self._backoff = {} # token摘要 -> (暂停到的时间戳, 当前退避秒数)
+        self._load()
+
+    def _key(self, token):
+        return hashlib.sha1((token or "").encode("utf-8")).hexdigest()[:12]
+
+    def _load(self):
+        if not self.usage_file:
+            return
+        try:
+            if os.path.exists(self.usage_file):
+                with open(self.usage_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._usage = data
+        except Exception as e:
+            print(f"读取接口用量统计失败: {e}")
+
+    def _save(self):
+        if not self.usage_file:
+            return
+        with self._save_lock:
+            with self._lock:
+                snapshot = {key: dict(entry) for key, entry in self._usage.items()}
+            try:
+                os.makedirs(os.path.dirname(self.usage_file), exist_ok=True)
+                tmp_path = self.usage_file + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp_path, self.usage_file)
+            except Exception as e:
+                print(f"保存接口用量统计失败: {e}")
+
+    def _today_entry(self, token):
+        """调用方需持有锁"""
+        key = self._key(token)
+        today = datetime.now().strftime("%Y-%m-%d")
+        entry = self._usage.get(key)
+        if not entry or entry.get("date") != today:
+            entry = {"date": today, "requests": 0, "throttled": 0, "quota_exhausted": False}
+            self._usage[key] = entry
+        return entry
+
+    def usage(self, token):
+        """当天用量: {"date", "requests", "throttled", "quota_exhausted"}"""
+        with self._lock:
+            return dict(self._today_entry(token))
+
+    def blocked_for(self, token):
+        """仍需暂停的秒数，0 表示可以请求"""
+        now = time.time()
+        with self._lock:
+            until, _ = self._backoff.get(self._key(token), (0, 0))
+            if self._today_entry(token).get("quota_exhausted"):
+                # 额度用尽的标记会持久化，重启后仍暂停到次日零点
+                tomorrow = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+                until = max(until, tomorrow.timestamp())
+        return max(0.0, until - now)
+
+    def record_request(self, token):
+        with self._lock:
+            self._today_entry(token)["requests"] += 1
+        self._save()
+
+    def record_success(self, token):
+        with self._lock:
+            key = self._key(token)
+            if key in self._backoff:
+                until, _ = self._backoff[key]
+                self._backoff[key] = (until, 0)
+
+    def record_throttled(self, token):
+        """本地令牌不足而未发出的请求"""
+        with self._lock:
+            self._today_entry(token)["throttled"] += 1
+        self._save()
+
+    def classify(self, status_code, code=None, message=""):
+        """判断响应是否为限流或额度不足：返回 "rate"、"quota" 或 None"""
+        text = str(message or "").lower()
+        # 先认限流：误判为额度用尽会一直停到次日
+        if any(hint in text for hint in self.RATE_LIMIT_HINTS):
+            return "rate"
+        if any(hint in text for hint in self.QUOTA_HINTS):
+            return "quota"
+        if status_code == 429 or code == 429:
+            return "rate"
+        return None
+
+    def record_limited(self, token, kind, retry_after=None):
+        """服务端返回限流/额度不足后登记退避，返回暂停秒数"""
+        now = time.time()
+        with self._lock:
+            key = self._key(token)
+            entry = self._today_entry(token)
+            if kind == "quota":
+                entry["quota_exhausted"] = True
+                tomorrow = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+                delay = tomorrow.timestamp() - now
+                step = self.MAX_BACKOFF
+            else:
+                _, step = self._backoff.get(key, (0, 0))
+                step = min(self.MAX_BACKOFF, max(self.MIN_BACKOFF, step * 2))
+                delay = step
+                try:
+                    if retry_after:
+                        delay = max(float(retry_after), 0)
+                except (TypeError, ValueError):
+                    pass
+            self._backoff[key] = (now + delay, step)
+        self._save()
+        return delay
@@ -79,6 +79,10 @@ class ScreensaverManager:
             pass
         return max(0.0, time.time() - self.last_activity_time)
 
+    def get_idle_seconds(self):
+        """用户空闲秒数（Windows下为系统级键鼠空闲时间）"""
+        return self._get_idle_seconds()
+
     def start_idle_check(self):
         """开始空闲检测"""
         if self.idle_check_timer:
@@ -0,0 +1,35 @@
+"""
+文本规范化 - 早报等列表条目的序号清理，供各模块共用
+"""
+import re
+
+# 各种序号格式，顺序即原先逐条 re.sub 的顺序
+_SERIAL_PATTERNS = [
+    r'(?:\s*\d+\s*[.、）)】]\s*){1,3}',  # 连续多层序号 "1. 2、"
+    r'\d+[.、）)】]\s*',                # 1. 2、 3） 4) 5】
+    r'[\(（]\d+[\)）]\s*',              # (1) （2）
+    r'【\d+】\s*',                     # 【1】
+    r'[•·▪▫◦‣⁃]\s*',                  # 各种点符号
+    r'\d+\s*[.、）)】]\s*',            # 数字后面有空格的情况
+    r'\s*\d+[.、）)】]\s*',            # 前面有空格的情况
+    r'第\d+[条项]\s*',                 # 第1条 第2项
+    r'\d+\s+',                        # 纯数字后面跟空格
+    r'(?:\(\d+\)|（\d+）)\s*',
+]
+
+# 锚定开头、每个分支可选：一次匹配等价于按顺序把上面的模式各执行一遍
+SERIAL_PREFIX_RE = re.compile('^' + ''.join(f'(?:{p})?' for p in _SERIAL_PATTERNS))
+
+
+def clean_text(text):
+    """彻底清理文本开头的序号（可叠加多层），反复应用直到不再变化"""
+    if not text:
+        return ""
+
+    clean = text.strip()
+    while True:
+        stripped = SERIAL_PREFIX_RE.sub('', clean, count=1).strip()
+        # 没有变化说明已到不动点；有变化则必然变短，因此一定会结束
+        if stripped == clean:
+            return clean
+        clean = stripped
@@ -0,0 +1,153 @@
+"""
+多城市天气面板 - 关注的城市一次请求批量刷新
+"""
+import threading
+from datetime import datetime
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from ttkbootstrap.scrolled import ScrolledFrame
+
+
+class MultiCityWeatherWindow:
+    """关注城市的天气列表：增删城市、一键刷新（所有城市合并为一次预报请求）"""
+
+    MAX_CITIES = 20
+
+    def __init__(self, parent, weather_service, cities=None, on_cities_changed=None, ui_after=None):
+        self.parent = parent
+        self.weather_service = weather_service
+        self.cities = list(cities or [])
+        self.on_cities_changed = on_cities_changed
+        self.ui_after = ui_after
+        self.window = None
+        self._load_generation = 0 # 每次刷新递增，丢弃过期刷新的结果
+
+    def _ui(self, ms, callback):
+        if self.ui_after:
+            try:
+                self.ui_after(ms, callback)
+                return
+            except Exception:
+                pass
+        try:
+            if self.window and self.window.winfo_exists():
+                self.window.after(ms, callback)
+        except Exception:
+            pass
+
+    def show(self):
+        if self.window and self.window.winfo_exists():
+            self.window.deiconify()
+            self.window.lift()
+            return
+
+        self.window = ttk.Toplevel(self.parent)
+        self.window.title("多城市天气")
+        self.window.geometry("520x560")
+
+        main_frame = ttk.Frame(self.window, padding=15)
+        main_frame.pack(fill=BOTH, expand=YES)
+
+        add_frame = ttk.Frame(main_frame)
+        add_frame.pack(fill=X, pady=(0, 10))
+        ttk.Label(add_frame, text="添加城市:").pack(side=LEFT)
+        self.city_input = ttk.Combobox(add_frame, width=16)
+        self.city_input.pack(side=LEFT, padx=5)
+        self.city_input.bind("<KeyRelease>", self._update_suggestions)
+        self.city_input.bind("<Return>", lambda e: self.add_city())
+        ttk.Button(add_frame, text="添加", command=self.add_city, bootstyle="success-outline").pack(side=LEFT, padx=5)
+        ttk.Button(add_frame, text="🔄 刷新", command=lambda: self.refresh(force=True),
+                  bootstyle="info-outline").pack(side=RIGHT)
+
+        self.list_frame = ScrolledFrame(main_frame, autohide=True)
+        self.list_frame.pack(fill=BOTH, expand=YES)
+
+        self.status_label = ttk.Label(main_frame, text="", font=("Microsoft YaHei", 9), foreground="gray")
+        self.status_label.pack(anchor=W, pady=(8, 0))
+
+        self.refresh()
+
+    def _update_suggestions(self, event=None):
+        if event is not None and event.keysym in ("Return", "Up", "Down", "Escape", "Tab"):
+            return
+        self.city_input.configure(values=self.weather_service.complete_city(self.city_input.get().strip()))
+
+    def add_city(self):
+        city = self.city_input.get().strip()
+        if not city or city in self.cities:
+            return
+        if len(self.cities) >= self.MAX_CITIES:
+            self.status_label.config(text=f"最多关注 {self.MAX_CITIES} 个城市")
+            return
+        self.cities.append(city)
+        self.city_input.delete(0, END)
+        self._cities_changed()
+        self.refresh()
+
+    def remove_city(self, city):
+        if city in self.cities:
+            self.cities.remove(city)
+            self._cities_changed()
+            self.refresh()
+
+    def _cities_changed(self):
+        if self.on_cities_changed:
+            try:
+                self.on_cities_changed(list(self.cities))
+            except Exception as e:
+                print(f"保存关注城市失败: {e}")
+
+    def refresh(self, force=False):
+        """后台批量获取所有关注城市的天气"""
+        self._load_generation += 1
+        generation = self._load_generation
+        cities = list(self.cities)
+        if not cities:
+            self._render([], [])
+            return
+        self.status_label.config(text="正在获取天气...")
+
+        def worker():
+            try:
+                results = self.weather_service.get_weather_many(cities, force=force)
+            except Exception as e:
+                results = [{"city": city, "error": str(e)} for city in cities]
+            if generation == self._load_generation:
+                self._ui(0, lambda: self._render(cities, results))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _render(self, cities, results):
+        if not (self.window and self.window.winfo_exists()):
+            return
+        container = self.list_frame.container
+        for child in container.winfo_children():
+            child.destroy()
+
+        if not cities:
+            ttk.Label(container, text="还没有关注的城市，在上方输入城市名添加",
+                     foreground="gray").pack(pady=30)
+            self.status_label.config(text="")
+            return
+
+        for city, result in zip(cities, results):
+            row = ttk.Frame(container, padding=(5, 8))
+            row.pack(fill=X)
+            if "error" in result:
+                ttk.Label(row, text="⚠️", font=("Segoe UI Emoji", 16)).pack(side=LEFT, padx=(0, 10))
+                ttk.Label(row, text=f"{city}  {result['error']}", font=("Microsoft YaHei", 11)).pack(side=LEFT)
+            else:
+                icon = self.weather_service.get_weather_icon_name(result.get("code"))
+                ttk.Label(row, text=icon, font=("Segoe UI Emoji", 16)).pack(side=LEFT, padx=(0, 10))
+                ttk.Label(row, text=f"{result.get('temperature', '--')}°C", width=8,
+                         font=("Microsoft YaHei", 12, "bold")).pack(side=LEFT)
+                ttk.Label(row, text=f"{city} | {result.get('status', '未知')}", width=16,
+                         font=("Microsoft YaHei", 11)).pack(side=LEFT)
+                ttk.Label(row, text=f"{result.get('temp_min', '--')}~{result.get('temp_max', '--')}°C",
+                         foreground="gray").pack(side=LEFT, padx=10)
+            ttk.Button(row, text="✕", width=3, bootstyle="danger-link",
+                      command=lambda c=city: self.remove_city(c)).pack(side=RIGHT)
+            ttk.Separator(container).pack(fill=X)
+
+        self.status_label.config(text=f"共 {len(cities)} 个城市 · 更新于 {datetime.now().strftime('%H:%M')}")
@@ -0,0 +1,206 @@
+"""
+天气数据源 - 统一的天气查询入口：可插拔后端、按地点共享缓存、失败时自动切换后端
+"""
+import re
+import time
+import threading
+import requests
+from concurrent.futures import Future
+
+import cn_gazetteer
+
+
+# 紧跟在数字后面的"-"是区间分隔符，不算负号
+_TEMPERATURE_RE = re.compile(r"(?<![\d.])-?\d+(?:\.\d+)?")
+
+
+def parse_temperature_range(text):
+    """"-5-3℃" / "-15~-5℃" -> (最低, 最高)；取不到恰好两个数时抛错，让调用方切换后端"""
+    numbers = [float(n) for n in _TEMPERATURE_RE.findall(str(text or ""))]
+    if len(numbers) != 2:
+        raise ValueError(f"无法解析温度区间: {text!r}")
+    return min(numbers), max(numbers)
+
+
+def code_from_text(text):
+    """把中文天气描述映射成 open-meteo 天气代码，供只返回文字的接口选图标"""
+    text = str(text or "")
+    for hints, code in (
+        (("冰雹",), 96),
+        (("雷",), 95),
+        (("雨夹雪", "冻雨"), 66),
+        (("暴雪", "大雪"), 75),
+        (("雪",), 71),
+        (("暴雨", "大雨"), 65),
+        (("阵雨",), 80),
+        (("中雨",), 63),
+        (("雨",), 61),
+        (("雾", "霾", "沙", "尘"), 45),
+        (("阴",), 3),
+        (("云",), 2),
+        (("晴",), 0),
+    ):
+        if any(hint in text for hint in hints):
+            return code
+    return None
+
+
+class OpenMeteoBackend:
+    """open-meteo：复用 WeatherService 的地名表、坐标缓存和逐时预报缓存"""
+
+    name = "open-meteo"
+
+    def __init__(self, weather_service):
+        self.service = weather_service
+
+    def fetch(self, city):
+        result = self.service.get_weather(city)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        return result
+
+
+class XxapiBackend:
+    """v2.xxapi.cn：只提供当天的温度区间、天气文字、风力和空气质量"""
+
+    name = "xxapi"
+    URL = "https://v2.xxapi.cn/api/weather"
+
+    def fetch(self, city):
+        response = requests.get(self.URL, params={"city": city}, timeout=10)
+        data = response.json()
+        if data.get("code") != 200 or not data.get("data"):
+            raise RuntimeError(data.get("msg", "获取天气数据失败"))
+
+        weather_data = data["data"]
+        today_data = weather_data["data"][0] if weather_data.get("data") else {}
+
+        # 解析温度范围
+        min_temp, max_temp = parse_temperature_range(today_data.get("temperature"))
+        status = today_data.get("weather", "未知")
+
+        return {
+            "city": weather_data.get("city", city),
+            "status": status,
+            "temperature": round((min_temp + max_temp) / 2, 1), # 该接口没有实时温度，取区间中值估算
+            "temp_max": max_temp,
+            "temp_min": min_temp,
+            "code": code_from_text(status),
+            "wind": today_data.get("wind", ""),
+            "air_quality": today_data.get("air_quality") or None,
+        }
+
+
+class WeatherProvider:
+    """按顺序尝试各后端，结果按地点缓存，侧边栏与集成功能窗口共用一份。
+
+    返回统一格式: {"city", "status", "temperature", "temp_max", "temp_min", "code", "source",
+    以及后端能提供时的 "humidity", "visibility", "wind", "air_quality", "aqi", "pm25"}；失败返回 {"error"}。
+    后端失败后在 FAILURE_COOLDOWN 秒内排到最后，所有后端都失败时回退到未超过 STALE_TTL 的旧结果，
+    这种结果带 "stale": True 和原始获取时间 "fetched_at"(时间戳)，调用方不应把它当作新数据保存。
+    """
+
+    CACHE_TTL = 10 * 60 # 结果复用时间(秒)
+    STALE_TTL = 6 * 3600 # 全部后端失败时仍可使用的旧结果时长(秒)
+    FAILURE_COOLDOWN = 5 * 60 # 后端失败后降级的时长(秒)
+
+    def __init__(self, backends, normalize_city=None):
+        self.backends = list(backends)
+        self.normalize_city = normalize_city
+        self._lock = threading.Lock()
+        self._cache = {} # 地点 -> {"data", "fetched_at"}
+        self._inflight = {} # 地点 -> Future
+        self._failed_at = {} # 后端名 -> 最近一次失败时间
+
+    def location_key(self, city):
+        """同一地点的不同写法（北京/北京市）归到同一个缓存键。
+
+        区县名保留原样：去掉"区"后"朝阳区"和"朝阳市"会撞成同一个键，互相串用天气。
+        """
+        city = str(city or "").strip()
+        if cn_gazetteer.is_district_like(city):
+            return city
+        if self.normalize_city:
+            try:
+                return self.normalize_city(city) or city
+            except Exception:
+                pass
+        return city
+
+    def get_cached(self, city):
+        """只读缓存，不发请求；没有可用结果返回 None"""
+        with self._lock:
+            entry = self._cache.get(self.location_key(city))
+        if entry and time.time() - entry["fetched_at"] < self.CACHE_TTL:
+            return dict(entry["data"])
+        return None
+
+    def get_weather(self, city, force=False):
+        key = self.location_key(city)
+        if not key:
+            return {"error": "未设置城市"}
+        if not force:
+            cached = self.get_cached(key)
+            if cached:
+                return cached
+
+        # 同一地点同时只查询一次，其余调用等待同一个结果
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            return dict(future.result())
+
+        try:
+            result = self._fetch(key, str(city).strip())
+            future.set_result(result)
+        except Exception as e:
+            future.set_result({"error": str(e)})
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return dict(future.result())
+
+    def _ordered_backends(self):
+        now = time.time()
+        with self._lock:
+            failed_at = dict(self._failed_at)
+        # 稳定排序：冷却期内失败过的后端排到最后，其余保持配置顺序
+        return sorted(self.backends,
+                      key=lambda backend: now - failed_at.get(backend.name, 0) < self.FAILURE_COOLDOWN)
+
+    def _fetch(self, key, city):
+        """key 只用于缓存；后端收到调用方给的原始城市名，避免"朝阳区"被简化成"朝阳"查错地方"""
+        errors = []
+        for backend in self._ordered_backends():
+            try:
+                data = backend.fetch(city)
+            except Exception as e:
+                print(f"天气后端 {backend.name} 失败: {e}")
+                errors.append(f"{backend.name}: {e}")
+                with self._lock:
+                    self._failed_at[backend.name] = time.time()
+                continue
+
+            data = dict(data)
+            data["source"] = backend.name
+            with self._lock:
+                self._failed_at.pop(backend.name, None)
+                self._cache[key] = {"data": data, "fetched_at": time.time()}
+            return dict(data)
+
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry and time.time() - entry["fetched_at"] < self.STALE_TTL:
+            data = dict(entry["data"])
+            data["stale"] = True
+            data["fetched_at"] = entry["fetched_at"]
+            return data
+        return {"error": "；".join(errors) or "没有可用的天气数据源"}
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
@@ -1,9 +1,99 @@
 import requests
 import json
-from datetime import datetime
+import os
+import time
+import bisect
+import queue
+import socket
+import hashlib
+import threading
+from datetime import datetime, timezone
+import cn_gazetteer
+
+
+def _default_gateway_mac():
+    """Linux 下从 /proc/net 读取默认网关的 MAC；其他系统或读取失败返回 None"""
+    try:
+        gateway = None
+        with open("/proc/net/route", "r") as f:
+            for line in f.readlines()[1:]:
+                fields = line.split()
+                if len(fields) > 2 and fields[1] == "00000000":
+                    raw = bytes.fromhex(fields[2])
+                    gateway = socket.inet_ntoa(raw[::-1])
+                    break
+        if not gateway:
+            return None
+        with open("/proc/net/arp", "r") as f:
+            for line in f.readlines()[1:]:
+                fields = line.split()
+                if len(fields) > 3 and fields[0] == gateway:
+                    return fields[3]
+    except Exception:
+        pass
+    return None
+
+
+def network_fingerprint():
+    """当前网络环境的廉价指纹：默认网关MAC + 出口网卡地址 + 本机地址集合，不发出任何数据包"""
+    parts = []
+    mac = _default_gateway_mac()
+    if mac:
+        parts.append("gw=" + mac)
+    try:
+        # UDP connect 只选路由，不发包
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(("223.5.5.5", 53))
+            parts.append("out=" + sock.getsockname()[0])
+    except Exception:
+        pass
+    try:
+        addresses = socket.gethostbyname_ex(socket.gethostname())[2]
+        parts.append("local=" + ",".join(sorted(set(addresses))))
+    except Exception:
+        pass
+    if not parts:
+        return None
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
 
 class WeatherService:
-    def __init__(self):
+    GEOCODE_CACHE_NAME = "geocode_cache.json"
+    IP_STATS_NAME = "ip_provider_stats.json"
+    LOCATION_CACHE_NAME = "location_cache.json"
+    LOCATION_TTL = 24 * 3600 # 自动定位结果有效期(秒)，网络指纹变化时提前失效
+    FORECAST_CACHE_NAME = "forecast_cache.json"
+    FORECAST_TTL = 3 * 3600 # 逐时预报重新拉取的间隔(秒)
+    FORECAST_DAYS = 3
+    IP_TIMEOUT = 5 # 单个定位服务超时(秒)
+    IP_WAVE_SIZE = 3 # 每波并发查询的定位服务数
+    IP_WAVE_DELAY = 1.5 # 一波在该时间(秒)内没有结果就启动下一波
+    # 增加国内IP查询接口
+    IP_PROVIDERS = [
+        ("https://r.inews.qq.com/api/ip2city", "qqnews"),
+        ("https://api.vore.top/api/IPdata?ip=", "vore"),
+        ("https://whois.pconline.com.cn/ipJson.jsp?json=true", "pconline"),
+        ("http://ip-api.com/json/?lang=zh-CN", "ip-api"),
+        ("https://api.ip.sb/geoip", "ipsb"), 
+        ("https://myip.ipip.net/json", "ipip"),
+        ("https://ipapi.co/json/", "ipapi"),
+        ("https://ipinfo.io/json", "ipinfo"),
+    ]
+    _geocode_lock = threading.Lock()
+    _ip_stats_lock = threading.Lock()
+    _forecast_lock = threading.Lock()
+
+    def __init__(self, cache_dir=None):
+        # 城市 -> 坐标 的解析结果长期有效，持久化到磁盘
+        self.geocode_cache_file = os.path.join(cache_dir, self.GEOCODE_CACHE_NAME) if cache_dir else None
+        self._geocode_cache = self._load_geocode_cache()
+        # 各IP定位服务的成功率与耗时，用来决定查询顺序
+        self.ip_stats_file = os.path.join(cache_dir, self.IP_STATS_NAME) if cache_dir else None
+        self._ip_stats = self._load_ip_stats()
+        self.location_cache_file = os.path.join(cache_dir, self.LOCATION_CACHE_NAME) if cache_dir else None
+        # 逐时预报按坐标缓存，当前天气在本地按整点查表
+        self.forecast_cache_file = os.path.join(cache_dir, self.FORECAST_CACHE_NAME) if cache_dir else None
+        self._forecasts = self._load_forecasts()
         self.geocoding_url = "https://geocoding-api.open-meteo.com/v1/search"
         self.weather_url = "https://api.open-meteo.com/v1/forecast"
         self.weather_codes = {
@@ -20,6 +110,86 @@ class WeatherService:
             95: "雷雨", 96: "雷雨伴有冰雹", 99: "大雷雨伴有冰雹"
         }
 
+    def _load_geocode_cache(self):
+        if not self.geocode_cache_file:
+            return {}
+        try:
+            if os.path.exists(self.geocode_cache_file):
+                with open(self.geocode_cache_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+        except Exception as e:
+            print(f"读取城市坐标缓存失败: {e}")
+        return {}
+
+    def _save_geocode_cache(self):
+        if not self.geocode_cache_file:
+            return
+        try:
+            with self._geocode_lock:
+                os.makedirs(os.path.dirname(self.geocode_cache_file), exist_ok=True)
+                tmp_path = self.geocode_cache_file + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._geocode_cache, f, ensure_ascii=False)
+                os.replace(tmp_path, self.geocode_cache_file)
+        except Exception as e:
+            print(f"保存城市坐标缓存失败: {e}")
+
+    def geocode(self, city_name):
+        """城市名 -> {"name", "latitude", "longitude"}
+
+        依次查内置地名表、磁盘缓存，都没有才请求 open-meteo 地理编码，结果永久缓存。
+        区县名（朝阳区）去掉后缀会撞上同名地级市（朝阳市），因此只在原名联网也查不到时才用去后缀的名字。
+        """
+        raw = str(city_name or "").strip()
+        candidates = [raw] if raw else []
+        normalized = self._normalize_city_name(city_name)
+        if normalized and normalized not in candidates:
+            candidates.append(normalized)
+        offline = candidates if not cn_gazetteer.is_district_like(raw) else candidates[:1]
+
+        for name in offline:
+            entry = cn_gazetteer.lookup(name)
+            if entry:
+                return {"name": name, "latitude": entry["lat"], "longitude": entry["lon"]}
+            cached = self._geocode_cache.get(name)
+            if cached:
+                return {"name": name, "latitude": cached["latitude"], "longitude": cached["longitude"]}
+
+        for name in candidates:
+            geo_params = {
+                "name": name,
+                "count": 1,
+                "language": "zh",
+                "format": "json"
+            }
+            geo_res = requests.get(self.geocoding_url, params=geo_params, timeout=5)
+            if geo_res.status_code != 200:
+                continue
+            geo_data = geo_res.json()
+            if geo_data.get("results"):
+                location = geo_data["results"][0]
+                self._geocode_cache[name] = {
+                    "latitude": location["latitude"],
+                    "longitude": location["longitude"],
+                }
+                self._save_geocode_cache()
+                return {"name": name, "latitude": location["latitude"], "longitude": location["longitude"]}
+        return None
+
+    def complete_city(self, prefix, limit=10):
+        """城市输入联想：内置地名表 + 曾解析过的城市"""
+        results = cn_gazetteer.complete(prefix, limit)
+        prefix = str(prefix or "").strip()
+        if prefix:
+            for name in sorted(self._geocode_cache):
+                if len(results) >= limit:
+                    break
+                if name.startswith(prefix) and name not in results:
+                    results.append(name)
+        return results
+
     def _normalize_city_name(self, name: str):
         if not name:
             return None
@@ -27,6 +197,10 @@ class WeatherService:
         if not s:
             return None
 
+        entry = cn_gazetteer.lookup(s)
+        if entry:
+            return entry["short"]
+
         for suffix in [
             "特别行政区",
             "自治区",
@@ -44,162 +218,406 @@ class WeatherService:
 
         return s.strip() or None
 
-    def get_location_by_ip(self):
-        """通过IP自动获取城市"""
+    def _ordered_ip_providers(self):
+        """按历史成功率（四舍五入到一位小数）和平均耗时排序定位服务"""
+        with self._ip_stats_lock:
+            stats = dict(self._ip_stats)
+
+        def sort_key(item):
+            _, provider = item
+            entry = stats.get(provider) or {}
+            ok, fail = entry.get("success", 0), entry.get("failure", 0)
+            rate = (ok + 1) / (ok + fail + 2)
+            latency = entry.get("latency_ms", self.IP_TIMEOUT * 500)
+            return (-round(rate, 1), latency)
+
+        # sorted 是稳定排序，没有统计时保持原有顺序
+        return sorted(self.IP_PROVIDERS, key=sort_key)
+
+    def _load_ip_stats(self):
+        if not self.ip_stats_file:
+            return {}
+        try:
+            if os.path.exists(self.ip_stats_file):
+                with open(self.ip_stats_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+        except Exception as e:
+            print(f"读取定位服务统计失败: {e}")
+        return {}
+
+    def _record_ip_provider(self, provider, ok, latency_ms):
+        with self._ip_stats_lock:
+            entry = self._ip_stats.setdefault(provider, {"success": 0, "failure": 0})
+            entry["success" if ok else "failure"] += 1
+            # 耗时取指数滑动平均，近期表现权重更高
+            previous = entry.get("latency_ms")
+            entry["latency_ms"] = round(latency_ms if previous is None else previous * 0.7 + latency_ms * 0.3)
+            snapshot = json.loads(json.dumps(self._ip_stats))
+        if not self.ip_stats_file:
+            return
+        try:
+            with self._ip_stats_lock:
+                os.makedirs(os.path.dirname(self.ip_stats_file), exist_ok=True)
+                tmp_path = self.ip_stats_file + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self.ip_stats_file)
+        except Exception as e:
+            print(f"保存定位服务统计失败: {e}")
+
+    def _query_ip_provider(self, url, provider):
+        """查询单个IP定位服务，返回城市名或 None"""
         headers = {
             "User-Agent": "Mozilla/5.0"
         }
-
-        # 增加国内IP查询接口
-        providers = [
-            ("https://r.inews.qq.com/api/ip2city", "qqnews"),
-            ("https://api.vore.top/api/IPdata?ip=", "vore"),
-            ("https://whois.pconline.com.cn/ipJson.jsp?json=true", "pconline"),
-            ("http://ip-api.com/json/?lang=zh-CN", "ip-api"),
-            ("https://api.ip.sb/geoip", "ipsb"), 
-            ("https://myip.ipip.net/json", "ipip"),
-            ("https://ipapi.co/json/", "ipapi"),
-            ("https://ipinfo.io/json", "ipinfo"),
-        ]
-
-        for url, provider in providers:
+        res = requests.get(url, timeout=self.IP_TIMEOUT, headers=headers)
+        if res.status_code != 200:
+            return None
+        if provider == "pconline":
             try:
-                res = requests.get(url, timeout=5, headers=headers)
-                if res.status_code != 200:
-                    continue
-                if provider == "pconline":
-                    try:
-                        res.encoding = res.encoding or "GBK"
-                        data = json.loads(res.text.strip())
-                    except Exception:
-                        continue
-                else:
-                    data = res.json()
-                
-                if provider == "pconline":
-                    city = data.get("city") or data.get("pro")
-                    city = self._normalize_city_name(city)
-                    if city:
-                        return city
+                res.encoding = res.encoding or "GBK"
+                data = json.loads(res.text.strip())
+            except Exception:
+                return None
+        else:
+            data = res.json()
 
-                elif provider == "vore":
-                    if data.get("code") == 200:
-                        ipdata = data.get("ipdata") or {}
-                        city = ipdata.get("info2") or ipdata.get("info1")
-                        city = self._normalize_city_name(city)
-                        if city:
-                            return city
-
-                elif provider == "qqnews":
-                    if data.get("ret") == 0:
-                        city = data.get("city") or data.get("province")
-                        city = self._normalize_city_name(city)
-                        if city:
-                            return city
-
-                elif provider == "ip-api":
-                    if data.get("status") == "success":
-                        city = data.get("city") or data.get("regionName")
-                        city = self._normalize_city_name(city)
-                        if city:
-                            return city
-                            
-                elif provider == "ipsb":
-                    city = data.get("city") or data.get("region")
-                    city = self._normalize_city_name(city)
-                    if city:
-                        return city
-                        
-                elif provider == "ipip":
-                    # ipip returns data like: {"ret": "ok", "data": {"ip": "...", "location": ["中国", "广东", "深圳", "", "电信"]}}
-                    # Or simple json structure depending on endpoint. 
-                    # The myip.ipip.net/json return: {"ret": "ok", "data": { ... "location": ["中国", "四川", "成都", "", "移动"] } }
-                    if data.get("ret") == "ok" and "data" in data:
-                        loc = data["data"].get("location", [])
-                        if len(loc) >= 3 and loc[2]:
-                            city = self._normalize_city_name(loc[2])
-                            if city:
-                                return city
-
-                elif provider in ["ipapi", "ipinfo"]:
-                    city = data.get("city") or data.get("region")
-                    city = self._normalize_city_name(city) or (str(city).strip() if city else None)
+        if provider == "pconline":
+            city = data.get("city") or data.get("pro")
+            city = self._normalize_city_name(city)
+            if city:
+                return city
+
+        elif provider == "vore":
+            if data.get("code") == 200:
+                ipdata = data.get("ipdata") or {}
+                city = ipdata.get("info2") or ipdata.get("info1")
+                city = self._normalize_city_name(city)
+                if city:
+                    return city
+
+        elif provider == "qqnews":
+            if data.get("ret") == 0:
+                city = data.get("city") or data.get("province")
+                city = self._normalize_city_name(city)
+                if city:
+                    return city
+
+        elif provider == "ip-api":
+            if data.get("status") == "success":
+                city = data.get("city") or data.get("regionName")
+                city = self._normalize_city_name(city)
+                if city:
+                    return city
+
+        elif provider == "ipsb":
+            city = data.get("city") or data.get("region")
+            city = self._normalize_city_name(city)
+            if city:
+                return city
+
+        elif provider == "ipip":
+            # ipip returns data like: {"ret": "ok", "data": {"ip": "...", "location": ["中国", "广东", "深圳", "", "电信"]}}
+            # Or simple json structure depending on endpoint. 
+            # The myip.ipip.net/json return: {"ret": "ok", "data": { ... "location": ["中国", "四川", "成都", "", "移动"] } }
+            if data.get("ret") == "ok" and "data" in data:
+                loc = data["data"].get("location", [])
+                if len(loc) >= 3 and loc[2]:
+                    city = self._normalize_city_name(loc[2])
                     if city:
                         return city
-            except Exception as e:
-                print(f"IP provider {provider} failed: {e}")
-                continue
 
+        elif provider in ["ipapi", "ipinfo"]:
+            city = data.get("city") or data.get("region")
+            city = self._normalize_city_name(city) or (str(city).strip() if city else None)
+            if city:
+                return city
         return None
 
-    def get_weather(self, city_name):
-        """获取城市天气"""
+    def get_cached_location(self):
+        """网络指纹未变且未过期时返回缓存的自动定位城市，否则返回 None"""
+        if not self.location_cache_file:
+            return None
         try:
-            candidates = []
-            if city_name:
-                candidates.append(str(city_name).strip())
-            normalized = self._normalize_city_name(city_name)
-            if normalized and normalized not in candidates:
-                candidates.append(normalized)
-
-            location = None
-            for name in candidates:
-                geo_params = {
-                    "name": name,
-                    "count": 1,
-                    "language": "zh",
-                    "format": "json"
-                }
-                geo_res = requests.get(self.geocoding_url, params=geo_params, timeout=5)
-                if geo_res.status_code != 200:
+            if not os.path.exists(self.location_cache_file):
+                return None
+            with open(self.location_cache_file, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except Exception as e:
+            print(f"读取定位缓存失败: {e}")
+            return None
+        if time.time() - cached.get("resolved_at", 0) >= self.LOCATION_TTL:
+            return None
+        fingerprint = network_fingerprint()
+        if not fingerprint or fingerprint != cached.get("fingerprint"):
+            return None
+        return cached.get("city")
+
+    def locate(self, force=False):
+        """自动定位城市：优先使用缓存，指纹变化、过期或 force 时才重新查询IP"""
+        if not force:
+            city = self.get_cached_location()
+            if city:
+                return city
+        city = self.get_location_by_ip()
+        if city and self.location_cache_file:
+            try:
+                os.makedirs(os.path.dirname(self.location_cache_file), exist_ok=True)
+                tmp_path = self.location_cache_file + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"city": city, "fingerprint": network_fingerprint(), "resolved_at": time.time()},
+                              f, ensure_ascii=False)
+                os.replace(tmp_path, self.location_cache_file)
+            except Exception as e:
+                print(f"保存定位缓存失败: {e}")
+        return city
+
+    def get_location_by_ip(self):
+        """通过IP自动获取城市
+
+        定位服务按历史表现排序后分波并发查询：每波 IP_WAVE_SIZE 个，
+        IP_WAVE_DELAY 秒内没有结果或整波失败就启动下一波，取第一个有效城市。
+        """
+        pending = self._ordered_ip_providers()
+        results = queue.Queue()
+        cancel_event = threading.Event()
+        running = 0
+
+        def worker(url, provider):
+            start = time.time()
+            city = None
+            try:
+                city = self._query_ip_provider(url, provider)
+            except Exception as e:
+                if not cancel_event.is_set():
+                    print(f"IP provider {provider} failed: {e}")
+            self._record_ip_provider(provider, bool(city), (time.time() - start) * 1000)
+            results.put(city)
+
+        def launch_wave():
+            launched = 0
+            while pending and launched < self.IP_WAVE_SIZE:
+                url, provider = pending.pop(0)
+                threading.Thread(target=worker, args=(url, provider), daemon=True).start()
+                launched += 1
+            return launched
+
+        try:
+            running += launch_wave()
+            while running:
+                try:
+                    city = results.get(timeout=self.IP_WAVE_DELAY if pending else self.IP_TIMEOUT + 1)
+                except queue.Empty:
+                    if not pending:
+                        break
+                    running += launch_wave()
                     continue
-                geo_data = geo_res.json()
-                if geo_data.get("results"):
-                    location = geo_data["results"][0]
-                    city_name = name
-                    break
 
+                running -= 1
+                if city:
+                    return city
+                if running == 0 and pending:
+                    running += launch_wave()
+        finally:
+            # 已发出的请求无法中断，结果到达后直接丢弃
+            cancel_event.set()
+
+        return None
+
+    def _forecast_key(self, lat, lon):
+        return f"{float(lat):.2f},{float(lon):.2f}"
+
+    def _load_forecasts(self):
+        if not self.forecast_cache_file:
+            return {}
+        try:
+            if os.path.exists(self.forecast_cache_file):
+                with open(self.forecast_cache_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+        except Exception as e:
+            print(f"读取天气预报缓存失败: {e}")
+        return {}
+
+    def _save_forecasts(self):
+        if not self.forecast_cache_file:
+            return
+        try:
+            with self._forecast_lock:
+                # 只保留仍在有效期内的地点，避免文件无限增长
+                now = time.time()
+                snapshot = {k: v for k, v in self._forecasts.items()
+                            if now - v.get("fetched_at", 0) < self.FORECAST_DAYS * 86400}
+                os.makedirs(os.path.dirname(self.forecast_cache_file), exist_ok=True)
+                tmp_path = self.forecast_cache_file + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self.forecast_cache_file)
+        except Exception as e:
+            print(f"保存天气预报缓存失败: {e}")
+
+    def _local_now(self, forecast):
+        """预报所在地当前时间（open-meteo 的 timezone=auto 以当地时间给出逐时数据）"""
+        offset = forecast.get("utc_offset_seconds", 0)
+        return datetime.fromtimestamp(time.time() + offset, timezone.utc).replace(tzinfo=None)
+
+    def _hour_index(self, forecast):
+        """当前整点在逐时预报中的位置，不在预报范围内返回 None"""
+        times = (forecast.get("hourly") or {}).get("time") or []
+        key = self._local_now(forecast).strftime("%Y-%m-%dT%H:00")
+        i = bisect.bisect_left(times, key)
+        if i < len(times) and times[i] == key:
+            return i
+        return None
+
+    def _forecast_fresh(self, forecast):
+        return bool(forecast) and time.time() - forecast.get("fetched_at", 0) < self.FORECAST_TTL \
+            and self._hour_index(forecast) is not None
+
+    def _request_forecasts(self, points):
+        """一次请求取多个坐标的逐时预报（经纬度用逗号分隔），返回与 points 对应的列表"""
+        weather_params = {
+            "latitude": ",".join(f"{float(lat):.4f}" for lat, _ in points),
+            "longitude": ",".join(f"{float(lon):.4f}" for _, lon in points),
+            "hourly": "temperature_2m,weathercode,relative_humidity_2m,visibility",
+            "daily": "temperature_2m_max,temperature_2m_min",
+            "forecast_days": self.FORECAST_DAYS,
+            "timezone": "auto"
+        }
+        weather_res = requests.get(self.weather_url, params=weather_params, timeout=5 + len(points))
+        if weather_res.status_code != 200:
+            return [None] * len(points)
+
+        data = weather_res.json()
+        # 单个坐标返回对象，多个坐标返回按请求顺序排列的数组
+        items = data if isinstance(data, list) else [data]
+        now = time.time()
+        forecasts = []
+        for i in range(len(points)):
+            item = items[i] if i < len(items) and isinstance(items[i], dict) else None
+            if not item or item.get("error"):
+                forecasts.append(None)
+                continue
+            forecasts.append({
+                "fetched_at": now,
+                "utc_offset_seconds": item.get("utc_offset_seconds", 0),
+                "hourly": item.get("hourly", {}),
+                "daily": item.get("daily", {}),
+            })
+        return forecasts
+
+    def get_forecasts(self, locations, force=False):
+        """批量取逐时预报，locations 为 [(lat, lon), ...]，返回顺序一致的列表（取不到为 None）。
+
+        缓存有效的坐标直接复用，其余合并成一次请求，城市再多也只发一个请求；
+        请求失败时，只要旧预报还覆盖当前整点就继续使用。
+        """
+        keys = [self._forecast_key(lat, lon) for lat, lon in locations]
+        with self._forecast_lock:
+            results = [self._forecasts.get(key) for key in keys]
+
+        stale = {} # 缓存键 -> 坐标，同一坐标只请求一次
+        for key, point, forecast in zip(keys, locations, results):
+            if force or not self._forecast_fresh(forecast):
+                stale.setdefault(key, point)
+        if not stale:
+            return results
+
+        try:
+            fetched = self._request_forecasts(list(stale.values()))
+        except Exception as e:
+            print(f"获取天气预报失败: {e}")
+            fetched = [None] * len(stale)
+        fresh = {key: forecast for key, forecast in zip(stale, fetched) if forecast}
+        if fresh:
+            with self._forecast_lock:
+                self._forecasts.update(fresh)
+            self._save_forecasts()
+
+        for i, key in enumerate(keys):
+            if key in fresh:
+                results[i] = fresh[key]
+            elif results[i] and self._hour_index(results[i]) is None:
+                results[i] = None
+        return results
+
+    def get_forecast(self, lat, lon, force=False):
+        """取单个坐标的逐时预报：在 FORECAST_TTL 内且覆盖当前整点时直接用缓存，否则请求一次"""
+        return self.get_forecasts([(lat, lon)], force)[0]
+
+    def _current_weather(self, city_name, forecast):
+        """从逐时预报中按当地整点查出当前天气"""
+        hour = self._hour_index(forecast) if forecast else None
+        if hour is None:
+            return {"error": "无法获取天气信息"}
+
+        hourly = forecast.get("hourly", {})
+        daily = forecast.get("daily", {})
+        weather_code = (hourly.get("weathercode") or [0])[hour] or 0
+        status = self.weather_codes.get(weather_code, "未知")
+        temp = (hourly.get("temperature_2m") or [None])[hour]
+        # 湿度和能见度是后加的字段，旧的缓存预报里可能没有
+        humidity = (hourly.get("relative_humidity_2m") or [None] * (hour + 1))[hour]
+        visibility = (hourly.get("visibility") or [None] * (hour + 1))[hour]
+
+        # 当天的最高/最低温
+        today = self._local_now(forecast).strftime("%Y-%m-%d")
+        days = daily.get("time") or []
+        day = days.index(today) if today in days else 0
+        temp_max = daily.get("temperature_2m_max", [0])[day] if daily.get("temperature_2m_max") else 0
+        temp_min = daily.get("temperature_2m_min", [0])[day] if daily.get("temperature_2m_min") else 0
+
+        return {
+            "city": city_name,
+            "status": status,
+            "temperature": temp,
+            "temp_max": temp_max,
+            "temp_min": temp_min,
+            "code": weather_code,
+            "humidity": humidity,
+            "visibility": round(visibility / 1000, 1) if visibility is not None else None
+        }
+
+    def get_weather(self, city_name):
+        """获取城市天气：当前温度和天气从缓存的逐时预报中按当地整点查出"""
+        try:
+            location = self.geocode(city_name)
             if not location:
                 return {"error": "未找到该城市"}
-
-            lat = location["latitude"]
-            lon = location["longitude"]
-            
-            # 2. Weather Forecast
-            weather_params = {
-                "latitude": lat,
-                "longitude": lon,
-                "current_weather": "true",
-                "daily": "temperature_2m_max,temperature_2m_min",
-                "timezone": "auto"
-            }
-            weather_res = requests.get(self.weather_url, params=weather_params, timeout=5)
-            if weather_res.status_code != 200:
-                return {"error": "无法获取天气信息"}
-                
-            weather_data = weather_res.json()
-            current = weather_data.get("current_weather", {})
-            daily = weather_data.get("daily", {})
-            
-            weather_code = current.get("weathercode", 0)
-            status = self.weather_codes.get(weather_code, "未知")
-            temp = current.get("temperature")
-            
-            temp_max = daily.get("temperature_2m_max", [0])[0] if daily.get("temperature_2m_max") else 0
-            temp_min = daily.get("temperature_2m_min", [0])[0] if daily.get("temperature_2m_min") else 0
-            
-            return {
-                "city": city_name,
-                "status": status,
-                "temperature": temp,
-                "temp_max": temp_max,
-                "temp_min": temp_min,
-                "code": weather_code
-            }
-            
+            forecast = self.get_forecast(location["latitude"], location["longitude"])
+            return self._current_weather(location["name"], forecast)
         except Exception as e:
             return {"error": str(e)}
 
+    def get_weather_many(self, city_names, force=False):
+        """多个城市的天气，返回与 city_names 对应的列表。
+
+        坐标来自内置地名表和坐标缓存（没见过的城市只在首次解析时联网），
+        逐时预报合并成一次请求。
+        """
+        locations = []
+        for name in city_names:
+            try:
+                locations.append(self.geocode(name))
+            except Exception as e:
+                print(f"解析城市失败 {name}: {e}")
+                locations.append(None)
+
+        points = [(loc["latitude"], loc["longitude"]) for loc in locations if loc]
+        forecasts = iter(self.get_forecasts(points, force) if points else [])
+        results = []
+        for name, location in zip(city_names, locations):
+            if not location:
+                results.append({"city": name, "error": "未找到该城市"})
+                continue
+            result = self._current_weather(location["name"], next(forecasts))
+            result.setdefault("city", name)
+            results.append(result)
+        return results
+
     def get_weather_icon_name(self, code):
         """根据天气代码返回图标名称（对应ttkbootstrap/emoji）"""
         if code == 0: return "☀️"